@@ -0,0 +1,99 @@
+"""Benchmark de la concurrencia adaptativa (AIMD) de la reparación de la instancia.
+
+Sirve archivos desde un servidor local que simula el enlace (ancho de banda
+total, tope por conexión, latencia y límite de conexiones con 503) y compara
+un número fijo de conexiones con el AimdController.
+
+Uso:
+    python benchmarks/bench_adaptive_concurrency.py [--scenario fibra|adsl|congestionada]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from local_server import LocalServer, SimulatedLink, throttled_handler, write_manifest  # noqa: E402
+from sakura.concurrency import AimdController  # noqa: E402
+from sakura.repair import InstanceRepair  # noqa: E402
+
+KB = 1024
+MB = 1024 * KB
+
+# nombre: (ancho de banda, tope por conexión, latencia, máx. conexiones, archivos, tamaño)
+SCENARIOS = {
+    'fibra': (24 * MB, 2 * MB, 0.01, None, 120, 512 * KB),
+    'adsl': (1 * MB, 600 * KB, 0.05, None, 40, 128 * KB),
+    'congestionada': (4 * MB, 1 * MB, 0.08, 5, 60, 256 * KB),
+}
+
+STRATEGIES = [
+    ("fijo 2", lambda: AimdController(initial=2, minimum=2, maximum=2)),
+    ("fijo 16", lambda: AimdController(initial=16, minimum=16, maximum=16)),
+    ("AIMD", lambda: AimdController()),
+]
+
+
+def build_server_files(server_dir, count, size):
+    files = {}
+    for i in range(count):
+        rel_path = f"libraries/lib_{i:04d}.jar"
+        data = os.urandom(size)
+        path = os.path.join(server_dir, "files", rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        files[rel_path] = {'sha256': hashlib.sha256(data).hexdigest(), 'size': size}
+    manifest = {'version': 1, 'base_url': "files/", 'files': files}
+    write_manifest(os.path.join(server_dir, "manifest.json"), manifest)
+    return manifest
+
+
+def run(scenario, work_dir):
+    bandwidth, per_connection, latency, max_connections, count, size = SCENARIOS[scenario]
+    server_dir = os.path.join(work_dir, scenario)
+    manifest = build_server_files(server_dir, count, size)
+    print(f"🌐 {scenario}: {bandwidth / MB:.0f} MB/s, {per_connection / KB:.0f} KB/s por conexión, "
+          f"{latency * 1000:.0f} ms, máx. conexiones {max_connections or '∞'}; {count} × {size // KB} KB")
+
+    for name, make_controller in STRATEGIES:
+        link = SimulatedLink(bandwidth, per_connection, latency, max_connections)
+        game_dir = os.path.join(work_dir, f"instance_{scenario}_{name.replace(' ', '_')}")
+        with LocalServer(server_dir, handler=throttled_handler(link)) as server:
+            repair = InstanceRepair(game_dir, server.url, base_dir=work_dir)
+            repair.manifest = manifest
+            problems = [(rel_path, "falta") for rel_path in sorted(manifest['files'])]
+            controller = make_controller()
+            start = time.perf_counter()
+            failed = repair.repair(problems, controller)
+            elapsed = time.perf_counter() - start
+        metrics = controller.metrics()
+        limits = [limit for _, limit, _ in metrics['history']] or [metrics['limit']]
+        print(f"  {name:8s} {elapsed:6.2f}s  {count * size / elapsed / MB:5.2f} MB/s  "
+              f"conexiones {min(limits)}-{max(limits)} (final {metrics['limit']})  "
+              f"errores {metrics['errors']}  503 {link.rejected}  fallidos {len(failed)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de concurrencia adaptativa")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append',
+                        help="Escenario a medir (por defecto, todos)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="sakura-aimd-bench-")
+    try:
+        for scenario in args.scenario or SCENARIOS:
+            run(scenario, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
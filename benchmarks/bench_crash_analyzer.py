@@ -0,0 +1,77 @@
+"""Benchmark del analizador de cierres sobre un latest.log sintético.
+
+Genera un log con el formato de log4j (sobre todo líneas INFO, algunas WARN
+y un error con traza en mitad del archivo), un crash report pequeño, y mide
+analyze_game_dir.
+
+Uso:
+    python benchmarks/bench_crash_analyzer.py [--size-mb 300] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from sakura.crash_analyzer import analyze_game_dir  # noqa: E402
+
+MB = 1024 * 1024
+
+INFO_LINE = b"[12:00:00] [Render thread/INFO]: Loaded 1234 recipes from data pack sakura:core\n"
+WARN_LINE = b"[12:00:01] [Worker-Main-3/WARN]: Missing texture sakura:block/petal\n"
+ERROR_BLOCK = (
+    b"[12:00:02] [main/ERROR]: Incompatible mods found!\n"
+    b"\t - Mod 'Sodium' (sodium) 0.5.3 requires any version of mod 'Fabric Rendering API', which is missing!\n"
+    b"\tat net.fabricmc.loader.impl.FabricLoaderImpl.load(FabricLoaderImpl.java:190)\n"
+)
+CRASH_REPORT = "---- Minecraft Crash Report ----\nDescription: Ticking entity\n\njava.lang.OutOfMemoryError: Java heap space\n"
+
+
+def build_game_dir(root, size):
+    os.makedirs(os.path.join(root, "logs"))
+    os.makedirs(os.path.join(root, "crash-reports"))
+    block = INFO_LINE * 2000 + WARN_LINE * 2
+    with open(os.path.join(root, "logs", "latest.log"), 'wb') as f:
+        written = 0
+        while written < size:
+            f.write(block)
+            written += len(block)
+            if written - len(block) < size // 2 <= written:
+                f.write(ERROR_BLOCK)
+    with open(os.path.join(root, "crash-reports", "crash-client.txt"), 'w') as f:
+        f.write(CRASH_REPORT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del analizador de cierres")
+    parser.add_argument('--size-mb', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="sakura-crash-bench-")
+    try:
+        print(f"📝 Generando latest.log de {args.size_mb} MB...")
+        build_game_dir(root, args.size_mb * MB)
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            report = analyze_game_dir(root)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(f"⏱️ analyze_game_dir: mejor {best:.3f}s, mediana {statistics.median(timings):.3f}s "
+              f"({report.bytes_scanned / MB / best:.0f} MB/s)")
+        print(report.summary())
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
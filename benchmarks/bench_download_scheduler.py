@@ -0,0 +1,110 @@
+"""Benchmark del planificador de descargas contra un servidor HTTP local.
+
+Escenarios:
+  - reparto: varios trabajos de la misma clase con límite global; mide la
+    velocidad total y cuándo termina cada trabajo (deberían acabar juntos).
+  - prioridad: una actualización y una descarga en segundo plano a la vez;
+    el segundo plano no debería empezar hasta que acabe la actualización.
+  - juego: con el juego abierto el segundo plano queda en pausa y el resto
+    se limita a IN_GAME_RATE.
+
+Uso:
+    python benchmarks/bench_download_scheduler.py [--limit-kbps 4096] [--size-mb 4] [--jobs 3]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from local_server import LocalServer  # noqa: E402
+from sakura.download import download_file  # noqa: E402
+from sakura.scheduler import (IN_GAME_RATE, PRIORITY_BACKGROUND, PRIORITY_REPAIR,  # noqa: E402
+                              PRIORITY_UPDATE, DownloadScheduler)
+
+MB = 1024 * 1024
+
+
+def run_jobs(scheduler, server, work_dir, specs):
+    """Lanza un hilo por (prioridad, archivo); devuelve [(prioridad, inicio, fin, bytes)]"""
+    results = [None] * len(specs)
+    origin = time.perf_counter()
+
+    def worker(index, priority, name):
+        with scheduler.job(priority, name) as job:
+            first = []
+
+            def progress(received, total):
+                if not first:
+                    first.append(time.perf_counter() - origin)
+
+            dest = os.path.join(work_dir, f"out_{index}.bin")
+            download_file(server.url + name, dest, progress=progress, job=job)
+            results[index] = (priority, first[0] if first else 0.0, time.perf_counter() - origin,
+                              os.path.getsize(dest))
+
+    threads = [threading.Thread(target=worker, args=(i, priority, name)) for i, (priority, name) in enumerate(specs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del planificador de descargas")
+    parser.add_argument('--limit-kbps', type=int, default=4096)
+    parser.add_argument('--size-mb', type=int, default=4)
+    parser.add_argument('--jobs', type=int, default=3)
+    args = parser.parse_args()
+
+    limit = args.limit_kbps * 1024
+    work_dir = tempfile.mkdtemp(prefix="sakura-scheduler-bench-")
+    try:
+        serve_dir = os.path.join(work_dir, "server")
+        os.makedirs(serve_dir)
+        with open(os.path.join(serve_dir, "file.bin"), 'wb') as f:
+            f.write(os.urandom(args.size_mb * MB))
+        with open(os.path.join(serve_dir, "small.bin"), 'wb') as f:
+            f.write(os.urandom(MB))
+
+        with LocalServer(serve_dir) as server:
+            scheduler = DownloadScheduler(limit)
+            results = run_jobs(scheduler, server, work_dir, [(PRIORITY_REPAIR, "file.bin")] * args.jobs)
+            elapsed = max(end for _, _, end, _ in results)
+            total = sum(size for *_, size in results)
+            ends = [end for _, _, end, _ in results]
+            print(f"⚖️ reparto ({args.jobs} trabajos, límite {args.limit_kbps} KB/s): "
+                  f"total {total / elapsed / 1024:.0f} KB/s (incluye la ráfaga inicial), "
+                  f"terminan entre {min(ends):.2f}s y {max(ends):.2f}s")
+
+            scheduler = DownloadScheduler(limit)
+            results = run_jobs(scheduler, server, work_dir,
+                               [(PRIORITY_UPDATE, "file.bin"), (PRIORITY_BACKGROUND, "file.bin")])
+            update, background = results
+            print(f"🥇 prioridad: actualización {update[1]:.2f}-{update[2]:.2f}s, "
+                  f"segundo plano {background[1]:.2f}-{background[2]:.2f}s")
+
+            scheduler = DownloadScheduler(0)
+            scheduler.set_game_running(True)
+            threading.Timer(3.0, scheduler.set_game_running, args=(False,)).start()
+            results = run_jobs(scheduler, server, work_dir,
+                               [(PRIORITY_REPAIR, "small.bin"), (PRIORITY_BACKGROUND, "small.bin")])
+            repair, background = results
+            in_game_rate = repair[3] / repair[2] / 1024
+            print(f"🎮 juego (3 s abierto): reparación de 1 MB a {in_game_rate:.0f} KB/s "
+                  f"(tope {IN_GAME_RATE // 1024} KB/s + ráfaga), "
+                  f"segundo plano empezó a los {background[1]:.2f}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
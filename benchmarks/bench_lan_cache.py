@@ -0,0 +1,143 @@
+"""Benchmark del caché de la red local (--serve-cache) en localhost.
+
+Un servidor local hace de "internet" (enlace simulado con ancho de banda
+limitado) y varios launchers reparan a la vez su instancia vacía: primero
+todos directos a internet y después a través de un CacheServer encontrado
+por broadcast. Mide el tráfico de internet (debería ser una sola copia por
+local con el caché) y el tiempo total.
+
+Al final, dos launchers descargan la actualización a través del caché con el
+zip en otro host (como github.com frente a raw.githubusercontent.com): el
+segundo tiene que ser un acierto del caché.
+
+Uso:
+    python benchmarks/bench_lan_cache.py [--clients 8] [--files 40] [--size-kb 256] [--wan-mbps 8]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_adaptive_concurrency import build_server_files  # noqa: E402
+from local_server import LocalServer, SimulatedLink, throttled_handler, write_manifest  # noqa: E402
+from sakura import lan_cache  # noqa: E402
+from sakura.config import VERSION_FILE  # noqa: E402
+from sakura.repair import InstanceRepair  # noqa: E402
+from sakura.updater import Updater  # noqa: E402
+
+KB = 1024
+MB = 1024 * KB
+DISCOVERY_PORT = 18734  # Distinto del real para no chocar con un caché de verdad
+
+
+def run_clients(upstream_url, work_dir, label, clients):
+    """Cada cliente repara su propia instancia vacía; devuelve (segundos, archivos fallidos)"""
+    failures = [0] * clients
+
+    def client(index):
+        repair = InstanceRepair(os.path.join(work_dir, f"{label}_{index}"), upstream_url, base_dir=work_dir)
+        _, failed, _ = repair.verify_and_repair()
+        failures[index] = len(failed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sum(failures)
+
+
+def check_update_zip(work_dir, size):
+    """Dos launchers descargan la actualización por el caché; el zip está en otro host"""
+    zip_dir = os.path.join(work_dir, "zip_host")
+    manifest_dir = os.path.join(work_dir, "manifest_host")
+    os.makedirs(zip_dir)
+    os.makedirs(manifest_dir)
+    data = os.urandom(size)
+    with open(os.path.join(zip_dir, "launcher_update.zip"), 'wb') as f:
+        f.write(data)
+
+    link = SimulatedLink(64 * MB)
+    with LocalServer(zip_dir, handler=throttled_handler(link)) as zip_host, LocalServer(manifest_dir) as manifest_host:
+        write_manifest(os.path.join(manifest_dir, VERSION_FILE), {
+            'version': "99.0.0", 'download_url': zip_host.url + "launcher_update.zip",
+            'sha256': hashlib.sha256(data).hexdigest(), 'size': size,
+        })
+        # Sólo el servidor de actualizaciones está permitido: el host del zip sale del manifiesto firmado
+        with lan_cache.CacheServer(os.path.join(work_dir, "zip_cache"), upstreams=[manifest_host.url],
+                                   host="127.0.0.1", port=0, discovery_port=None,
+                                   manifests=[manifest_host.url + VERSION_FILE]) as cache:
+            lan_cache.configure(cache.url)
+            for index in range(2):
+                updater = Updater(base_dir=os.path.join(work_dir, f"launcher_{index}"),
+                                  update_server=manifest_host.url)
+                hits = cache.status()['hits']
+                assert updater.check_for_updates(force=True), updater.last_error
+                update_file = updater.download_update()
+                assert update_file and os.path.getsize(update_file) == size, "No se descargó el zip"
+                stats = cache.status()
+                print(f"  launcher {index + 1}: zip descargado, aciertos del caché +{stats['hits'] - hits}, "
+                      f"internet {link.sent / MB:.1f} MB")
+            assert stats['hits'] > hits, "El segundo launcher no acertó en el caché"
+            assert link.sent <= size * 1.01, "El zip se pidió a internet más de una vez"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del caché de la red local")
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--files', type=int, default=40)
+    parser.add_argument('--size-kb', type=int, default=256)
+    parser.add_argument('--wan-mbps', type=float, default=8, help="Ancho de banda de internet en MB/s")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="sakura-lan-cache-bench-")
+    try:
+        server_dir = os.path.join(work_dir, "internet")
+        build_server_files(server_dir, args.files, args.size_kb * KB)
+        release_size = args.files * args.size_kb * KB
+        print(f"🌐 Internet a {args.wan_mbps:g} MB/s; {args.clients} equipos × "
+              f"{release_size / MB:.1f} MB ({args.files} archivos)")
+
+        link = SimulatedLink(args.wan_mbps * MB, latency=0.02)
+        with LocalServer(server_dir, handler=throttled_handler(link)) as upstream:
+            lan_cache.configure("off")
+            elapsed, failed = run_clients(upstream.url, work_dir, "directo", args.clients)
+            print(f"  sin caché  {elapsed:6.2f}s  internet {link.sent / MB:6.1f} MB  fallidos {failed}")
+
+            link.sent = 0
+            cache_dir = os.path.join(work_dir, "cache")
+            with lan_cache.CacheServer(cache_dir, upstreams=[upstream.url], host="127.0.0.1", port=0,
+                                       discovery_port=DISCOVERY_PORT) as cache:
+                lan_cache.configure(None)
+                found = lan_cache.discover(port=DISCOVERY_PORT)
+                assert found == cache.url, f"Descubrimiento: {found} != {cache.url}"
+                lan_cache.configure(found)
+
+                elapsed, failed = run_clients(upstream.url, work_dir, "caché", args.clients)
+                stats = cache.status()
+                print(f"  con caché  {elapsed:6.2f}s  internet {link.sent / MB:6.1f} MB  fallidos {failed}  "
+                      f"(aciertos {stats['hits']}/{stats['requests']}, servidos {stats['served_bytes'] / MB:.1f} MB)")
+
+                link.sent = 0
+                elapsed, failed = run_clients(upstream.url, work_dir, "caliente", args.clients)
+                print(f"  caché lleno {elapsed:5.2f}s  internet {link.sent / MB:6.1f} MB  fallidos {failed}")
+
+        print("📦 Actualización del launcher a través del caché")
+        check_update_zip(work_dir, args.size_kb * KB)
+    finally:
+        lan_cache.configure(None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
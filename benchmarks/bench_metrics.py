@@ -0,0 +1,83 @@
+"""Benchmark del coste de las métricas (sakura/metrics.py) en caminos calientes.
+
+Mide cuánto cuesta cada operación (contador, histograma, histograma con
+etiquetas, histograma como `with`) desde uno y varios hilos, y cuánto tarda
+exportar el registro completo en texto y en JSON.
+
+Uso:
+    python benchmarks/bench_metrics.py [--ops 200000] [--threads 4]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from sakura.metrics import Registry  # noqa: E402
+
+
+def per_op(function, ops, threads):
+    """Nanosegundos por operación (tiempo total / operaciones de todos los hilos)"""
+    def worker():
+        for _ in range(ops):
+            function()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return (time.perf_counter() - start) / (ops * threads) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del coste de las métricas")
+    parser.add_argument('--ops', type=int, default=200000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter("bench_total", "Contador")
+    histogram = registry.histogram("bench_seconds", "Histograma")
+    labelled = registry.histogram("bench_labelled_seconds", "Histograma con etiquetas", ('source',))
+    child = labelled.labels(source='direct')
+
+    def timed():
+        with histogram.time():
+            pass
+
+    operations = [
+        ("vacío (referencia)", lambda: None),
+        ("contador inc()", counter.inc),
+        ("histograma observe()", lambda: histogram.observe(0.042)),
+        ("labels(...).observe()", lambda: labelled.labels(source='direct').observe(0.042)),
+        ("hijo guardado observe()", lambda: child.observe(0.042)),
+        ("with histograma.time()", timed),
+    ]
+    for threads in sorted({1, args.threads}):
+        print(f"🧵 {threads} hilo(s):")
+        for name, function in operations:
+            print(f"  {name:26s} {per_op(function, args.ops // threads, threads):7.0f} ns/op")
+
+    for i in range(50):
+        family = registry.histogram(f"bench_family_{i}_seconds", "Relleno", ('phase',))
+        for phase in ("a", "b", "c"):
+            family.labels(phase=phase).observe(i / 100)
+    start = time.perf_counter()
+    text = registry.render_text()
+    render_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    body = json.dumps(registry.as_dict())
+    json_ms = (time.perf_counter() - start) * 1000
+    print(f"📄 Exportar {len(registry.metrics)} familias: texto {render_ms:.2f} ms ({len(text) // 1024} KB), "
+          f"JSON {json_ms:.2f} ms ({len(body) // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Benchmark del índice de mods (sakura/mods.py) con un modpack sintético.
+
+Genera N jars con muchas clases cada uno (mitad Fabric, mitad Forge, más
+algún duplicado) y compara tres formas de listar los mods:
+
+  * zipfile: abrir cada jar con zipfile.ZipFile y leer los metadatos
+  * índice en frío: leer sólo el directorio central y la entrada de metadatos
+  * índice en caliente: la caché por (fecha, tamaño) ya está llena
+
+Uso:
+    python benchmarks/bench_mod_index.py [--mods 300] [--entries 2000]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from sakura import mods as mod_index  # noqa: E402
+from sakura.state import flush_all  # noqa: E402
+
+FORGE_TOML = """modLoader="javafml"
+loaderVersion="[47,)"
+license="MIT"
+
+[[mods]]
+modId="{mod_id}"
+version="${{file.jarVersion}}"
+displayName="Mod {index}"
+
+[[dependencies.{mod_id}]]
+modId="forge"
+mandatory=true
+versionRange="[47,)"
+ordering="NONE"
+side="BOTH"
+"""
+
+
+def build_pack(mods_dir, count, entries):
+    """Jars con `entries` clases cada uno; los 3 últimos repiten un ID anterior"""
+    os.makedirs(mods_dir)
+    class_data = os.urandom(256) * 8
+    for index in range(count):
+        mod_id = f"mod_{index % (count - 3)}" if index >= count - 3 else f"mod_{index}"
+        path = os.path.join(mods_dir, f"{mod_id}-{index}.jar")
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as jar:
+            if index % 2:
+                jar.writestr("META-INF/MANIFEST.MF", f"Manifest-Version: 1.0\nImplementation-Version: 1.{index}\n")
+                jar.writestr("META-INF/mods.toml", FORGE_TOML.format(mod_id=mod_id, index=index))
+            else:
+                jar.writestr("fabric.mod.json", json.dumps({
+                    "schemaVersion": 1, "id": mod_id, "version": f"1.{index}", "name": f"Mod {index}",
+                    "depends": {"fabricloader": ">=0.14", "minecraft": "~1.20.1"},
+                }))
+            for entry in range(entries):
+                jar.writestr(f"com/example/{mod_id}/Class{entry}.class", class_data)
+
+
+def naive_index(mods_dir):
+    """Lo que haría una implementación ingenua: ZipFile completo por jar"""
+    found = 0
+    for name in sorted(os.listdir(mods_dir)):
+        with zipfile.ZipFile(os.path.join(mods_dir, name)) as jar:
+            names = set(jar.namelist())
+            for metadata in mod_index.METADATA_FILES:
+                if metadata in names:
+                    jar.read(metadata)
+                    found += 1
+                    break
+    return found
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice de mods")
+    parser.add_argument('--mods', type=int, default=300)
+    parser.add_argument('--entries', type=int, default=2000, help="Clases por jar")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="sakura-mods-bench-")
+    try:
+        mods_dir = os.path.join(work_dir, "mods")
+        print(f"📦 Generando {args.mods} jars × {args.entries} clases...")
+        build_pack(mods_dir, args.mods, args.entries)
+        total = sum(entry.stat().st_size for entry in os.scandir(mods_dir))
+        print(f"   {total / 1024 / 1024:.0f} MB")
+
+        elapsed, found = timed(naive_index, mods_dir)
+        print(f"  zipfile.ZipFile      {elapsed:8.1f} ms  ({found} jars con metadatos)")
+
+        elapsed, (mods, errors) = timed(mod_index.index_mods, mods_dir, base_dir=work_dir, use_cache=False)
+        print(f"  índice en frío       {elapsed:8.1f} ms  ({len(mods)} mods, {len(errors)} errores)")
+
+        elapsed, (mods, errors) = timed(mod_index.index_mods, mods_dir, base_dir=work_dir)
+        issues = mod_index.find_issues(mods)
+        print(f"  índice en caliente   {elapsed:8.1f} ms  ({len(issues)} problemas detectados)")
+    finally:
+        flush_all()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Benchmark offline del pipeline completo de actualización (núcleo sin Qt).
+
+Genera manifiestos y zips sintéticos (de 1 MB a 1 GB, con pocos o muchos
+archivos), los sirve desde un servidor HTTP local y mide cada etapa:
+check_for_updates, download_update, create_backup, apply_update y
+restore_backup. Los resultados se guardan en JSON para comparar versiones.
+
+Uso:
+    python benchmarks/bench_update_pipeline.py                 # escenarios rápidos
+    python benchmarks/bench_update_pipeline.py --full          # incluye 1 GB
+    python benchmarks/bench_update_pipeline.py --compare bench_results_anterior.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from local_server import LocalServer, write_manifest  # noqa: E402
+from sakura.config import UPDATE_FILE, VERSION, VERSION_FILE  # noqa: E402
+from sakura.integrity import build_chunk_list  # noqa: E402
+from sakura.updater import Updater  # noqa: E402
+
+MB = 1024 * 1024
+STAGES = ['check_for_updates', 'download_update', 'create_backup', 'apply_update', 'restore_backup']
+
+# nombre, tamaño total, número de archivos
+QUICK_SCENARIOS = [
+    ('1MB-few', 1 * MB, 4),
+    ('1MB-many', 1 * MB, 200),
+    ('64MB-few', 64 * MB, 4),
+    ('64MB-many', 64 * MB, 500),
+]
+FULL_SCENARIOS = QUICK_SCENARIOS + [
+    ('1GB-few', 1024 * MB, 8),
+    ('1GB-many', 1024 * MB, 2000),
+]
+
+
+def build_release(directory, total_size, file_count, seed, chunk_size):
+    """Crea el zip de actualización y el manifiesto sintéticos en `directory`"""
+    rng = random.Random(seed)
+    per_file = max(total_size // file_count, 1)
+    files = [f"assets/bench/file_{i:05d}.bin" for i in range(file_count)]
+    zip_path = os.path.join(directory, UPDATE_FILE)
+
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for name in files:
+            # Mitad aleatoria y mitad repetida para que la compresión tenga trabajo realista
+            half = per_file // 2
+            zf.writestr(name, rng.randbytes(half) + bytes(per_file - half))
+
+    digest = hashlib.sha256()
+    with open(zip_path, 'rb') as f:
+        for block in iter(lambda: f.read(MB), b""):
+            digest.update(block)
+
+    manifest = {
+        'version': '999.0.0',
+        'changelog': 'Benchmark',
+        'download_url': f"{{server}}{UPDATE_FILE}",
+        'files': files,
+        'sha256': digest.hexdigest(),
+        'size': os.path.getsize(zip_path),
+    }
+    if chunk_size:
+        manifest['chunks'] = build_chunk_list(zip_path, chunk_size)
+    return manifest
+
+
+def install_previous_version(install_dir, files, per_file):
+    """Simula una instalación existente con los mismos archivos (para backup/restore)"""
+    for name in files:
+        path = os.path.join(install_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(bytes(per_file))
+
+
+def run_scenario(name, total_size, file_count, repeat, chunk_size):
+    """Ejecuta el pipeline `repeat` veces y devuelve los tiempos por etapa"""
+    timings = {stage: [] for stage in STAGES}
+    work_dir = tempfile.mkdtemp(prefix=f"sakura_bench_{name}_")
+
+    try:
+        server_dir = os.path.join(work_dir, 'server')
+        os.makedirs(server_dir)
+        manifest = build_release(server_dir, total_size, file_count, seed=file_count, chunk_size=chunk_size)
+
+        with LocalServer(server_dir) as server:
+            manifest['download_url'] = manifest['download_url'].format(server=server.url)
+            write_manifest(os.path.join(server_dir, VERSION_FILE), manifest)
+
+            for _ in range(repeat):
+                install_dir = os.path.join(work_dir, 'install')
+                shutil.rmtree(install_dir, ignore_errors=True)
+                os.makedirs(install_dir)
+                install_previous_version(install_dir, manifest['files'], max(total_size // file_count, 1))
+
+                manager = Updater(base_dir=install_dir, update_server=server.url)
+
+                start = time.perf_counter()
+                assert manager.check_for_updates(force=True), "no se detectó la actualización"
+                timings['check_for_updates'].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                update_file = manager.download_update()
+                timings['download_update'].append(time.perf_counter() - start)
+                assert update_file, "la descarga falló"
+
+                start = time.perf_counter()
+                assert manager.create_backup(), "el backup falló"
+                timings['create_backup'].append(time.perf_counter() - start)
+
+                # apply_update incluye su propio create_backup, como en producción
+                start = time.perf_counter()
+                success, message = manager.apply_update(update_file)
+                timings['apply_update'].append(time.perf_counter() - start)
+                assert success, f"apply_update falló: {message}"
+
+                start = time.perf_counter()
+                assert manager.restore_backup(), "la restauración falló"
+                timings['restore_backup'].append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = []
+    for stage in STAGES:
+        values = timings[stage]
+        best = min(values)
+        results.append({
+            'scenario': name,
+            'size_bytes': total_size,
+            'files': file_count,
+            'stage': stage,
+            'runs': len(values),
+            'min_s': round(best, 6),
+            'median_s': round(statistics.median(values), 6),
+            'mb_per_s': round(total_size / MB / best, 2) if stage != 'check_for_updates' and best > 0 else None,
+        })
+    return results
+
+
+def compare(results, previous_path):
+    """Imprime la variación de la mediana frente a un JSON de resultados anterior"""
+    with open(previous_path, 'r') as f:
+        previous = json.load(f)
+    old = {(r['scenario'], r['stage']): r['median_s'] for r in previous.get('results', [])}
+
+    print(f"\n📊 Comparación con {previous_path} (versión {previous.get('launcher_version')})")
+    for r in results:
+        before = old.get((r['scenario'], r['stage']))
+        if not before:
+            continue
+        change = (r['median_s'] - before) * 100 / before
+        marker = "🔺" if change > 10 else ("🔻" if change < -10 else "  ")
+        print(f"  {marker} {r['scenario']:<10} {r['stage']:<18} {before:9.4f}s → {r['median_s']:9.4f}s ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline del pipeline de actualización")
+    parser.add_argument('--full', action='store_true', help="Incluye los escenarios de 1 GB")
+    parser.add_argument('--scenario', action='append', help="Ejecuta sólo los escenarios indicados")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--chunk-size', type=int, default=0,
+                        help="Añade hashes por bloque al manifiesto (0 = sin bloques)")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    scenarios = FULL_SCENARIOS if args.full else QUICK_SCENARIOS
+    if args.scenario:
+        scenarios = [s for s in FULL_SCENARIOS if s[0] in args.scenario]
+
+    results = []
+    for name, total_size, file_count in scenarios:
+        print(f"⏱️ {name} ({total_size // MB} MB, {file_count} archivos)...")
+        scenario_results = run_scenario(name, total_size, file_count, args.repeat, args.chunk_size)
+        for r in scenario_results:
+            rate = f" ({r['mb_per_s']} MB/s)" if r['mb_per_s'] else ""
+            print(f"    {r['stage']:<18} {r['median_s']:.4f}s{rate}")
+        results.extend(scenario_results)
+
+    report = {
+        'launcher_version': VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now().isoformat(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Resultados guardados en {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Benchmark de "Verificar archivos" sobre una instancia sintética.
+
+Genera una instancia (librerías y mods de varios tamaños, muchos archivos
+pequeños de config/assets), la sirve desde un servidor HTTP local, daña
+algunos archivos y mide la verificación con 1 hilo y con el número por
+defecto, y luego la reparación (cuántos bytes hubo que volver a descargar).
+
+Uso:
+    python benchmarks/bench_verify_instance.py [--size-mb 512] [--files 2000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from local_server import LocalServer, write_manifest  # noqa: E402
+from sakura.repair import HASH_WORKERS, InstanceRepair, hash_file  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def build_instance(root, size, count):
+    """Unos pocos archivos grandes (90 % del tamaño) y muchos pequeños"""
+    rng = random.Random(42)
+    large = max(1, count // 50)
+    sizes = [int(size * 0.9 / large)] * large
+    sizes += [max(1, int(size * 0.1 / (count - large)))] * (count - large)
+    files = {}
+    for i, file_size in enumerate(sizes):
+        folder = "libraries" if i < large // 2 else "mods" if i < large else rng.choice(["config", "assets/objects"])
+        rel_path = f"{folder}/file_{i:05d}.bin"
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(rng.randbytes(file_size))
+        files[rel_path] = {'sha256': hash_file(path), 'size': file_size}
+    return {'version': 1, 'base_url': "files/", 'files': files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de verificación y reparación")
+    parser.add_argument('--size-mb', type=int, default=512)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--damage', type=int, default=5, help="Archivos a dañar")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="sakura-verify-bench-")
+    try:
+        server_dir = os.path.join(work_dir, "server")
+        files_dir = os.path.join(server_dir, "files")
+        game_dir = os.path.join(work_dir, "instance")
+        print(f"📝 Generando instancia de {args.size_mb} MB en {args.files} archivos...")
+        manifest = build_instance(files_dir, args.size_mb * MB, args.files)
+        shutil.copytree(files_dir, game_dir)
+        write_manifest(os.path.join(server_dir, "manifest.json"), manifest)
+
+        with LocalServer(server_dir) as server:
+            for workers in sorted({1, HASH_WORKERS}):
+                repair = InstanceRepair(game_dir, server.url, workers=workers, base_dir=work_dir)
+                start = time.perf_counter()
+                problems, _ = repair.verify(manifest)
+                elapsed = time.perf_counter() - start
+                print(f"⏱️ verify ({workers} hilos): {elapsed:.2f}s "
+                      f"({args.size_mb / elapsed:.0f} MB/s), {len(problems)} problemas")
+
+            rng = random.Random(7)
+            damaged = rng.sample(sorted(manifest['files']), args.damage)
+            for i, rel_path in enumerate(damaged):
+                path = os.path.join(game_dir, rel_path)
+                if i % 2:
+                    os.remove(path)
+                else:
+                    with open(path, 'r+b') as f:
+                        f.write(b"\0" * 16)
+
+            repair = InstanceRepair(game_dir, server.url, base_dir=work_dir)
+            start = time.perf_counter()
+            repaired, failed, _ = repair.verify_and_repair()
+            elapsed = time.perf_counter() - start
+            downloaded = sum(manifest['files'][rel_path]['size'] for rel_path in repaired)
+            print(f"🛠️ verify + repair: {elapsed:.2f}s, {len(repaired)} reparados, {len(failed)} fallidos, "
+                  f"{downloaded / MB:.1f} MB descargados de {args.size_mb} MB")
+            assert not repair.verify(manifest)[0], "La instancia sigue dañada"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
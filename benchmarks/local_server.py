@@ -0,0 +1,184 @@
+"""Servidor HTTP local para benchmarks (sin red): sirve un directorio con soporte de Range.
+
+SimulatedLink + throttled_handler() imitan un enlace real: ancho de banda
+total compartido, tope por conexión (lo que da TCP con esa latencia),
+latencia por petición y un máximo de conexiones a partir del cual el
+servidor responde 503.
+
+El launcher rechaza los manifiestos sin firma: write_manifest() los firma con
+una clave de prueba, cuya clave pública se configura al importar este módulo
+(antes de importar sakura.config). También se desactiva el caché de la red
+local, para que un espejo de la red no altere las medidas.
+"""
+import functools
+import hashlib
+import http.server
+import json
+import os
+import re
+import threading
+import time
+
+from sakura import ed25519
+from sakura.integrity import sign_manifest
+
+BENCH_PRIVATE_KEY = hashlib.sha256(b"sakura-benchmarks").hexdigest()
+os.environ['SAKURA_UPDATE_PUBLIC_KEY'] = ed25519.public_key(bytes.fromhex(BENCH_PRIVATE_KEY)).hex()
+os.environ['SAKURA_LAN_CACHE'] = "off"
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+def write_manifest(path, manifest):
+    """Escribe `manifest` firmado con la clave de prueba"""
+    manifest['signature'] = sign_manifest(manifest, BENCH_PRIVATE_KEY)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler con soporte para una única cabecera Range"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        match = _RANGE.match(self.headers.get('Range', ''))
+        path = self.translate_path(self.path)
+        if not match or not os.path.isfile(path):
+            return super().send_head()
+
+        size = os.path.getsize(path)
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        end = min(end, size - 1)
+        if start > end:
+            self.send_error(416, "Rango no satisfacible")
+            return None
+
+        f = open(path, 'rb')
+        f.seek(start)
+        self.send_response(206)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        return _LimitedFile(f, end - start + 1)
+
+
+class _LimitedFile:
+    """Archivo que sólo deja leer `remaining` bytes (para copyfile del handler)"""
+
+    def __init__(self, f, remaining):
+        self.f = f
+        self.remaining = remaining
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+class LocalServer:
+    """Levanta un ThreadingHTTPServer en 127.0.0.1 sobre `directory` mientras dure el `with`"""
+
+    def __init__(self, directory, handler=RangeRequestHandler):
+        self.directory = directory
+        self.handler = handler
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}/"
+
+    def __enter__(self):
+        handler = functools.partial(self.handler, directory=self.directory)
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+
+class SimulatedLink:
+    """Enlace simulado compartido por todas las conexiones del servidor"""
+
+    def __init__(self, bandwidth, per_connection=None, latency=0.0, max_connections=None):
+        self.bandwidth = bandwidth  # bytes/s del enlace completo
+        self.per_connection = per_connection  # bytes/s máximos de cada conexión
+        self.latency = latency  # segundos antes de la primera respuesta
+        self.max_connections = max_connections  # más conexiones = 503
+        self.lock = threading.Lock()
+        self.next_free = time.monotonic()
+        self.active = 0
+        self.rejected = 0
+        self.sent = 0  # bytes enviados por el enlace (tráfico de internet simulado)
+
+    def reserve(self, amount):
+        """Turno en el enlace compartido para `amount` bytes (segundos a esperar)"""
+        with self.lock:
+            now = time.monotonic()
+            start = max(self.next_free, now)
+            self.next_free = start + amount / self.bandwidth
+            return self.next_free - now
+
+
+class ThrottledRequestHandler(RangeRequestHandler):
+    """RangeRequestHandler que envía al ritmo de `link`"""
+
+    link = None
+    block_size = 16 * 1024
+
+    def do_GET(self):
+        link = self.link
+        with link.lock:
+            overloaded = link.max_connections is not None and link.active >= link.max_connections
+            if overloaded:
+                link.rejected += 1
+            else:
+                link.active += 1
+        if overloaded:
+            self.send_error(503, "Demasiadas conexiones")
+            return
+        try:
+            time.sleep(link.latency)
+            super().do_GET()
+        finally:
+            with link.lock:
+                link.active -= 1
+
+    def copyfile(self, source, outputfile):
+        link = self.link
+        connection_free = time.monotonic()
+        while True:
+            block = source.read(self.block_size)
+            if not block:
+                break
+            delay = link.reserve(len(block))
+            if link.per_connection:
+                now = time.monotonic()
+                connection_free = max(connection_free, now) + len(block) / link.per_connection
+                delay = max(delay, connection_free - now)
+            if delay > 0:
+                time.sleep(delay)
+            outputfile.write(block)
+            with link.lock:
+                link.sent += len(block)
+
+
+def throttled_handler(link):
+    """Clase de handler para LocalServer que usa `link`"""
+    return type('SimulatedLinkHandler', (ThrottledRequestHandler,), {'link': link})
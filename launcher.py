@@ -1,309 +1,102 @@
 import sys
 import os
-import json
-import hashlib
-import zipfile
-import tempfile
-import urllib.request
-import urllib.error
+import subprocess
 import threading
-import shutil
-from datetime import datetime
+import time
+
+PROCESS_STARTED = time.perf_counter()  # Referencia de las métricas de arranque
+
+# Modo sin interfaz: se resuelve antes de importar PyQt5 para arrancar al instante
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    from sakura.cli import main as headless_main
+    sys.exit(headless_main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
+# Caché de actualizaciones para la red local: tampoco necesita la interfaz
+if __name__ == "__main__" and "--serve-cache" in sys.argv[1:]:
+    from sakura.cli import main as headless_main
+    sys.exit(headless_main(["serve-cache"] + [arg for arg in sys.argv[1:] if arg != "--serve-cache"]))
+
+# Instancia única: si ya hay un launcher abierto se le pasan los argumentos y se sale
+if __name__ == "__main__":
+    from sakura.single_instance import SingleInstance
+    single_instance = SingleInstance()
+    try:
+        if not single_instance.claim(sys.argv[1:]):
+            sys.exit(0)
+    except RuntimeError as e:
+        print(f"⚠️ {e}")
+        sys.exit(1)
+    # Una actualización descargada en segundo plano se instala antes de abrir la interfaz
+    from sakura.updater import Updater as _StartupUpdater
+    _staged = _StartupUpdater()
+    _staged.on('status', print)
+    _result = _staged.apply_staged_update()
+    if _result and _result[0]:
+        single_instance.release()
+        from sakura.state import flush_all
+        flush_all()
+        os.execl(sys.executable, sys.executable, *sys.argv)
+    del _staged, _result, _StartupUpdater
+    single_instance.listen()
+
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 import webbrowser
+from html import escape
 
-# ============================================
-# CONFIGURACIÓN DEL SISTEMA DE ACTUALIZACIÓN
-# ============================================
-VERSION = "0.0.7"
-UPDATE_SERVER = "https://raw.githubusercontent.com/Plxgio/SakuraLauncher/master/updates/"
-VERSION_FILE = "launcher_version.json"
-UPDATE_FILE = "launcher_update.zip"
-CHECK_INTERVAL = 3600  # Segundos entre verificaciones (1 hora)
+from sakura import metrics
+from sakura.assets import AssetIndex
+from sakura.config import MEMORY_BUDGET, VERSION, UPDATE_SERVER
+from sakura.content import ContentStore
+from sakura.crash_analyzer import analyze_game_dir
+from sakura.game import LaunchError, launch_game, load_instance
+from sakura.game_log import DEFAULT_CAPACITY as LOG_CAPACITY, LEVEL_RANK, LogReader, LogRingBuffer
+from sakura.image_cache import ImageCache
+from sakura.java import find_runtimes
+from sakura.mods import find_issues, index_mods
+from sakura.memory import current_rss, format_rss, set_background_priority, trim_memory
+from sakura.progress import format_eta, format_rate
+from sakura.repair import InstanceRepair
+from sakura.scheduler import RATE_LIMIT_CHOICES, get_scheduler
+from sakura.state import flush_all as flush_state, get_store
+from sakura.updater import Updater
+
+STARTUP_SECONDS = metrics.histogram(
+    "sakura_startup_seconds", "Segundos desde que arranca el proceso hasta el final de cada fase", ('phase',))
+PAINT_SECONDS = metrics.histogram(
+    "sakura_paint_seconds", "Duración de cada repintado del fondo", buckets=metrics.PAINT_BUCKETS)
+GAME_FIRST_OUTPUT_SECONDS = metrics.histogram(
+    "sakura_game_first_output_seconds", "Segundos desde pulsar JUGAR hasta la primera línea del juego")
+STARTUP_SECONDS.labels(phase='imports').observe(time.perf_counter() - PROCESS_STARTED)
 
 # ============================================
 # CLASE PARA MANEJAR ACTUALIZACIONES
 # ============================================
 
 class UpdateManager(QObject):
-    """Manejador de actualizaciones automáticas"""
+    """Adaptador Qt del Updater: reenvía sus eventos como señales"""
     
     update_available = pyqtSignal(str, str)  # nueva_versión, changelog
-    update_progress = pyqtSignal(int)  # progreso 0-100
+    update_progress = pyqtSignal(int, float, float)  # progreso 0-100, bytes/s, segundos restantes (-1 = ?)
     update_finished = pyqtSignal(bool, str)  # éxito, mensaje
     status_changed = pyqtSignal(str)  # estado actual
+    files_changed = pyqtSignal(list)  # rutas relativas reemplazadas por la actualización
     
-    def __init__(self):
+    def __init__(self, base_dir=None, update_server=UPDATE_SERVER):
         super().__init__()
-        self.script_dir = os.path.dirname(os.path.abspath(__file__))
-        self.temp_dir = os.path.join(self.script_dir, "temp_updates")
-        self.backup_dir = os.path.join(self.script_dir, "backup")
-        self.last_check_file = os.path.join(self.script_dir, "last_check.txt")
-        self.update_info_file = os.path.join(self.script_dir, "update_info.json")
-        
-        # Crear directorios si no existen
-        os.makedirs(self.temp_dir, exist_ok=True)
-        os.makedirs(self.backup_dir, exist_ok=True)
-    
-    def should_check_update(self):
-        """Determina si debe verificar actualizaciones basado en la última verificación"""
-        if not os.path.exists(self.last_check_file):
-            return True
-        
-        try:
-            with open(self.last_check_file, 'r') as f:
-                last_check = float(f.read().strip())
-            
-            elapsed = datetime.now().timestamp() - last_check
-            return elapsed > CHECK_INTERVAL
-        except:
-            return True
+        self.core = Updater(base_dir, update_server)
+        
+        # Las señales se emiten desde el hilo de trabajo; Qt las encola hacia la GUI
+        self.core.on('update_available', self.update_available.emit)
+        self.core.on('progress', self.update_progress.emit)
+        self.core.on('finished', self.update_finished.emit)
+        self.core.on('status', self.status_changed.emit)
+        self.core.on('files_changed', self.files_changed.emit)
     
-    def update_last_check(self):
-        """Actualiza el timestamp de la última verificación"""
-        try:
-            with open(self.last_check_file, 'w') as f:
-                f.write(str(datetime.now().timestamp()))
-        except:
-            pass
-    
-    def check_for_updates(self, force=False):
-        """Verifica si hay actualizaciones disponibles"""
-        if not force and not self.should_check_update():
-            return False
-        
-        self.status_changed.emit("🔍 Buscando actualizaciones...")
-        
-        try:
-            # Descargar información de versión
-            version_url = f"{UPDATE_SERVER}{VERSION_FILE}"
-            self.status_changed.emit(f"📡 Conectando a {UPDATE_SERVER}")
-            
-            response = urllib.request.urlopen(version_url, timeout=10)
-            data = json.loads(response.read().decode('utf-8'))
-            
-            remote_version = data.get('version', '0.0.0')
-            changelog = data.get('changelog', 'Sin información de cambios')
-            download_url = data.get('download_url', '')
-            
-            self.status_changed.emit(f"🔄 Versión remota: {remote_version}")
-            
-            # Comparar versiones
-            if self.compare_versions(remote_version, VERSION) > 0:
-                self.status_changed.emit(f"🎯 ¡Nueva versión disponible! ({remote_version})")
-                
-                # Guardar información de la actualización
-                update_info = {
-                    'remote_version': remote_version,
-                    'changelog': changelog,
-                    'download_url': download_url,
-                    'files': data.get('files', []),
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                with open(self.update_info_file, 'w') as f:
-                    json.dump(update_info, f, indent=2)
-                
-                self.update_available.emit(remote_version, changelog)
-                self.update_last_check()
-                return True
-            else:
-                self.status_changed.emit("✅ Estás en la última versión")
-                if force:
-                    self.update_finished.emit(True, "Ya tienes la última versión")
-                self.update_last_check()
-                return False
-                
-        except urllib.error.URLError as e:
-            self.status_changed.emit(f"⚠️ Error de conexión: {str(e)}")
-            return False
-        except Exception as e:
-            self.status_changed.emit(f"❌ Error: {str(e)}")
-            return False
-    
-    def compare_versions(self, v1, v2):
-        """Compara dos versiones en formato semántico (x.y.z)"""
-        v1_parts = list(map(int, v1.split('.')))
-        v2_parts = list(map(int, v2.split('.')))
-        
-        # Asegurar que ambas versiones tengan la misma longitud
-        while len(v1_parts) < len(v2_parts):
-            v1_parts.append(0)
-        while len(v2_parts) < len(v1_parts):
-            v2_parts.append(0)
-        
-        for i in range(len(v1_parts)):
-            if v1_parts[i] > v2_parts[i]:
-                return 1
-            elif v1_parts[i] < v2_parts[i]:
-                return -1
-        
-        return 0
-    
-    def download_update(self):
-        """Descarga la actualización"""
-        try:
-            with open(self.update_info_file, 'r') as f:
-                update_info = json.load(f)
-            
-            download_url = update_info.get('download_url')
-            if not download_url:
-                self.status_changed.emit("❌ No hay URL de descarga disponible")
-                return False
-            
-            self.status_changed.emit("📥 Descargando actualización...")
-            
-            # Limpiar directorio temporal
-            for file in os.listdir(self.temp_dir):
-                os.remove(os.path.join(self.temp_dir, file))
-            
-            # Descargar archivo
-            temp_file = os.path.join(self.temp_dir, UPDATE_FILE)
-            
-            def report_progress(count, block_size, total_size):
-                if total_size > 0:
-                    percent = int(count * block_size * 100 / total_size)
-                    self.update_progress.emit(min(percent, 100))
-            
-            urllib.request.urlretrieve(download_url, temp_file, report_progress)
-            
-            self.status_changed.emit("✅ Descarga completada")
-            return temp_file
-            
-        except Exception as e:
-            self.status_changed.emit(f"❌ Error en descarga: {str(e)}")
-            return False
-    
-    def create_backup(self):
-        """Crea una copia de seguridad de los archivos actuales"""
-        self.status_changed.emit("💾 Creando copia de seguridad...")
-        
-        try:
-            # Limpiar backup anterior
-            if os.path.exists(self.backup_dir):
-                shutil.rmtree(self.backup_dir)
-            os.makedirs(self.backup_dir, exist_ok=True)
-            
-            # Archivos a respaldar
-            files_to_backup = [
-                'launcher.py',
-                'assets/logo.png',
-                'assets/fondo.png',
-                'assets/background.png'
-            ]
-            
-            for file_path in files_to_backup:
-                full_path = os.path.join(self.script_dir, file_path)
-                if os.path.exists(full_path):
-                    # Crear directorios necesarios
-                    dest_dir = os.path.join(self.backup_dir, os.path.dirname(file_path))
-                    os.makedirs(dest_dir, exist_ok=True)
-                    
-                    # Copiar archivo
-                    dest_path = os.path.join(self.backup_dir, file_path)
-                    shutil.copy2(full_path, dest_path)
-            
-            self.status_changed.emit("✅ Copia de seguridad creada")
-            return True
-            
-        except Exception as e:
-            self.status_changed.emit(f"⚠️ Error en backup: {str(e)}")
-            return False
-    
-    def apply_update(self, update_file):
-        """Aplica la actualización"""
-        try:
-            self.status_changed.emit("🔄 Aplicando actualización...")
-            
-            # Crear backup primero
-            if not self.create_backup():
-                self.status_changed.emit("⚠️ Continuando sin backup...")
-            
-            # Extraer archivos
-            with zipfile.ZipFile(update_file, 'r') as zip_ref:
-                # Obtener lista de archivos
-                file_list = zip_ref.namelist()
-                
-                # Extraer cada archivo
-                for i, file in enumerate(file_list):
-                    zip_ref.extract(file, self.script_dir)
-                    
-                    # Actualizar progreso
-                    progress = int((i + 1) * 100 / len(file_list))
-                    self.update_progress.emit(progress)
-            
-            # Limpiar archivos temporales
-            self.cleanup_temp_files()
-            
-            self.status_changed.emit("✨ ¡Actualización aplicada con éxito!")
-            
-            # Actualizar información de versión
-            with open(self.update_info_file, 'r') as f:
-                update_info = json.load(f)
-            
-            return True, update_info.get('remote_version', '')
-            
-        except Exception as e:
-            self.status_changed.emit(f"❌ Error aplicando update: {str(e)}")
-            
-            # Intentar restaurar desde backup
-            self.restore_backup()
-            return False, str(e)
-    
-    def restore_backup(self):
-        """Restaura la copia de seguridad en caso de error"""
-        try:
-            self.status_changed.emit("🔄 Restaurando desde copia de seguridad...")
-            
-            if os.path.exists(self.backup_dir):
-                # Copiar archivos del backup
-                for root, dirs, files in os.walk(self.backup_dir):
-                    for file in files:
-                        src_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(src_path, self.backup_dir)
-                        dst_path = os.path.join(self.script_dir, rel_path)
-                        
-                        # Crear directorio si no existe
-                        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-                        
-                        # Copiar archivo
-                        shutil.copy2(src_path, dst_path)
-                
-                self.status_changed.emit("✅ Restauración completada")
-                return True
-            else:
-                self.status_changed.emit("⚠️ No hay copia de seguridad disponible")
-                return False
-                
-        except Exception as e:
-            self.status_changed.emit(f"❌ Error en restauración: {str(e)}")
-            return False
-    
-    def cleanup_temp_files(self):
-        """Limpia archivos temporales"""
-        try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-            
-            # Eliminar archivo de info de update
-            if os.path.exists(self.update_info_file):
-                os.remove(self.update_info_file)
-            
-            self.status_changed.emit("🧹 Archivos temporales limpiados")
-        except:
-            pass
-    
-    def get_update_info(self):
-        """Obtiene información de la actualización pendiente"""
-        try:
-            if os.path.exists(self.update_info_file):
-                with open(self.update_info_file, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return None
+    def __getattr__(self, name):
+        # check_for_updates, download_update, apply_update... viven en el núcleo
+        return getattr(self.core, name)
 
 # ============================================
 # DIALOGO DE ACTUALIZACIÓN
@@ -388,6 +181,13 @@ class UpdateDialog(QDialog):
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
         
+        # Velocidad y tiempo restante
+        self.speed_label = QLabel()
+        self.speed_label.setStyleSheet("font-size: 11px; color: #bdc3c7;")
+        self.speed_label.setAlignment(Qt.AlignRight)
+        self.speed_label.setVisible(False)
+        layout.addWidget(self.speed_label)
+        
         # Botones
         button_layout = QHBoxLayout()
         
@@ -438,7 +238,8 @@ class UpdateDialog(QDialog):
                 background-color: rgba(231, 76, 60, 1);
             }
         """)
-        self.cancel_btn.clicked.connect(self.close)
+        self.cancel_btn.clicked.connect(self.cancel)
+        self.discarded = False  # "Cancelar" descarta la descarga; "Más tarde" la conserva
         
         button_layout.addWidget(self.update_btn)
         button_layout.addWidget(self.later_btn)
@@ -455,20 +256,121 @@ class UpdateDialog(QDialog):
         self.status_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.status_label)
     
-    def set_update_info(self, version, changelog):
+    def cancel(self):
+        self.discarded = True
+        self.reject()
+    
+    def set_update_info(self, version, changelog, staged=False):
         self.version_label.setText(f"Versión {version} disponible")
         self.changelog_text.setText(changelog)
+        if staged:
+            # Ya está en disco: sólo queda instalar y reiniciar
+            self.version_label.setText(f"Versión {version} lista para instalar")
+            self.update_btn.setText("Reiniciar y actualizar")
+            self.set_status("📦 Ya descargada. Si eliges más tarde, se instalará al abrir el launcher")
     
     def show_progress(self, show=True):
         self.progress_bar.setVisible(show)
         self.progress_label.setVisible(show)
+        self.speed_label.setVisible(show)
     
-    def set_progress(self, value):
+    def set_progress(self, value, speed=0.0, eta=-1.0):
         self.progress_bar.setValue(value)
+        if speed > 0:
+            self.speed_label.setText(f"{format_rate(speed)} · {format_eta(eta)} restantes")
+        else:
+            self.speed_label.setText("")
     
     def set_status(self, text):
         self.status_label.setText(text)
 
+# ============================================
+# CACHÉ DE IMÁGENES ESCALADAS
+# ============================================
+
+image_cache = ImageCache()
+
+def decode_asset(asset):
+    """Decodifica un asset; los del paquete se leen directamente del mmap"""
+    if asset.pack is None:
+        return QImage(asset.path)
+    image = QImage()
+    with asset.open() as data:
+        image.loadFromData(data)
+    return image
+
+def load_scaled_pixmap(asset, width, height, aspect_mode=Qt.KeepAspectRatio, dpr=1.0):
+    """Devuelve `asset` escalado a width x height (lógicos) usando la caché en disco.
+    
+    En caliente se leen los píxeles crudos ya escalados: no se decodifica el PNG.
+    """
+    try:
+        key = image_cache.key(asset.source, width, height, dpr, int(aspect_mode), sha256=asset.sha256)
+    except OSError:
+        return None
+    
+    cached = image_cache.load(key)
+    if cached:
+        cached_width, cached_height, bytes_per_line, image_format, _, pixels = cached
+        image = QImage(pixels, cached_width, cached_height, bytes_per_line, QImage.Format(image_format))
+        # El QImage apunta a `pixels` y fromImage puede compartir esos datos sin
+        # copiarlos: copy() le da un búfer propio antes de soltar `pixels`
+        pixmap = QPixmap.fromImage(image.copy())
+    else:
+        image = decode_asset(asset)
+        if image.isNull():
+            return None
+        image = image.scaled(round(width * dpr), round(height * dpr), aspect_mode, Qt.SmoothTransformation)
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        image_cache.store(key, image.width(), image.height(), image.bytesPerLine(),
+                          int(image.format()), dpr, bytes(bits))
+        pixmap = QPixmap.fromImage(image)
+    
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+class AssetRegistry:
+    """Registro central de assets: índice por nombre lógico + pixmaps decodificados en memoria"""
+    
+    PIXMAP_CACHE_KB = 32 * 1024  # Límite de QPixmapCache (LRU)
+    
+    def __init__(self):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # assets/ se indexa una vez; el directorio actual se mantiene por compatibilidad
+        self.index = AssetIndex(script_dir, extra_roots=[os.getcwd()])
+        QPixmapCache.setCacheLimit(self.PIXMAP_CACHE_KB)
+    
+    def get(self, name):
+        """Asset con nombre lógico `name` (suelto o dentro de assets.pack), o None"""
+        return self.index.resolve(name)
+    
+    def pixmap(self, name, width, height, aspect_mode=Qt.KeepAspectRatio, dpr=1.0):
+        """Pixmap escalado del asset; las consultas repetidas no tocan el disco"""
+        key = f"{self.index.generation}:{name}:{width}x{height}@{dpr:g}:{int(aspect_mode)}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+        
+        asset = self.index.resolve(name)
+        if not asset:
+            return None
+        pixmap = load_scaled_pixmap(asset, width, height, aspect_mode, dpr)
+        if pixmap and not pixmap.isNull():
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+    
+    def invalidate(self, changed_files=None):
+        """Descarta el índice y los pixmaps (lo dispara el actualizador al reemplazar archivos)"""
+        print(f"🧹 Registro de assets invalidado ({len(changed_files or [])} archivos cambiados)")
+        self.index.invalidate()
+        QPixmapCache.clear()
+    
+    def release(self):
+        """Suelta los pixmaps decodificados; se vuelven a cargar (desde la caché en disco) al pedirlos"""
+        QPixmapCache.clear()
+
 # ============================================
 # COMPONENTES ORIGINALES DEL LAUNCHER
 # ============================================
@@ -497,28 +399,11 @@ class CompactTitleBar(QWidget):
             }
         """)
         
-        # Logo desde assets/logo.png
+        # Logo desde assets/logo.png (escalado a tamaño apropiado)
         logo_label = QLabel()
-        logo_paths = [
-            "assets/logo.png",
-            "./assets/logo.png",
-            os.path.join(os.getcwd(), "assets", "logo.png"),
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo.png"),
-        ]
-        
-        logo_pixmap = None
-        for path in logo_paths:
-            if os.path.exists(path):
-                try:
-                    logo_pixmap = QPixmap(path)
-                    if not logo_pixmap.isNull():
-                        break
-                except:
-                    continue
+        logo_pixmap = self.parent.assets.pixmap("logo", 30, 30, dpr=self.devicePixelRatioF())
         
         if logo_pixmap and not logo_pixmap.isNull():
-            # Escalar el logo a tamaño apropiado
-            logo_pixmap = logo_pixmap.scaled(30, 30, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         else:
             # Fallback a emoji si no hay logo
@@ -597,76 +482,69 @@ class CompactTitleBar(QWidget):
 
 class BackgroundWidget(QWidget):
     """Widget con fondo personalizado - VERSIÓN CORREGIDA"""
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, assets=None, memory_budget=False):
         super().__init__(parent)
+        self.assets = assets
+        # Con presupuesto de memoria sólo se guarda la copia al tamaño de pantalla
+        self.memory_budget = memory_budget
         self.background_image = None
+        self.scaled_image = None  # Copia al tamaño actual del widget (no se rehace en cada paint)
+        self.released = False
         self.load_background()
         
     def load_background(self):
-        """Carga imagen de fondo - MÉTODO MEJORADO"""
+        """Carga imagen de fondo desde el registro de assets"""
         print("🔍 Buscando imagen de fondo...")
         
-        # Buscar en varias ubicaciones posibles
-        possible_paths = [
-            "fondo.png",                # En la misma carpeta
-            "background.png",           # En la misma carpeta
-            "./fondo.png",              # Ruta relativa
-            "./background.png",         # Ruta relativa
-            os.path.join(os.getcwd(), "fondo.png"),      # Ruta absoluta
-            os.path.join(os.getcwd(), "background.png"), # Ruta absoluta
-            os.path.join("assets", "fondo.png"),
-            os.path.join("assets", "background.png"),
-        ]
-        
-        # También buscar en el directorio del script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        possible_paths.extend([
-            os.path.join(script_dir, "fondo.png"),
-            os.path.join(script_dir, "background.png"),
-            os.path.join(script_dir, "fondo.jpg"),
-            os.path.join(script_dir, "background.jpg"),
-            os.path.join(script_dir, "assets", "fondo.png"),
-            os.path.join(script_dir, "assets", "background.png"),
-            os.path.join(script_dir, "assets", "fondo.jpg"),
-            os.path.join(script_dir, "assets", "background.jpg"),
-        ])
-        
-        for img_path in possible_paths:
-            print(f"  Probando: {img_path}")
-            if os.path.exists(img_path):
-                try:
-                    print(f"  ✓ Imagen encontrada en: {img_path}")
-                    print(f"  📏 Tamaño del archivo: {os.path.getsize(img_path)} bytes")
-                    
-                    # Cargar la imagen
-                    self.background_image = QPixmap(img_path)
-                    
-                    if self.background_image.isNull():
-                        print(f"  ✗ Error: No se pudo cargar la imagen (QPIxmap es nulo)")
-                        continue
-                    
+        asset = self.assets.get("background") if self.assets else None
+        if asset:
+            try:
+                print(f"  ✓ Imagen encontrada en: {asset.source}")
+                
+                # Cargar la imagen ya escalada al tamaño de la pantalla (caché en disco)
+                self.background_image = self.load_screen_sized()
+                
+                if self.background_image is not None and not self.background_image.isNull():
                     print(f"  ✅ Imagen cargada exitosamente")
                     print(f"  🖼️ Dimensiones: {self.background_image.width()}x{self.background_image.height()}")
                     return  # Salir si se cargó exitosamente
-                    
-                except Exception as e:
-                    print(f"  ✗ Error cargando {img_path}: {e}")
-                    continue
+                
+                print(f"  ✗ Error: No se pudo cargar la imagen (QPIxmap es nulo)")
+            except Exception as e:
+                print(f"  ✗ Error cargando {asset.source}: {e}")
         
         # Si no se encontró ninguna imagen, crear fondo por defecto
         print("  ⚠️ No se encontró imagen de fondo, creando fondo por defecto")
         self.create_default_background()
     
+    def load_screen_sized(self):
+        """Carga el fondo escalado al tamaño físico de la pantalla principal"""
+        screen = QApplication.primaryScreen()
+        if screen is None:
+            return QPixmap.fromImage(decode_asset(self.assets.get("background")))
+        
+        dpr = screen.devicePixelRatio()
+        size = screen.size()
+        pixmap = self.assets.pixmap("background", round(size.width() * dpr), round(size.height() * dpr),
+                                    Qt.KeepAspectRatioByExpanding)
+        if pixmap:
+            print(f"  ⚡ Fondo preescalado para {size.width()}x{size.height()} @{dpr:g}x")
+        return pixmap
+    
     def create_default_background(self):
         """Crea un fondo por defecto elegante"""
         print("  🎨 Creando fondo por defecto...")
-        self.background_image = QPixmap(1920, 1080)
+        width, height = 1920, 1080
+        screen = QApplication.primaryScreen()
+        if self.memory_budget and screen is not None:
+            width, height = screen.size().width(), screen.size().height()
+        self.background_image = QPixmap(width, height)
         
         painter = QPainter(self.background_image)
         painter.setRenderHint(QPainter.Antialiasing)
         
         # Gradiente elegante rosado/azul
-        gradient = QLinearGradient(0, 0, 1920, 1080)
+        gradient = QLinearGradient(0, 0, width, height)
         gradient.setColorAt(0, QColor(30, 10, 40))      # Púrpura oscuro
         gradient.setColorAt(0.3, QColor(60, 20, 80))    # Púrpura medio
         gradient.setColorAt(0.7, QColor(40, 10, 60))    # Púrpura
@@ -677,8 +555,8 @@ class BackgroundWidget(QWidget):
         import random
         painter.setPen(Qt.NoPen)
         for _ in range(150):
-            x = random.randint(0, 1919)
-            y = random.randint(0, 1079)
+            x = random.randint(0, width - 1)
+            y = random.randint(0, height - 1)
             size = random.randint(2, 8)
             alpha = random.randint(20, 80)
             color = QColor(255, 104, 242, alpha)
@@ -687,8 +565,8 @@ class BackgroundWidget(QWidget):
         
         # Efecto de brillo sutil
         for _ in range(100):
-            x = random.randint(0, 1919)
-            y = random.randint(0, 1079)
+            x = random.randint(0, width - 1)
+            y = random.randint(0, height - 1)
             size = random.randint(1, 3)
             alpha = random.randint(10, 40)
             color = QColor(255, 255, 255, alpha)
@@ -698,24 +576,46 @@ class BackgroundWidget(QWidget):
         painter.end()
         print("  ✅ Fondo por defecto creado")
     
+    def release_images(self):
+        """Suelta los pixmaps del fondo (ventana minimizada u oculta)"""
+        self.background_image = None
+        self.scaled_image = None
+        self.released = True
+    
+    def restore_images(self):
+        """Vuelve a cargar el fondo tras release_images(); se llama al pintar"""
+        self.released = False
+        self.load_background()
+        print(f"🧠 Fondo restaurado: RSS {format_rss()}")
+    
     def paintEvent(self, event):
+        started = time.perf_counter()
+        if self.released:
+            self.restore_images()
+        
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
         if self.background_image and not self.background_image.isNull():
             try:
                 # Escalar manteniendo aspecto
-                scaled_pixmap = self.background_image.scaled(
-                    self.size(), 
-                    Qt.KeepAspectRatioByExpanding, 
-                    Qt.SmoothTransformation
-                )
+                target_size = self.background_image.size().scaled(self.size(), Qt.KeepAspectRatioByExpanding)
                 
                 # Centrar la imagen
-                x = (self.width() - scaled_pixmap.width()) // 2
-                y = (self.height() - scaled_pixmap.height()) // 2
+                x = (self.width() - target_size.width()) // 2
+                y = (self.height() - target_size.height()) // 2
                 
-                painter.drawPixmap(x, y, scaled_pixmap)
+                if self.memory_budget:
+                    # Sin copia extra: se escala al dibujar desde la copia de pantalla
+                    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+                    painter.drawPixmap(QRect(x, y, target_size.width(), target_size.height()),
+                                       self.background_image)
+                else:
+                    # La copia escalada sólo se rehace cuando cambia el tamaño del widget
+                    if self.scaled_image is None or self.scaled_image.size() != target_size:
+                        self.scaled_image = self.background_image.scaled(
+                            target_size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+                    painter.drawPixmap(x, y, self.scaled_image)
                 
                 # Overlay oscuro para mejor contraste
                 overlay = QLinearGradient(0, 0, 0, self.height())
@@ -730,6 +630,9 @@ class BackgroundWidget(QWidget):
         else:
             # Si no hay imagen, usar color sólido
             painter.fillRect(self.rect(), QColor(20, 5, 30))
+        
+        painter.end()
+        PAINT_SECONDS.observe(time.perf_counter() - started)
 
 class ModernButton(QPushButton):
     def __init__(self, text, color="#ff68f2", parent=None):
@@ -780,13 +683,193 @@ class ModernButton(QPushButton):
         color = QColor(hex_color)
         return color.darker(percent).name()
 
+# ============================================
+# CONSOLA DEL JUEGO
+# ============================================
+
+class GameLogModel(QAbstractListModel):
+    """Modelo virtualizado del log: la vista sólo pide las filas visibles"""
+    
+    LEVEL_COLORS = {
+        'TRACE': "#7f8c8d",
+        'DEBUG': "#95a5a6",
+        'INFO': "#ecf0f1",
+        'WARN': "#f1c40f",
+        'ERROR': "#e74c3c",
+        'FATAL': "#ff4757",
+    }
+    
+    def __init__(self, capacity=LOG_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.buffer = LogRingBuffer(capacity)  # Todas las líneas recientes
+        self.rows = []  # Las que pasan el filtro (como mucho `capacity`)
+        self.min_rank = 0
+        self.search = ""
+        self.brushes = {level: QBrush(QColor(color)) for level, color in self.LEVEL_COLORS.items()}
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            if line.time:
+                return f"[{line.time}] [{line.level}] {line.text}"
+            return line.text
+        if role == Qt.ForegroundRole:
+            return self.brushes.get(line.level)
+        return None
+    
+    def matches(self, line):
+        if LEVEL_RANK[line.level] < self.min_rank:
+            return False
+        return not self.search or self.search in line.text.lower()
+    
+    def append_lines(self, batch):
+        """Añade un lote del lector (hilo de la GUI): una inserción y como mucho un borrado"""
+        self.buffer.extend(batch)
+        new_rows = [line for line in batch if self.matches(line)][-self.buffer.capacity:]
+        if not new_rows:
+            return
+        
+        overflow = len(self.rows) + len(new_rows) - self.buffer.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            del self.rows[:overflow]
+            self.endRemoveRows()
+        
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+        self.rows.extend(new_rows)
+        self.endInsertRows()
+    
+    def set_filter(self, min_level, search):
+        self.beginResetModel()
+        self.min_rank = LEVEL_RANK[min_level]
+        self.search = search.strip().lower()
+        self.rows = [line for line in self.buffer.snapshot() if self.matches(line)]
+        self.endResetModel()
+    
+    def clear(self):
+        self.beginResetModel()
+        self.buffer = LogRingBuffer(self.buffer.capacity)
+        self.rows = []
+        self.endResetModel()
+
+class GameConsole(QWidget):
+    """Consola con el log del cliente: filtro por nivel, búsqueda y autodesplazamiento"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = GameLogModel(parent=self)
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        toolbar = QHBoxLayout()
+        self.level_combo = QComboBox()
+        for level in ('TRACE', 'INFO', 'WARN', 'ERROR'):
+            self.level_combo.addItem("Todo" if level == 'TRACE' else f"{level} o más grave", level)
+        self.level_combo.setCurrentIndex(1)
+        self.level_combo.currentIndexChanged.connect(self.apply_filter)
+        toolbar.addWidget(self.level_combo)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar en el log...")
+        toolbar.addWidget(self.search_input, 1)
+        
+        # La búsqueda se aplica cuando se deja de escribir, no en cada tecla
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
+        clear_btn = QPushButton("Limpiar")
+        clear_btn.setCursor(Qt.PointingHandCursor)
+        clear_btn.clicked.connect(self.clear)
+        toolbar.addWidget(clear_btn)
+        layout.addLayout(toolbar)
+        
+        self.view = QListView()
+        self.view.setModel(self.model)
+        # Filas de altura fija: la vista no mide cada línea y sólo pinta las visibles
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QListView.Batched)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setFont(QFont("Consolas", 9))
+        self.view.setStyleSheet("""
+            QListView {
+                background-color: rgba(10, 5, 15, 200);
+                color: #ecf0f1;
+                border: 1px solid rgba(255, 104, 242, 30);
+                border-radius: 8px;
+            }
+        """)
+        layout.addWidget(self.view)
+        
+        self.status_label = QLabel("Sin salida del juego todavía")
+        self.status_label.setStyleSheet("font-size: 11px; color: #bdc3c7;")
+        layout.addWidget(self.status_label)
+        
+        # Con la ventana oculta las líneas sólo van al búfer: ni filas ni repintados
+        self.paused = False
+        self.apply_filter()
+    
+    def set_paused(self, paused):
+        """Pausa la vista mientras no se ve; al reanudar se reconstruye desde el búfer"""
+        if paused == self.paused:
+            return
+        self.paused = paused
+        if not paused:
+            self.apply_filter()
+            self.update_status()
+    
+    def append_lines(self, batch):
+        if self.paused:
+            self.model.buffer.extend(batch)
+            return
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        self.model.append_lines(batch)
+        if at_bottom:
+            self.view.scrollToBottom()
+        self.update_status()
+    
+    def update_status(self):
+        buffer = self.model.buffer
+        self.status_label.setText(f"{buffer.total} líneas recibidas · {len(buffer.lines)} en memoria · "
+                                  f"{len(self.model.rows)} visibles")
+    
+    def apply_filter(self):
+        self.model.set_filter(self.level_combo.currentData(), self.search_input.text())
+        self.view.scrollToBottom()
+    
+    def clear(self):
+        self.model.clear()
+        self.status_label.setText("Consola limpia")
+
 # ============================================
 # LAUNCHER CON SISTEMA DE ACTUALIZACIÓN
 # ============================================
 
 class SakuraLauncher(QMainWindow):
-    def __init__(self):
+    remote_command = pyqtSignal(list)  # argumentos recibidos de otra invocación
+    game_exited = pyqtSignal(int)  # código de salida del cliente de Minecraft
+    content_updated = pyqtSignal(list)  # pestañas con contenido remoto nuevo
+    game_log_batch = pyqtSignal(list)  # lote de líneas del log del juego (desde el hilo lector)
+    crash_analyzed = pyqtSignal(str)  # resumen del diagnóstico tras un cierre inesperado
+    repair_status = pyqtSignal(str)  # estado de "Verificar archivos"
+    repair_progress = pyqtSignal(int, float, float)  # progreso 0-100, bytes/s, segundos restantes
+    repair_finished = pyqtSignal(bool, str)  # éxito, mensaje
+    update_prefetched = pyqtSignal(bool)  # la actualización quedó descargada y verificada
+    mods_indexed = pyqtSignal(list, dict)  # mods de la instancia, {jar: error}
+    
+    def __init__(self, single_instance=None):
         super().__init__()
+        self.single_instance = single_instance
         print("=" * 50)
         print("🌸 INICIANDO SAKURA BLOSSOM LAUNCHER 🌸")
         print(f"📊 Versión: {VERSION}")
@@ -803,6 +886,42 @@ class SakuraLauncher(QMainWindow):
         
         self.user_logged_in = False
         self.current_user = ""
+        self.memory_budget = MEMORY_BUDGET or "--low-memory" in sys.argv[1:]
+        
+        # Modo juego: el launcher se reduce a un icono en la bandeja mientras se juega
+        self.game_process = None
+        self.game_mode = None  # {'started', 'cpu', 'peak_rss'} mientras el juego está abierto
+        self.tray_icon = None
+        self.pending_update = None  # Aviso de actualización aplazado hasta cerrar el juego
+        self.available_update = None  # (versión, changelog) de la última actualización anunciada
+        self.staged_version = None  # Versión ya descargada en segundo plano
+        self.prefetch_thread = None
+        self.metrics_exporter = None  # MetricsExporter: se pausa en modo juego
+        self.update_prefetched.connect(self.on_update_prefetched)
+        self.game_exited.connect(self.exit_game_mode)
+        self.crash_analyzed.connect(self.show_crash_diagnosis)
+        
+        # Verificar archivos de la instancia (pestaña OPCIONES)
+        self.repair_thread = None
+        self.repair_status.connect(self.on_repair_status)
+        self.repair_progress.connect(self.on_repair_progress)
+        self.repair_finished.connect(self.on_repair_finished)
+        
+        # Lista de mods (pestaña MODS): se indexa en un hilo al abrir la pestaña
+        self.mods_thread = None
+        self.mods_indexed.connect(self.on_mods_indexed)
+        
+        # Contenido de las pestañas: se muestra la copia local y se refresca en segundo plano
+        self.content = ContentStore()
+        self.tab_labels = {}  # tab_id -> (etiqueta de título, etiqueta de contenido, texto incluido)
+        self.content_updated.connect(self.on_content_updated)
+        
+        # Llega desde el hilo del socket de instancia única
+        self.remote_command.connect(self.handle_remote_command)
+        
+        # Registro de assets: se indexa una vez y se invalida si el actualizador cambia archivos
+        self.assets = AssetRegistry()
+        self.update_manager.files_changed.connect(self.assets.invalidate)
         
         # Configurar ventana
         self.setWindowTitle(f"Sakura Blossom Launcher v{VERSION}")
@@ -830,24 +949,192 @@ class SakuraLauncher(QMainWindow):
         
         # Cargar fondo
         print("\n🖼️ CARGANDO FONDO...")
-        self.background = BackgroundWidget()
+        self.background = BackgroundWidget(assets=self.assets, memory_budget=self.memory_budget)
         content_layout.addWidget(self.background)
         
         # Layout overlay para contenido
         self.overlay_layout = QVBoxLayout(self.background)
         self.overlay_layout.setContentsMargins(0, 0, 0, 0)
         
+        # Las pantallas se construyen una sola vez y se alternan en un stack
+        self.screens = QStackedWidget()
+        self.overlay_layout.addWidget(self.screens)
+        self.login_screen = self.build_login_screen()
+        self.screens.addWidget(self.login_screen)
+        self.main_screen = None  # Se construye en el primer inicio de sesión
+        self.game_console = None  # Parte de la pantalla principal
+        
         # Mostrar login
         self.show_login_screen()
         
         main_layout.addWidget(content_widget)
         
         # Verificar actualizaciones en segundo plano después de 2 segundos
-        QTimer.singleShot(2000, self.check_updates_on_start)
+        self.update_check_timer = QTimer(self)
+        self.update_check_timer.setSingleShot(True)
+        self.update_check_timer.timeout.connect(self.check_updates_on_start)
+        self.update_check_timer.start(2000)
+        
+        thread = threading.Thread(target=lambda: self.content_updated.emit(self.content.refresh()))
+        thread.daemon = True
+        thread.start()
+        
+        # Detectar Java ahora para que "JUGAR" encuentre el resultado en caché
+        thread = threading.Thread(target=find_runtimes, daemon=True)
+        thread.start()
         
         print("\n✅ Launcher inicializado correctamente")
+        if self.memory_budget:
+            print("🧠 Modo de presupuesto de memoria activo")
+        print(f"🧠 Memoria en uso (RSS): {format_rss()}")
         print("=" * 50)
     
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.release_memory()
+            self.pause_console(self.isMinimized())
+        super().changeEvent(event)
+    
+    def hideEvent(self, event):
+        self.release_memory()
+        self.pause_console(True)
+        super().hideEvent(event)
+    
+    def showEvent(self, event):
+        self.pause_console(self.isMinimized())
+        super().showEvent(event)
+    
+    def pause_console(self, paused):
+        if self.game_console is not None:
+            self.game_console.set_paused(paused)
+    
+    def release_memory(self, force=False):
+        """En modo de presupuesto (o con `force`), suelta las imágenes decodificadas mientras no se ve la ventana"""
+        if not (self.memory_budget or force) or self.background.released:
+            return
+        rss_before = format_rss()
+        self.background.release_images()
+        self.assets.release()
+        image_cache.sources = None  # El índice de hashes se relee del disco si hace falta
+        trim_memory()
+        print(f"🧠 Imágenes liberadas: RSS {rss_before} → {format_rss()}")
+    
+    # ============================================
+    # MODO JUEGO (HUELLA MÍNIMA MIENTRAS SE JUEGA)
+    # ============================================
+    
+    def enter_game_mode(self, process):
+        """Oculta el launcher en la bandeja y libera recursos mientras el cliente está abierto"""
+        print("🎮 Entrando en modo juego...")
+        self.game_process = process
+        self.update_check_timer.stop()
+        if self.metrics_exporter:
+            # Ni escrituras de metrics.prom ni servidor HTTP despierto mientras se juega;
+            # el cierre del servidor espera a su bucle, así que no se hace en el hilo de la GUI
+            self.metrics_exporter.stop(wait=False)
+        
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.show_tray_icon()
+            self.hide()
+        else:
+            self.showMinimized()
+        
+        self.release_memory(force=True)
+        if not set_background_priority(True):
+            print("⚠️ No se pudo bajar la prioridad del launcher")
+        # Las descargas en segundo plano se pausan para no quitarle red al juego
+        get_scheduler().set_game_running(True)
+        
+        self.game_mode = {'started': time.monotonic(), 'cpu': time.process_time(), 'peak_rss': current_rss(),
+                          'wall_started': time.time()}
+        print(f"🧠 Modo juego: RSS {format_rss()}")
+        
+        # Un hilo bloqueado en wait(): no hay sondeo periódico mientras se juega
+        watcher = threading.Thread(target=lambda: self.game_exited.emit(process.wait()))
+        watcher.daemon = True
+        watcher.start()
+    
+    def exit_game_mode(self, exit_code):
+        """Restaura el launcher cuando el juego se cierra"""
+        print(f"🎮 El juego terminó (código {exit_code})")
+        if self.game_mode:
+            elapsed = max(time.monotonic() - self.game_mode['started'], 1e-6)
+            cpu_share = (time.process_time() - self.game_mode['cpu']) / elapsed
+            peak_rss = max(self.game_mode['peak_rss'], current_rss())
+            print(f"🧠 Consumo en modo juego: CPU {cpu_share:.2%} de un núcleo, RSS {format_rss(peak_rss)}")
+        
+        if exit_code != 0:
+            # Diagnóstico del cierre fuera del hilo de la GUI
+            since = self.game_mode and self.game_mode['wall_started']
+            thread = threading.Thread(target=self.analyze_crash, args=(since,))
+            thread.daemon = True
+            thread.start()
+        
+        self.game_mode = None
+        self.game_process = None
+        set_background_priority(False)
+        get_scheduler().set_game_running(False)
+        if self.metrics_exporter:
+            self.metrics_exporter.start()
+        
+        if self.tray_icon:
+            self.tray_icon.hide()
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        
+        if self.pending_update:
+            version, changelog = self.pending_update
+            self.pending_update = None
+            self.show_update_dialog(version, changelog)
+    
+    def analyze_crash(self, since=None):
+        try:
+            report = analyze_game_dir(load_instance()['game_dir'], since=since)
+        except (LaunchError, OSError) as e:
+            print(f"⚠️ No se pudo analizar el cierre: {e}")
+            return
+        print(report.summary())
+        self.crash_analyzed.emit(report.summary())
+    
+    def show_crash_diagnosis(self, summary):
+        """Ofrece el diagnóstico del cierre listo para pegar en un ticket de soporte"""
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Warning)
+        msg.setWindowTitle("💥 El juego se cerró inesperadamente")
+        msg.setText("El juego se cerró con un error. Este es el diagnóstico automático:")
+        msg.setInformativeText(summary)
+        copy_btn = msg.addButton("📋 Copiar para el ticket", QMessageBox.ActionRole)
+        support_btn = msg.addButton("💬 Ir a Soporte", QMessageBox.ActionRole)
+        msg.addButton(QMessageBox.Close)
+        msg.exec_()
+        
+        if msg.clickedButton() in (copy_btn, support_btn):
+            QApplication.clipboard().setText(summary)
+        if msg.clickedButton() == support_btn and self.main_screen is not None:
+            self.show_tab("support")
+    
+    def show_tray_icon(self):
+        if self.tray_icon is None:
+            logo_pixmap = self.assets.pixmap("logo", 32, 32, dpr=self.devicePixelRatioF())
+            icon = QIcon(logo_pixmap) if logo_pixmap else self.style().standardIcon(QStyle.SP_ComputerIcon)
+            self.tray_icon = QSystemTrayIcon(icon, self)
+            self.tray_icon.setToolTip(f"Sakura Blossom Launcher v{VERSION} - jugando")
+            
+            menu = QMenu(self)
+            menu.addAction("Mostrar launcher", self.show_from_tray)
+            menu.addAction("Salir", QApplication.quit)
+            self.tray_icon.setContextMenu(menu)
+            self.tray_icon.activated.connect(
+                lambda reason: reason == QSystemTrayIcon.Trigger and self.show_from_tray())
+        self.tray_icon.show()
+    
+    def show_from_tray(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+    
     def check_updates_on_start(self):
         """Verifica actualizaciones al iniciar"""
         print("🔍 Verificando actualizaciones...")
@@ -855,17 +1142,61 @@ class SakuraLauncher(QMainWindow):
         thread.daemon = True
         thread.start()
     
+    def handle_remote_command(self, argv):
+        """Atiende una segunda invocación del launcher: traer la ventana al frente o ejecutar su acción"""
+        print(f"📨 Orden recibida de otra instancia: {argv}")
+        
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        
+        if "--check-updates" in argv:
+            thread = threading.Thread(target=lambda: self.update_manager.check_for_updates(force=True))
+            thread.daemon = True
+            thread.start()
+    
     def on_update_available(self, version, changelog):
         """Se llama cuando hay una actualización disponible"""
         print(f"🎯 Actualización disponible: {version}")
+        self.available_update = (version, changelog)
+        
+        # Se descarga y verifica en segundo plano; el aviso llega cuando ya está en disco
+        if self.prefetch_thread and self.prefetch_thread.is_alive():
+            return
+        self.prefetch_thread = threading.Thread(target=self.prefetch_update)
+        self.prefetch_thread.daemon = True
+        self.prefetch_thread.start()
+    
+    def prefetch_update(self):
+        """Hilo: descarga anticipada de la actualización con prioridad de segundo plano"""
+        try:
+            staged = bool(self.update_manager.prefetch_update())
+        except Exception as e:
+            print(f"⚠️ Descarga anticipada fallida: {e}")
+            staged = False
+        self.update_prefetched.emit(staged)
+    
+    def on_update_prefetched(self, staged):
+        """Si la descarga anticipada falló se ofrece igualmente (se descargará al aceptar)"""
+        version, changelog = self.available_update
+        if staged:
+            self.staged_version = version
+            print(f"📦 Actualización {version} descargada y lista para instalar")
+        
+        if self.game_mode:
+            # No interrumpir la partida: se ofrece al cerrar el juego
+            self.pending_update = (version, changelog)
+            return
         
         # Mostrar diálogo de actualización
         self.show_update_dialog(version, changelog)
     
-    def on_update_progress(self, progress):
+    def on_update_progress(self, progress, speed, eta):
         """Actualiza la barra de progreso"""
         if hasattr(self, 'update_dialog'):
-            self.update_dialog.set_progress(progress)
+            self.update_dialog.set_progress(progress, speed, eta)
     
     def on_update_finished(self, success, message):
         """Se llama cuando la actualización termina"""
@@ -893,13 +1224,17 @@ class SakuraLauncher(QMainWindow):
     def show_update_dialog(self, version, changelog):
         """Muestra el diálogo de actualización"""
         self.update_dialog = UpdateDialog(self)
-        self.update_dialog.set_update_info(version, changelog)
+        self.update_dialog.set_update_info(version, changelog, staged=version == self.staged_version)
         
         # Conectar señales
         self.update_dialog.accepted.connect(self.start_update_process)
         
         # Mostrar diálogo
         self.update_dialog.exec_()
+        if self.update_dialog.discarded:
+            # Sin esto se instalaría igualmente al abrir el launcher la próxima vez
+            self.staged_version = None
+            self.update_manager.discard_staged_update()
     
     def start_update_process(self):
         """Inicia el proceso de actualización"""
@@ -941,19 +1276,25 @@ class SakuraLauncher(QMainWindow):
         # Cerrar aplicación actual
         self.close()
         
+        # Soltar el bloqueo de instancia única para que el nuevo proceso lo tome
+        if self.single_instance:
+            self.single_instance.release()
+        
+        # execl no ejecuta los manejadores de atexit: volcar el estado antes
+        flush_state()
+        
         # Reiniciar proceso
         python = sys.executable
         os.execl(python, python, *sys.argv)
     
-    def clear_overlay(self):
-        while self.overlay_layout.count():
-            child = self.overlay_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-    
     def show_login_screen(self):
-        self.clear_overlay()
-        
+        """Vuelve a la pantalla de login (sin reconstruirla)"""
+        self.username_input.clear()
+        self.password_input.clear()
+        self.screens.setCurrentWidget(self.login_screen)
+        self.username_input.setFocus()
+    
+    def build_login_screen(self):
         container = QWidget()
         container_layout = QVBoxLayout(container)
         container_layout.setAlignment(Qt.AlignCenter)
@@ -982,26 +1323,9 @@ class SakuraLauncher(QMainWindow):
         logo_layout.setContentsMargins(0, 0, 0, 0)
         
         logo_label = QLabel()
-        logo_paths = [
-            "assets/logo.png",
-            "./assets/logo.png",
-            os.path.join(os.getcwd(), "assets", "logo.png"),
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo.png"),
-        ]
-        
-        logo_pixmap = None
-        for path in logo_paths:
-            if os.path.exists(path):
-                try:
-                    logo_pixmap = QPixmap(path)
-                    if not logo_pixmap.isNull():
-                        break
-                except:
-                    continue
+        logo_pixmap = self.assets.pixmap("logo", 220, 220, dpr=self.devicePixelRatioF())
         
         if logo_pixmap and not logo_pixmap.isNull():
-            # Escalar el logo
-            logo_pixmap = logo_pixmap.scaled(220, 220, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
 
             logo_label.setStyleSheet("background: transparent;")
@@ -1214,7 +1538,7 @@ class SakuraLauncher(QMainWindow):
         frame_layout.addWidget(version)
         
         container_layout.addWidget(login_frame)
-        self.overlay_layout.addWidget(container)
+        return container
     
     def attempt_login(self):
         username = self.username_input.text().strip()
@@ -1227,8 +1551,16 @@ class SakuraLauncher(QMainWindow):
             QMessageBox.warning(self, "Error", "Por favor, ingresa un nombre de usuario")
     
     def show_main_screen(self):
-        self.clear_overlay()
+        """Muestra la pantalla principal; sólo se actualizan los datos del usuario"""
+        if self.main_screen is None:
+            self.main_screen = self.build_main_screen()
+            self.screens.addWidget(self.main_screen)
         
+        self.user_label.setText(self.current_user)
+        self.show_tab("home")
+        self.screens.setCurrentWidget(self.main_screen)
+    
+    def build_main_screen(self):
         main_widget = QWidget()
         main_layout = QHBoxLayout(main_widget)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -1251,25 +1583,9 @@ class SakuraLauncher(QMainWindow):
         
         # Logo del panel - usar logo desde assets
         logo_label = QLabel()
-        logo_paths = [
-            "assets/logo.png",
-            "./assets/logo.png",
-            os.path.join(os.getcwd(), "assets", "logo.png"),
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo.png"),
-        ]
-        
-        logo_pixmap = None
-        for path in logo_paths:
-            if os.path.exists(path):
-                try:
-                    logo_pixmap = QPixmap(path)
-                    if not logo_pixmap.isNull():
-                        break
-                except:
-                    continue
+        logo_pixmap = self.assets.pixmap("logo", 200, 50, dpr=self.devicePixelRatioF())
         
         if logo_pixmap and not logo_pixmap.isNull():
-            logo_pixmap = logo_pixmap.scaled(200, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
             logo_label.setStyleSheet("""
                 padding-bottom: 5px;
@@ -1299,7 +1615,8 @@ class SakuraLauncher(QMainWindow):
             ("📖", "Lore", "lore", "#1abc9c"),
             ("🔧", "Mods", "mods", "#e67e22"),
             ("⚙️", "Opciones", "settings", "#3498db"),
-            ("💬", "Soporte", "support", "#e74c3c")
+            ("💬", "Soporte", "support", "#e74c3c"),
+            ("🖥️", "Consola", "console", "#95a5a6")
         ]
         
         for icon, text, tab_id, color in tabs:
@@ -1344,8 +1661,8 @@ class SakuraLauncher(QMainWindow):
         user_icon = QLabel("👤")
         user_icon.setStyleSheet("font-size: 16px;")
         
-        user_label = QLabel(f"{self.current_user}")
-        user_label.setStyleSheet("""
+        self.user_label = QLabel(self.current_user)
+        self.user_label.setStyleSheet("""
             font-size: 12px; 
             color: #ecf0f1; 
             font-weight: bold;
@@ -1372,7 +1689,7 @@ class SakuraLauncher(QMainWindow):
         logout_btn.clicked.connect(self.logout)
         
         user_layout.addWidget(user_icon)
-        user_layout.addWidget(user_label)
+        user_layout.addWidget(self.user_label)
         user_layout.addStretch()
         user_layout.addWidget(logout_btn)
         
@@ -1408,6 +1725,13 @@ class SakuraLauncher(QMainWindow):
         
         self.create_all_tabs()
         
+        # Consola del juego (se alimenta en lotes desde el hilo lector)
+        self.game_console = GameConsole()
+        self.content_stack.addWidget(self.game_console)
+        self.game_log_batch.connect(self.game_console.append_lines)
+        self.game_log_batch.connect(self.on_first_game_output)
+        self.game_launch_started = None
+        
         # Botón de jugar
         play_container = QWidget()
         play_layout = QHBoxLayout(play_container)
@@ -1461,9 +1785,7 @@ class SakuraLauncher(QMainWindow):
         main_layout.addWidget(left_panel)
         main_layout.addWidget(right_panel)
         
-        self.overlay_layout.addWidget(main_widget)
-        
-        self.show_tab("home")
+        return main_widget
     
     def create_menu_button(self, icon, text, color):
         btn = QPushButton(f"{icon}  {text}")
@@ -1531,8 +1853,7 @@ class SakuraLauncher(QMainWindow):
             """),
             'mods': ("MODS", """
                 <h3 style="color: #e67e22;">Mods Requeridos</h3>
-                <p style="color: #ecf0f1;">seguro ponga una lista aca de los mods activos y demás, pero nada desactivable o agregable</p>
-               
+                <p style="color: #ecf0f1;">Estos son los mods activos del modpack. Se instalan y actualizan con el launcher.</p>
                      """),
             'settings': ("OPCIONES", """
                 <h3 style="color: #3498db;">Configuración</h3>
@@ -1578,6 +1899,9 @@ class SakuraLauncher(QMainWindow):
         }
         
         for tab_id, (title, content) in tabs_content.items():
+            # La última copia descargada del servidor tiene prioridad sobre el texto incluido
+            title, content = self.content.get(tab_id) or (title, content)
+            
             widget = QWidget()
             layout = QVBoxLayout(widget)
             
@@ -1632,17 +1956,284 @@ class SakuraLauncher(QMainWindow):
             content_label.setOpenExternalLinks(True)
             
             content_layout.addWidget(content_label)
+            if tab_id == 'settings':
+                content_layout.addWidget(self.build_download_panel())
+                content_layout.addWidget(self.build_repair_panel())
+            if tab_id == 'mods':
+                content_layout.addWidget(self.build_mods_panel())
             content_layout.addStretch()
             
             scroll_area.setWidget(content_widget)
             layout.addWidget(scroll_area)
             
             self.content_stack.addWidget(widget)
+            self.tab_labels[tab_id] = (title_label, content_label, tabs_content[tab_id])
+    
+    def build_download_panel(self):
+        """Opción "Límite de descarga" (compartido por todas las descargas del launcher)"""
+        panel = QWidget()
+        panel.setStyleSheet("""
+            QWidget {
+                background: rgba(52, 152, 219, 0.05);
+                border-radius: 10px;
+            }
+            QLabel {
+                background: transparent;
+                color: #ecf0f1;
+                font-size: 12px;
+            }
+            QComboBox {
+                background: rgba(255, 255, 255, 0.08);
+                color: white;
+                border: 1px solid rgba(52, 152, 219, 0.4);
+                border-radius: 6px;
+                padding: 4px 10px;
+                min-width: 140px;
+            }
+        """)
+        layout = QHBoxLayout(panel)
+        layout.setContentsMargins(20, 15, 20, 15)
+        
+        label = QLabel("🌐 Límite de descarga")
+        label.setStyleSheet("color: #3498db; font-size: 14px; font-weight: bold;")
+        label.setToolTip("Útil en redes compartidas: las descargas en segundo plano usan como mucho la mitad.")
+        layout.addWidget(label)
+        layout.addStretch()
+        
+        self.download_limit_combo = QComboBox()
+        current = get_store().get('download_limit_kbps') or 0
+        for kbps in RATE_LIMIT_CHOICES:
+            if kbps == 0:
+                text = "Sin límite"
+            elif kbps >= 1024:
+                text = f"{kbps // 1024} MB/s"
+            else:
+                text = f"{kbps} KB/s"
+            self.download_limit_combo.addItem(text, kbps)
+        index = self.download_limit_combo.findData(current)
+        self.download_limit_combo.setCurrentIndex(max(index, 0))
+        self.download_limit_combo.currentIndexChanged.connect(self.on_download_limit_changed)
+        layout.addWidget(self.download_limit_combo)
+        return panel
+    
+    def on_download_limit_changed(self, index):
+        kbps = self.download_limit_combo.itemData(index) or 0
+        get_store().set('download_limit_kbps', kbps)
+        # Se aplica también a las descargas que ya están en curso
+        get_scheduler().set_rate_limit(kbps * 1024)
+        print(f"🌐 Límite de descarga: {self.download_limit_combo.itemText(index)}")
+    
+    def build_repair_panel(self):
+        """Botón "Verificar archivos" con su barra de progreso"""
+        panel = QWidget()
+        panel.setStyleSheet("""
+            QWidget {
+                background: rgba(52, 152, 219, 0.05);
+                border-radius: 10px;
+            }
+            QLabel {
+                background: transparent;
+                color: #ecf0f1;
+                font-size: 12px;
+            }
+        """)
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(20, 15, 20, 15)
+        
+        title = QLabel("🛠️ Archivos del juego")
+        title.setStyleSheet("color: #3498db; font-size: 14px; font-weight: bold;")
+        layout.addWidget(title)
+        
+        description = QLabel("Comprueba librerías, assets, mods y configuración, y vuelve a "
+                             "descargar sólo los archivos dañados o que faltan.")
+        description.setWordWrap(True)
+        layout.addWidget(description)
+        
+        self.repair_button = QPushButton("🔎 Verificar archivos")
+        self.repair_button.setCursor(Qt.PointingHandCursor)
+        self.repair_button.setFixedHeight(36)
+        self.repair_button.setStyleSheet("""
+            QPushButton {
+                background-color: rgba(52, 152, 219, 0.8);
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 6px 16px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: rgba(52, 152, 219, 1);
+            }
+            QPushButton:disabled {
+                background-color: rgba(127, 140, 141, 0.6);
+            }
+        """)
+        self.repair_button.clicked.connect(self.start_repair)
+        layout.addWidget(self.repair_button, 0, Qt.AlignLeft)
+        
+        self.repair_progress_bar = QProgressBar()
+        self.repair_progress_bar.setFixedHeight(16)
+        self.repair_progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid rgba(52, 152, 219, 0.3);
+                border-radius: 5px;
+                text-align: center;
+                color: white;
+                font-size: 10px;
+            }
+            QProgressBar::chunk {
+                background-color: #3498db;
+                border-radius: 5px;
+            }
+        """)
+        self.repair_progress_bar.setVisible(False)
+        layout.addWidget(self.repair_progress_bar)
+        
+        self.repair_label = QLabel()
+        self.repair_label.setWordWrap(True)
+        self.repair_label.setStyleSheet("color: #bdc3c7; font-size: 11px;")
+        layout.addWidget(self.repair_label)
+        return panel
+    
+    def start_repair(self):
+        if self.game_mode is not None:
+            QMessageBox.warning(self, "⚠️ Juego abierto", "Cierra el juego antes de verificar sus archivos.", QMessageBox.Ok)
+            return
+        if self.repair_thread is not None and self.repair_thread.is_alive():
+            return
+        try:
+            instance = load_instance()
+        except LaunchError as e:
+            QMessageBox.warning(self, "⚠️ No se pudo verificar", str(e), QMessageBox.Ok)
+            return
+        
+        repair = InstanceRepair(instance['game_dir'])
+        repair.on('status', self.repair_status.emit)
+        repair.on('progress', self.repair_progress.emit)
+        
+        self.repair_button.setEnabled(False)
+        self.repair_progress_bar.setValue(0)
+        self.repair_progress_bar.setVisible(True)
+        self.repair_thread = threading.Thread(target=self.run_repair, args=(repair,), daemon=True)
+        self.repair_thread.start()
+    
+    def run_repair(self, repair):
+        """Hilo de trabajo: verifica y descarga lo dañado"""
+        try:
+            repaired, failed, extra = repair.verify_and_repair()
+        except Exception as e:
+            self.repair_finished.emit(False, f"❌ No se pudo verificar la instancia: {e}")
+            return
+        
+        if failed:
+            message = f"⚠️ Reparados {len(repaired)} archivos; no se pudieron descargar {len(failed)}."
+        elif repaired:
+            message = f"✅ Reparados {len(repaired)} archivos."
+        else:
+            message = "✅ Todos los archivos están bien."
+        if extra:
+            message += f" Hay {len(extra)} archivos en mods/ que no son del modpack."
+        self.repair_finished.emit(not failed, message)
+    
+    def on_repair_status(self, text):
+        print(text)
+        self.repair_label.setText(text)
+    
+    def on_repair_progress(self, percent, speed, eta):
+        self.repair_progress_bar.setValue(percent)
+        if speed > 0:
+            self.repair_progress_bar.setFormat(f"%p% · {format_rate(speed)} · {format_eta(eta)}")
+    
+    def on_repair_finished(self, success, message):
+        print(message)
+        self.repair_button.setEnabled(True)
+        self.repair_progress_bar.setVisible(False)
+        self.repair_progress_bar.setFormat("%p%")
+        self.repair_label.setText(message)
+    
+    def build_mods_panel(self):
+        """Lista de sólo lectura de los mods instalados, con duplicados y conflictos"""
+        panel = QWidget()
+        panel.setStyleSheet("""
+            QWidget {
+                background: rgba(230, 126, 34, 0.05);
+                border-radius: 10px;
+            }
+            QLabel {
+                background: transparent;
+                color: #ecf0f1;
+                font-size: 12px;
+            }
+        """)
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(20, 15, 20, 15)
+        
+        self.mods_summary_label = QLabel("🔧 Buscando mods...")
+        self.mods_summary_label.setStyleSheet("color: #e67e22; font-size: 14px; font-weight: bold;")
+        layout.addWidget(self.mods_summary_label)
+        
+        self.mods_list_label = QLabel()
+        self.mods_list_label.setWordWrap(True)
+        self.mods_list_label.setTextFormat(Qt.RichText)
+        self.mods_list_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.mods_list_label)
+        return panel
+    
+    def refresh_mods(self):
+        if self.mods_thread is not None and self.mods_thread.is_alive():
+            return
+        try:
+            mods_dir = os.path.join(load_instance()['game_dir'], "mods")
+        except LaunchError as e:
+            self.mods_summary_label.setText("🔧 Mods")
+            self.mods_list_label.setText(f'<span style="color: #bdc3c7;">{escape(str(e))}</span>')
+            return
+        self.mods_thread = threading.Thread(target=self.run_mod_index, args=(mods_dir,), daemon=True)
+        self.mods_thread.start()
+    
+    def run_mod_index(self, mods_dir):
+        """Hilo de trabajo: sólo se leen los jars nuevos o modificados desde la última vez"""
+        try:
+            mods, errors = index_mods(mods_dir)
+        except Exception as e:
+            mods, errors = [], {"mods/": str(e)}
+        self.mods_indexed.emit(mods, errors)
+    
+    def on_mods_indexed(self, mods, errors):
+        issues = find_issues(mods)
+        rows = []
+        for issue in issues:
+            rows.append(f'<span style="color: #e74c3c;">⚠️ {escape(issue.message)} '
+                        f'({escape(", ".join(issue.files))})</span>')
+        for file_name, error in errors.items():
+            rows.append(f'<span style="color: #bdc3c7;">❔ {escape(file_name)}: {escape(error)}</span>')
+        for mod in sorted(mods, key=lambda m: m.name.lower()):
+            rows.append(f'<b>{escape(mod.name)}</b> <span style="color: #bdc3c7;">{escape(mod.version)}</span>')
+        
+        summary = f"🔧 {len(mods)} mods activos"
+        if issues:
+            summary += f" · {len(issues)} problemas"
+        self.mods_summary_label.setText(summary)
+        self.mods_list_label.setText("<br>".join(rows) or '<span style="color: #bdc3c7;">No hay mods instalados.</span>')
+    
+    def on_content_updated(self, tab_ids):
+        """Aplica el contenido remoto recién descargado a las pestañas ya construidas"""
+        if tab_ids:
+            print(f"📰 Contenido actualizado: {', '.join(tab_ids)}")
+        for tab_id in tab_ids:
+            if tab_id not in self.tab_labels:
+                continue  # Aún no se construyó la pantalla principal: usará la caché al crearla
+            title_label, content_label, builtin = self.tab_labels[tab_id]
+            title, content = self.content.get(tab_id) or builtin
+            title_label.setText(title)
+            content_label.setText(content)
     
     def show_tab(self, tab_id):
         tab_index = {"home": 0, "character": 1, "lore": 2, 
-                    "mods": 3, "settings": 4, "support": 5}
+                    "mods": 3, "settings": 4, "support": 5, "console": 6}
         self.content_stack.setCurrentIndex(tab_index[tab_id])
+        if tab_id == 'mods':
+            self.refresh_mods()
     
     def launch_minecraft(self):
         msg = QMessageBox()
@@ -1680,6 +2271,25 @@ class SakuraLauncher(QMainWindow):
             }
         """)
         msg.exec_()
+        
+        self.game_launch_started = time.perf_counter()
+        try:
+            process = launch_game(self.current_user, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except LaunchError as e:
+            self.game_launch_started = None
+            QMessageBox.warning(self, "⚠️ No se pudo iniciar el juego", str(e), QMessageBox.Ok)
+            return
+        
+        print(f"🎮 Cliente iniciado (PID {process.pid})")
+        self.game_console.clear()
+        self.log_reader = LogReader(process.stdout, self.game_log_batch.emit).start()
+        self.enter_game_mode(process)
+    
+    def on_first_game_output(self, batch):
+        """Tiempo de arranque del juego: de pulsar JUGAR a su primera línea de log"""
+        if self.game_launch_started is not None:
+            GAME_FIRST_OUTPUT_SECONDS.observe(time.perf_counter() - self.game_launch_started)
+            self.game_launch_started = None
     
     def logout(self):
         msg = QMessageBox()
@@ -1767,7 +2377,20 @@ if __name__ == "__main__":
     font = QFont("Segoe UI", 10)
     app.setFont(font)
     
-    launcher = SakuraLauncher()
+    # Métricas para el agente de la flota (metrics.prom y 127.0.0.1:METRICS_PORT)
+    exporter = metrics.MetricsExporter().start()
+    if exporter.url:
+        print(f"📈 Métricas en {exporter.url}metrics y {exporter.url}metrics.json")
+    app.aboutToQuit.connect(exporter.stop)
+    
+    launcher = SakuraLauncher(single_instance)
+    launcher.metrics_exporter = exporter
+    STARTUP_SECONDS.labels(phase='window').observe(time.perf_counter() - PROCESS_STARTED)
+    single_instance.set_callback(launcher.remote_command.emit)
+    app.aboutToQuit.connect(single_instance.release)
     launcher.show()
+    # Primera vuelta del bucle de eventos tras mostrar la ventana (ya pintada)
+    QTimer.singleShot(0, lambda: STARTUP_SECONDS.labels(phase='visible').observe(
+        time.perf_counter() - PROCESS_STARTED))
     
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1 @@
+"""Módulos auxiliares del Sakura Blossom Launcher (sin dependencias de Qt)"""
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import weakref
+
+# ============================================
+# PAQUETE DE ASSETS EN UN SOLO ARCHIVO
+# ============================================
+# Formato de assets.pack:
+#   MAGIC | HEADER (tamaño del índice, inicio de los datos) | índice JSON | datos
+# El índice asocia cada nombre lógico con su desplazamiento y tamaño dentro del
+# bloque de datos. Al abrirlo sólo se lee el índice; los datos se proyectan en
+# memoria (mmap) la primera vez que se piden y se entregan como memoryview, sin
+# copiar cada asset. Una actualización reemplaza el paquete completo.
+
+PACK_FILE = "assets.pack"
+MAGIC = b"SBPACK1\n"
+HEADER = struct.Struct(">IQ")  # tamaño del índice, desplazamiento del bloque de datos
+ALIGNMENT = 16
+FORMAT_VERSION = 1
+
+# Paquetes abiertos en este proceso (para soltarlos antes de reemplazarlos)
+_open_packs = weakref.WeakSet()
+
+
+class PackError(Exception):
+    """El paquete de assets no es válido"""
+
+
+def build_pack(files, pack_path):
+    """Escribe un paquete con `files` ({nombre lógico: ruta}); devuelve el índice.
+
+    El orden es determinista (por nombre) para que dos paquetes con casi los
+    mismos assets generen parches binarios pequeños.
+    """
+    entries = {}
+    offset = 0
+    for name in sorted(files):
+        path = files[name]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        size = os.path.getsize(path)
+        entries[name] = {
+            'file': os.path.basename(path),
+            'offset': offset,
+            'size': size,
+            'sha256': digest.hexdigest(),
+        }
+        offset += size + (-size % ALIGNMENT)
+
+    index = json.dumps({'version': FORMAT_VERSION, 'entries': entries},
+                       sort_keys=True, separators=(',', ':')).encode('utf-8')
+    data_offset = len(MAGIC) + HEADER.size + len(index)
+    data_offset += -data_offset % ALIGNMENT
+
+    tmp_path = pack_path + ".tmp"
+    with open(tmp_path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(HEADER.pack(len(index), data_offset))
+        out.write(index)
+        out.write(b"\0" * (data_offset - out.tell()))
+        for name in sorted(entries):
+            entry = entries[name]
+            with open(files[name], 'rb') as f:
+                copied = 0
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    out.write(block)
+                    copied += len(block)
+            if copied != entry['size']:
+                raise PackError(f"{files[name]} cambió mientras se empaquetaba")
+            out.write(b"\0" * (-copied % ALIGNMENT))
+    os.replace(tmp_path, pack_path)
+    return entries
+
+
+class AssetPack:
+    """Lector de assets.pack: índice en memoria y datos vía mmap bajo demanda"""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.lock = threading.Lock()
+        self.file = None
+        self.map = None
+
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise PackError(f"{path} no es un paquete de assets")
+            try:
+                index_size, self.data_offset = HEADER.unpack(f.read(HEADER.size))
+                index = json.loads(f.read(index_size).decode('utf-8'))
+            except (struct.error, ValueError) as e:
+                raise PackError(f"Índice dañado en {path}: {e}")
+            self.size = os.fstat(f.fileno()).st_size
+
+        if index.get('version') != FORMAT_VERSION:
+            raise PackError(f"Versión de paquete no soportada: {index.get('version')}")
+        self.entries = index['entries']
+        for name, entry in self.entries.items():
+            if self.data_offset + entry['offset'] + entry['size'] > self.size:
+                raise PackError(f"El paquete está truncado ({name})")
+        _open_packs.add(self)
+
+    def names(self):
+        return list(self.entries)
+
+    def entry(self, name):
+        return self.entries.get(name)
+
+    def view(self, name):
+        """memoryview de solo lectura con los bytes de `name` (sin copiarlos).
+
+        Hay que liberarla (`release()` o `with`) para que el paquete pueda
+        cerrarse; los datos se leen del mmap, no de una copia.
+        """
+        entry = self.entries[name]
+        with self.lock:
+            if self.map is None:
+                self.file = open(self.path, 'rb')
+                self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            start = self.data_offset + entry['offset']
+            return memoryview(self.map)[start:start + entry['size']]
+
+    def release(self):
+        """Deshace la proyección en memoria; se rehace sola en la próxima lectura.
+
+        Devuelve False si aún hay memoryviews en uso.
+        """
+        with self.lock:
+            if self.map is None:
+                return True
+            try:
+                self.map.close()
+            except BufferError:
+                return False
+            self.map = None
+            self.file.close()
+            self.file = None
+            return True
+
+
+def release_open_packs():
+    """Suelta los mmap de todos los paquetes abiertos.
+
+    En Windows un archivo proyectado no se puede reemplazar; el actualizador
+    llama a esto antes de instalar un assets.pack nuevo.
+    """
+    return all(pack.release() for pack in list(_open_packs))
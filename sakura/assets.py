@@ -0,0 +1,131 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from sakura.asset_pack import PACK_FILE, AssetPack, PackError
+from sakura.config import APP_DIR
+
+# ============================================
+# ÍNDICE DE ASSETS POR NOMBRE LÓGICO
+# ============================================
+# Se recorre assets/ una sola vez y se responde por nombre lógico
+# ("logo", "background", "icons/discord"...) sin volver a tocar el disco.
+# Si existe assets.pack sus entradas tienen prioridad: basta leer su índice en
+# lugar de abrir cada PNG suelto.
+
+ASSETS_DIR = "assets"
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+# Nombres lógicos con varios archivos posibles, en orden de preferencia
+ALIASES = {
+    'background': ['fondo', 'background'],
+}
+
+
+class Asset:
+    """Asset resuelto: archivo suelto en disco o entrada de assets.pack"""
+
+    def __init__(self, name, path=None, pack=None):
+        self.name = name
+        self.path = path
+        self.pack = pack
+
+    @property
+    def source(self):
+        """Identificador estable del origen (para mensajes y claves de caché)"""
+        if self.pack:
+            return f"{self.pack.path}:{self.name}"
+        return self.path
+
+    @property
+    def sha256(self):
+        """Hash conocido de antemano (sólo en el paquete; los sueltos se hashean aparte)"""
+        return self.pack.entry(self.name)['sha256'] if self.pack else None
+
+    @contextmanager
+    def open(self):
+        """Bytes del asset: memoryview sobre el mmap del paquete o lectura del archivo"""
+        if self.pack:
+            view = self.pack.view(self.name)
+            try:
+                yield view
+            finally:
+                view.release()
+        else:
+            with open(self.path, 'rb') as f:
+                yield f.read()
+
+
+class AssetIndex:
+    """Resuelve nombres lógicos de assets a rutas; se reconstruye sólo al invalidarlo"""
+
+    def __init__(self, base_dir=APP_DIR, extra_roots=None):
+        self.roots = [base_dir]
+        for root in extra_roots or []:
+            if os.path.abspath(root) != os.path.abspath(base_dir):
+                self.roots.append(root)
+        self.lock = threading.Lock()
+        self.entries = None
+        self.generation = 0
+
+    def _scan(self):
+        entries = {}
+        for root in self.roots:
+            pack_path = os.path.join(root, PACK_FILE)
+            if os.path.exists(pack_path):
+                try:
+                    pack = AssetPack(pack_path)
+                except (OSError, PackError) as e:
+                    print(f"⚠️ Ignorando {pack_path}: {e}")
+                else:
+                    for name in pack.names():
+                        entries.setdefault(name, Asset(name, pack=pack))
+
+            assets_dir = os.path.join(root, ASSETS_DIR)
+            for current, dirs, files in os.walk(assets_dir):
+                for name in files:
+                    path = os.path.join(current, name)
+                    rel_path = os.path.relpath(path, assets_dir).replace(os.sep, '/')
+                    name = os.path.splitext(rel_path)[0]
+                    entries.setdefault(name, Asset(name, path=path))
+
+            # Compatibilidad: fondos sueltos junto al launcher
+            try:
+                with os.scandir(root) as it:
+                    for entry in it:
+                        stem, ext = os.path.splitext(entry.name)
+                        if entry.is_file() and ext.lower() in IMAGE_EXTENSIONS:
+                            entries.setdefault(stem, Asset(stem, path=entry.path))
+            except OSError:
+                pass
+        return entries
+
+    def _entries(self):
+        with self.lock:
+            if self.entries is None:
+                self.entries = self._scan()
+            return self.entries
+
+    def resolve(self, name):
+        """Asset `name` (o su primer alias existente), o None"""
+        entries = self._entries()
+        for candidate in ALIASES.get(name, [name]):
+            asset = entries.get(candidate)
+            if asset:
+                return asset
+        return None
+
+    def names(self):
+        """Nombres lógicos disponibles"""
+        return sorted(self._entries())
+
+    def invalidate(self):
+        """Fuerza un nuevo recorrido en la próxima consulta (p. ej. tras una actualización)"""
+        with self.lock:
+            if self.entries:
+                # Soltar el mmap del paquete anterior; el nuevo se abrirá al volver a consultar
+                for asset in self.entries.values():
+                    if asset.pack:
+                        asset.pack.release()
+            self.entries = None
+            self.generation += 1
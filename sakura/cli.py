@@ -0,0 +1,349 @@
+"""Modo sin interfaz del launcher (no importa PyQt5).
+
+Uso:
+    python launcher.py --headless check
+    python launcher.py --headless update [--yes]
+    python launcher.py --headless prefetch
+    python launcher.py --headless verify
+    python launcher.py --headless launch --user NOMBRE [--wait]
+    python launcher.py --headless diagnose
+    python launcher.py --headless java [--rescan]
+    python launcher.py --headless mods [--rescan]
+    python launcher.py --headless repair [--dry-run]
+    python launcher.py --serve-cache [--port 8733] [--allow URL]...
+
+Códigos de salida: 0 = correcto, 1 = error, 2 = hay una actualización
+disponible (sólo `check`), 3 = archivos que no coinciden (`verify` y
+`repair --dry-run`) o mods duplicados/incompatibles (`mods`).
+"""
+import argparse
+import os
+import sys
+import time
+
+from sakura import lan_cache
+from sakura.config import UPDATE_SERVER, VERSION
+from sakura.crash_analyzer import analyze_game_dir
+from sakura.game import LaunchError, launch_game, load_instance
+from sakura.java import find_runtimes, select_runtime
+from sakura.mods import find_issues, index_mods
+from sakura.progress import format_eta, format_rate
+from sakura.repair import InstanceRepair
+from sakura.scheduler import get_scheduler
+from sakura.single_instance import SingleInstance
+from sakura.updater import Updater
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_UPDATE_AVAILABLE = 2
+EXIT_MISMATCH = 3
+
+
+def _print_status(text):
+    print(text, flush=True)
+
+
+def _print_progress(percent, speed, eta):
+    detail = f" {format_rate(speed)} · {format_eta(eta)}" if speed > 0 else ""
+    end = "\n" if percent >= 100 else ""
+    print(f"\r  {percent:3d}%{detail}      ", end=end, flush=True)
+
+
+def make_updater(quiet=False):
+    """Crea un Updater que escribe su estado y progreso por consola"""
+    updater = Updater()
+    if not quiet:
+        updater.on('status', _print_status)
+        updater.on('progress', _print_progress)
+    return updater
+
+
+def cmd_check(args):
+    updater = make_updater(args.quiet)
+    if updater.check_for_updates(force=True):
+        info = updater.get_update_info() or {}
+        print(f"Nueva versión: {info.get('remote_version')} (instalada: {VERSION})")
+        return EXIT_UPDATE_AVAILABLE
+    return EXIT_ERROR if updater.last_error else EXIT_OK
+
+
+def cmd_update(args):
+    return _with_instance_guard(_run_update, args)
+
+
+def cmd_prefetch(args):
+    return _with_instance_guard(_run_prefetch, args)
+
+
+def _with_instance_guard(run, args):
+    # Con el launcher abierto no se toca temp_updates/ ni backup/: se le delega la actualización
+    guard = SingleInstance()
+    if not guard.acquire():
+        if guard.forward(["--check-updates"]):
+            print("ℹ️ El launcher está abierto: se le pidió buscar y ofrecer la actualización")
+            return EXIT_OK
+        print("❌ Hay otro launcher abierto que no responde", file=sys.stderr)
+        return EXIT_ERROR
+
+    try:
+        return run(args)
+    finally:
+        guard.release()
+
+
+def _run_prefetch(args):
+    """Deja la actualización descargada y verificada; se instala al abrir el launcher"""
+    updater = make_updater(args.quiet)
+    if not updater.check_for_updates(force=True):
+        return EXIT_ERROR if updater.last_error else EXIT_OK
+
+    if not updater.prefetch_update():
+        return EXIT_ERROR
+    info = updater.get_update_info() or {}
+    print(f"📦 Versión {info.get('remote_version')} lista: se instalará al abrir el launcher")
+    return EXIT_OK
+
+
+def _run_update(args):
+    updater = make_updater(args.quiet)
+    if not updater.check_for_updates(force=True):
+        return EXIT_ERROR if updater.last_error else EXIT_OK
+
+    info = updater.get_update_info() or {}
+    if not args.yes:
+        answer = input(f"¿Actualizar a la versión {info.get('remote_version')}? [s/N] ")
+        if answer.strip().lower() not in ('s', 'si', 'sí', 'y', 'yes'):
+            return EXIT_OK
+
+    update_file = updater.download_update()
+    if not update_file:
+        return EXIT_ERROR
+
+    success, message = updater.apply_update(update_file)
+    if not success:
+        print(f"❌ {message}", file=sys.stderr)
+        return EXIT_ERROR
+    print(f"✨ Actualizado a la versión {message}")
+    return EXIT_OK
+
+
+def cmd_verify(args):
+    updater = make_updater(args.quiet)
+    try:
+        problems = updater.verify_installation()
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    for rel_path, reason in problems:
+        print(f"  ✗ {rel_path}: {reason}")
+    if problems:
+        print(f"⚠️ {len(problems)} archivos no coinciden con el manifiesto")
+        return EXIT_MISMATCH
+    print("✅ Todos los archivos coinciden con el manifiesto")
+    return EXIT_OK
+
+
+def cmd_launch(args):
+    try:
+        process = launch_game(args.user)
+    except LaunchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    print(f"🎮 Cliente iniciado (PID {process.pid})")
+    if args.wait:
+        return process.wait()
+    return EXIT_OK
+
+
+def cmd_diagnose(args):
+    try:
+        instance = load_instance()
+    except LaunchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    report = analyze_game_dir(instance['game_dir'])
+    if not report.files:
+        print("ℹ️ No hay crash reports ni latest.log que analizar")
+        return EXIT_OK
+    print(report.summary())
+    return EXIT_OK
+
+
+def cmd_java(args):
+    try:
+        required = load_instance()['java_version']
+    except LaunchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    runtimes = find_runtimes(use_cache=not args.rescan)
+    selected = select_runtime(runtimes, required)
+    for runtime in sorted(runtimes, key=lambda r: (r.major, r.version), reverse=True):
+        mark = "→" if runtime == selected else " "
+        bits = "64 bits" if runtime.is_64bit else "32 bits"
+        print(f" {mark} Java {runtime.version} ({bits}) {runtime.path}")
+    if selected is None:
+        print(f"❌ No se encontró Java {required} o superior", file=sys.stderr)
+        return EXIT_ERROR
+    return EXIT_OK
+
+
+def cmd_mods(args):
+    try:
+        mods_dir = os.path.join(load_instance()['game_dir'], "mods")
+    except LaunchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    mods, errors = index_mods(mods_dir, use_cache=not args.rescan)
+    for mod in sorted(mods, key=lambda m: m.name.lower()):
+        print(f"  {mod.name} {mod.version} [{mod.mod_id}, {mod.loader}] {mod.file}")
+    for file_name, error in errors.items():
+        print(f"  ? {file_name}: {error}")
+    issues = find_issues(mods)
+    for issue in issues:
+        print(f"  ✗ {issue.message}: {', '.join(issue.files)}")
+    if issues:
+        print(f"⚠️ {len(issues)} problemas entre {len(mods)} mods", file=sys.stderr)
+        return EXIT_MISMATCH
+    print(f"✅ {len(mods)} mods")
+    return EXIT_OK
+
+
+def cmd_repair(args):
+    try:
+        instance = load_instance()
+    except LaunchError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    repair = InstanceRepair(instance['game_dir'])
+    if not args.quiet:
+        repair.on('status', _print_status)
+        repair.on('progress', _print_progress)
+    try:
+        problems, extra = repair.verify()
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    for rel_path in extra:
+        print(f"  ? {rel_path}: no pertenece al modpack")
+    for rel_path, reason in problems:
+        print(f"  ✗ {rel_path}: {reason}")
+    if not problems:
+        print("✅ Todos los archivos de la instancia están bien")
+        return EXIT_OK
+    if args.dry_run:
+        print(f"⚠️ {len(problems)} archivos no coinciden con el manifiesto")
+        return EXIT_MISMATCH
+
+    failed = repair.repair(problems)
+    for rel_path, reason in failed:
+        print(f"  ✗ {rel_path}: {reason}", file=sys.stderr)
+    if failed:
+        print(f"❌ No se pudieron reparar {len(failed)} de {len(problems)} archivos", file=sys.stderr)
+        return EXIT_ERROR
+    print(f"✅ Reparados {len(problems)} archivos")
+    return EXIT_OK
+
+
+def cmd_serve_cache(args):
+    discovery_port = None if args.no_discovery else lan_cache.DISCOVERY_PORT
+    server = lan_cache.CacheServer(args.dir, upstreams=[UPDATE_SERVER] + args.allow,
+                                   port=args.port, discovery_port=discovery_port)
+    if not args.quiet:
+        server.on('status', _print_status)
+    try:
+        server.start()
+    except OSError as e:
+        print(f"❌ No se pudo abrir el puerto: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    print(f"🗄️ Caché de la red local en {server.url} (carpeta {server.cache_dir})")
+    if not args.no_discovery:
+        print(f"📣 Respondiendo al descubrimiento por broadcast en UDP {lan_cache.DISCOVERY_PORT}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stats = server.status()
+        print(f"\n📊 {stats['requests']} peticiones, {stats['hits']} desde el caché, "
+              f"{stats['upstream_bytes'] // 1024} KB de internet, {stats['served_bytes'] // 1024} KB servidos")
+    finally:
+        server.stop()
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="launcher.py --headless",
+        description=f"Sakura Blossom Launcher v{VERSION} (modo sin interfaz)",
+        epilog="Códigos de salida: 0 correcto, 1 error, 2 actualización disponible, 3 archivos alterados",
+    )
+    parser.add_argument('-q', '--quiet', action='store_true', help="Sin mensajes de estado")
+    parser.add_argument('--limit-rate', type=int, metavar='KB/s', default=None,
+                        help="Límite de descarga (por defecto, el de OPCIONES; 0 = sin límite)")
+    parser.add_argument('--lan-cache', metavar='URL', default=None,
+                        help="Caché de la red local a usar (\"auto\" = buscarlo por broadcast, \"off\" = ninguno)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help="Busca actualizaciones")
+    check.set_defaults(func=cmd_check)
+
+    update = commands.add_parser('update', help="Descarga y aplica la actualización")
+    update.add_argument('-y', '--yes', action='store_true', help="No pedir confirmación")
+    update.set_defaults(func=cmd_update)
+
+    prefetch = commands.add_parser('prefetch', help="Descarga la actualización para instalarla al abrir el launcher")
+    prefetch.set_defaults(func=cmd_prefetch)
+
+    verify = commands.add_parser('verify', help="Verifica los archivos instalados")
+    verify.set_defaults(func=cmd_verify)
+
+    launch = commands.add_parser('launch', help="Inicia el cliente de Minecraft")
+    launch.add_argument('--user', required=True, help="Nombre de usuario")
+    launch.add_argument('--wait', action='store_true', help="Esperar a que el juego termine")
+    launch.set_defaults(func=cmd_launch)
+
+    diagnose = commands.add_parser('diagnose', help="Analiza el último cierre del juego")
+    diagnose.set_defaults(func=cmd_diagnose)
+
+    java = commands.add_parser('java', help="Lista las instalaciones de Java detectadas")
+    java.add_argument('--rescan', action='store_true', help="Volver a probar todos los binarios")
+    java.set_defaults(func=cmd_java)
+
+    mods = commands.add_parser('mods', help="Lista los mods de la instancia y sus conflictos")
+    mods.add_argument('--rescan', action='store_true', help="Volver a leer todos los jars")
+    mods.set_defaults(func=cmd_mods)
+
+    repair = commands.add_parser('repair', help="Verifica la instancia y descarga sólo los archivos dañados")
+    repair.add_argument('--dry-run', action='store_true', help="Sólo verificar, sin descargar nada")
+    repair.set_defaults(func=cmd_repair)
+
+    serve_cache = commands.add_parser('serve-cache', help="Hace de caché de actualizaciones para la red local")
+    serve_cache.add_argument('--port', type=int, default=lan_cache.CACHE_PORT)
+    serve_cache.add_argument('--dir', default=None, help="Carpeta del caché (por defecto, lan_cache/)")
+    serve_cache.add_argument('--allow', action='append', default=[], metavar='URL',
+                             help="Otro origen permitido además del servidor de actualizaciones y de los que "
+                                  "indican sus manifiestos")
+    serve_cache.add_argument('--no-discovery', action='store_true', help="No responder al broadcast")
+    serve_cache.set_defaults(func=cmd_serve_cache)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.limit_rate is not None:
+        get_scheduler().set_rate_limit(args.limit_rate * 1024)
+    if args.lan_cache is not None:
+        lan_cache.configure(args.lan_cache)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
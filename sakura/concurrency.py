@@ -0,0 +1,156 @@
+import contextlib
+import threading
+import time
+
+# ============================================
+# CONCURRENCIA ADAPTATIVA DE DESCARGAS (AIMD)
+# ============================================
+# Un número fijo de conexiones se queda corto en fibra y ahoga una ADSL o una
+# red congestionada. El controlador ajusta el límite de descargas simultáneas
+# en ventanas de WINDOW segundos:
+#
+# - Si la velocidad total mejoró respecto a la ventana anterior, +1 conexión.
+#   Al principio (arranque lento, como TCP) se duplica en vez de sumar, hasta
+#   la primera ventana sin mejora o el primer error: así una fibra no tarda
+#   medio minuto en llegar a su punto óptimo.
+# - Ante un error o timeout el límite se multiplica por DECREASE al momento
+#   (como mucho una vez por ventana: una ráfaga de errores cuenta como una).
+# - Si la velocidad total no mejoró y la de cada conexión cayó (el enlace
+#   está saturado y sólo se reparten lo mismo), se quita una conexión.
+#
+# Sólo se evalúan las ventanas en las que se usaron todas las conexiones
+# permitidas; con menos trabajos pendientes la medición no dice nada.
+
+WINDOW = 0.5  # Segundos por ventana de medición
+MIN_CONNECTIONS = 1
+MAX_CONNECTIONS = 16
+INITIAL_CONNECTIONS = 2
+INCREASE = 1
+DECREASE = 0.5
+IMPROVEMENT = 1.05  # La velocidad total debe subir al menos un 5 % para seguir creciendo
+PER_CONNECTION_DROP = 0.75  # Caída por conexión que se considera saturación
+HISTORY_SIZE = 120
+
+
+class AimdController:
+    """Límite dinámico de descargas simultáneas (semáforo con tamaño variable)"""
+
+    def __init__(self, initial=INITIAL_CONNECTIONS, minimum=MIN_CONNECTIONS, maximum=MAX_CONNECTIONS,
+                 window=WINDOW, clock=time.monotonic, on_change=None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(initial, maximum))
+        self.window = window
+        self.clock = clock
+        self.on_change = on_change  # on_change(límite, bytes/s) al cambiar el límite
+        self.condition = threading.Condition()
+        self.active = 0
+
+        self.window_start = clock()
+        self.window_bytes = 0
+        self.window_saturated = False
+        self.previous = None  # (bytes/s, bytes/s por conexión) de la última ventana evaluada
+        self.slow_start = True
+        self.last_decrease = None
+
+        # Métricas
+        self.total_bytes = 0
+        self.total_errors = 0
+        self.increases = 0
+        self.decreases = 0
+        self.throughput = 0.0
+        self.history = []  # (segundos desde el inicio, límite, bytes/s)
+        self.started = self.window_start
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Ocupa una conexión mientras dure el `with` (espera si se llegó al límite)"""
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+            if self.active >= self.limit:
+                self.window_saturated = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.active -= 1
+                self.condition.notify()
+
+    def record(self, amount):
+        """Bytes recibidos por cualquier conexión"""
+        with self.condition:
+            self.window_bytes += amount
+            self.total_bytes += amount
+            self._maybe_adjust()
+
+    def record_error(self):
+        """Error de red o timeout en una conexión: se reduce el límite sin esperar a la ventana"""
+        with self.condition:
+            self.total_errors += 1
+            now = self.clock()
+            if self.last_decrease is not None and now - self.last_decrease < self.window:
+                return  # Misma ráfaga de errores que ya provocó la última reducción
+            old_limit = self.limit
+            self._decrease(now)
+            self._close_window(now, self.throughput, old_limit)
+
+    def _decrease(self, now, step=None):
+        target = self.limit - step if step else int(self.limit * DECREASE)
+        self.limit = max(self.minimum, target)
+        self.slow_start = False
+        self.previous = None  # Tras recortar se vuelve a medir desde cero
+        self.last_decrease = now
+
+    def _maybe_adjust(self):
+        now = self.clock()
+        elapsed = now - self.window_start
+        if elapsed < self.window:
+            return
+
+        throughput = self.window_bytes / elapsed
+        per_connection = throughput / max(self.limit, 1)
+        self.throughput = throughput
+        old_limit = self.limit
+
+        if self.window_saturated:
+            previous, self.previous = self.previous, (throughput, per_connection)
+            if previous is None or throughput >= previous[0] * IMPROVEMENT:
+                step = self.limit if self.slow_start else INCREASE
+                self.limit = min(self.maximum, self.limit + step)
+            else:
+                self.slow_start = False
+                if per_connection < previous[1] * PER_CONNECTION_DROP:
+                    self._decrease(now, step=INCREASE)
+        self._close_window(now, throughput, old_limit)
+
+    def _close_window(self, now, throughput, old_limit):
+        if self.limit > old_limit:
+            self.increases += 1
+            self.condition.notify_all()
+        elif self.limit < old_limit:
+            self.decreases += 1
+
+        self.history.append((round(now - self.started, 3), self.limit, throughput))
+        del self.history[:-HISTORY_SIZE]
+        self.window_start = now
+        self.window_bytes = 0
+        self.window_saturated = self.active >= self.limit
+
+        if self.limit != old_limit and self.on_change:
+            self.on_change(self.limit, throughput)
+
+    def metrics(self):
+        """Estado actual para métricas y diagnóstico"""
+        with self.condition:
+            return {
+                'limit': self.limit,
+                'active': self.active,
+                'throughput': self.throughput,
+                'total_bytes': self.total_bytes,
+                'errors': self.total_errors,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'history': list(self.history),
+            }
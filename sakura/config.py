@@ -0,0 +1,35 @@
+import os
+
+# ============================================
+# CONFIGURACIÓN DEL SISTEMA DE ACTUALIZACIÓN
+# ============================================
+VERSION = "0.0.7"
+UPDATE_SERVER = "https://raw.githubusercontent.com/Plxgio/SakuraLauncher/master/updates/"
+VERSION_FILE = "launcher_version.json"
+UPDATE_FILE = "launcher_update.zip"
+PATCH_STAGING_DIR = "patched"  # Subcarpeta de temp_updates con los archivos parcheados
+CONTENT_SERVER = UPDATE_SERVER + "content/"  # Contenido de las pestañas (index.json + HTML)
+INSTANCE_SERVER = UPDATE_SERVER + "instance/"  # Archivos del juego (manifest.json + files/)
+INSTANCE_MANIFEST = "manifest.json"
+CHECK_INTERVAL = 3600  # Segundos entre verificaciones (1 hora)
+# Clave pública Ed25519 de los manifiestos (launcher, instancia y contenido).
+# La privada sólo la tiene quien publica las releases (tools/sign_manifest.py
+# --generate-key). Con clave, un manifiesto sin firma válida se rechaza; vacía
+# (hasta que se publiquen releases firmadas) se aceptan sin comprobar, con aviso.
+UPDATE_PUBLIC_KEY = os.environ.get("SAKURA_UPDATE_PUBLIC_KEY", "")
+# Caché de actualizaciones de la red local (sakura/lan_cache.py): URL fija,
+# "auto" para buscarlo por broadcast, vacío u "off" para no usarlo
+LAN_CACHE_URL = os.environ.get("SAKURA_LAN_CACHE", "")
+
+# Métricas (sakura/metrics.py): archivo para el textfile collector de
+# Prometheus ("" = metrics.prom junto al launcher, "off" = no escribirlo) y
+# puerto del endpoint local /metrics y /metrics.json (0 = desactivado)
+METRICS_FILE = os.environ.get("SAKURA_METRICS_FILE", "")
+METRICS_PORT = int(os.environ.get("SAKURA_METRICS_PORT", "9735") or 0)
+
+# Modo de presupuesto de memoria (equipos con poca RAM compartida con el juego):
+# SAKURA_MEMORY_BUDGET=1 o --low-memory
+MEMORY_BUDGET = os.environ.get("SAKURA_MEMORY_BUDGET", "") == "1"
+
+# Carpeta de instalación del launcher (donde están launcher.py y assets/)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,121 @@
+import hashlib
+import http.client
+import json
+import os
+import urllib.error
+import urllib.request
+
+from sakura.config import APP_DIR, CONTENT_SERVER, UPDATE_PUBLIC_KEY
+from sakura.integrity import UNSIGNED_WARNING, IntegrityError, check_manifest
+from sakura.scheduler import PRIORITY_CONTENT, get_scheduler
+from sakura.state import get_store
+
+# ============================================
+# CONTENIDO REMOTO DE LAS PESTAÑAS
+# ============================================
+# El servidor publica content/index.json con la versión del paquete y, por
+# pestaña, su título, archivo HTML y SHA-256 (que hace de ETag de la pestaña).
+# La copia local (cache/content/) se muestra al instante; refresh() corre en
+# segundo plano, pregunta por el índice con If-None-Match y sólo descarga las
+# pestañas cuyo hash cambió. La versión, el ETag y los hashes de las pestañas
+# se guardan en el estado del launcher ('content').
+
+CONTENT_DIR = os.path.join("cache", "content")
+INDEX_FILE = "index.json"
+REMOTE_TABS = ('home', 'lore', 'mods', 'support')
+
+
+class ContentStore:
+    """Caché local del contenido remoto de las pestañas"""
+
+    def __init__(self, base_dir=APP_DIR, server=CONTENT_SERVER, timeout=10):
+        self.base_dir = base_dir
+        self.content_dir = os.path.join(base_dir, CONTENT_DIR)
+        self.server = server
+        self.timeout = timeout
+        self.store = get_store(base_dir)
+        self.state = self.store.get('content')
+
+    def _write_atomic(self, path, data):
+        os.makedirs(self.content_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _tab_path(self, tab_id):
+        return os.path.join(self.content_dir, f"{tab_id}.html")
+
+    def get(self, tab_id):
+        """(título, html) de la última copia descargada, o None si no hay"""
+        entry = self.state['tabs'].get(tab_id)
+        if not entry:
+            return None
+        try:
+            with open(self._tab_path(tab_id), 'r', encoding='utf-8') as f:
+                return entry['title'], f.read()
+        except OSError:
+            return None
+
+    def _fetch(self, url, etag=None):
+        """GET condicional: devuelve (cuerpo, etag) o (None, etag) si no cambió (304)"""
+        request = urllib.request.Request(url)
+        if etag:
+            request.add_header('If-None-Match', etag)
+        try:
+            with get_scheduler(self.base_dir).job(PRIORITY_CONTENT, "contenido") as job:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return job.wrap(response).read(), response.headers.get('ETag')
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, etag
+            raise
+
+    def refresh(self):
+        """Actualiza la caché desde el servidor; devuelve las pestañas que cambiaron"""
+        try:
+            body, index_etag = self._fetch(f"{self.server}{INDEX_FILE}", self.state.get('index_etag'))
+            if body is None:
+                return []
+
+            index = json.loads(body.decode('utf-8'))
+            if not check_manifest(index, UPDATE_PUBLIC_KEY):
+                print(UNSIGNED_WARNING)
+
+            tabs = self.state['tabs']
+            changed = []
+            for tab_id, remote in (index.get('tabs') or {}).items():
+                if tab_id not in REMOTE_TABS:
+                    continue
+                cached = tabs.get(tab_id)
+                if cached and cached['sha256'] == remote['sha256'] and os.path.exists(self._tab_path(tab_id)):
+                    if cached['title'] != remote.get('title', cached['title']):
+                        cached['title'] = remote['title']
+                        changed.append(tab_id)
+                    continue
+
+                html, _ = self._fetch(f"{self.server}{remote['file']}")
+                if hashlib.sha256(html).hexdigest() != remote['sha256']:
+                    raise IntegrityError(f"El contenido de '{tab_id}' no coincide con el índice")
+                self._write_atomic(self._tab_path(tab_id), html)
+                tabs[tab_id] = {'title': remote.get('title', tab_id.upper()), 'sha256': remote['sha256']}
+                changed.append(tab_id)
+
+            # Pestañas retiradas del servidor: se vuelve al texto incluido en el launcher
+            for tab_id in [t for t in tabs if t not in (index.get('tabs') or {})]:
+                del tabs[tab_id]
+                changed.append(tab_id)
+                try:
+                    os.remove(self._tab_path(tab_id))
+                except OSError:
+                    pass
+
+            self.state['version'] = index.get('version', 0)
+            self.state['index_etag'] = index_etag
+            self.store.set('content', self.state)
+            return changed
+
+        except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError, KeyError,
+                IntegrityError) as e:
+            print(f"⚠️ No se pudo actualizar el contenido de las pestañas: {e}")
+            return []
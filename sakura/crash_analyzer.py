@@ -0,0 +1,208 @@
+import collections
+import glob
+import mmap
+import os
+import re
+
+from sakura.config import VERSION
+
+# ============================================
+# DIAGNÓSTICO DE CIERRES DEL JUEGO
+# ============================================
+# Busca problemas conocidos en crash-reports/*.txt y logs/latest.log. Los
+# archivos se proyectan en memoria (mmap). En latest.log, que puede ocupar
+# cientos de MB, una sola pasada localiza las líneas WARN/ERROR/FATAL (con su
+# traza) y sólo ese texto, más el final del archivo, se compara con las firmas.
+# Todas las firmas van en una sola expresión (una alternativa con nombre por
+# firma), así cada texto se recorre una única vez sea cual sea su número.
+# Delante va una comprobación del primer byte: sin ella, re probaría las once
+# alternativas en cada posición y la pasada sería más lenta que once separadas.
+
+Signature = collections.namedtuple('Signature', 'id title advice pattern')
+
+# `detail` (si existe) es lo que se muestra en el resumen
+SIGNATURES = [
+    Signature('out_of_memory', "Memoria insuficiente",
+              "Sube la RAM asignada al juego en Opciones o cierra otros programas.",
+              rb"java\.lang\.OutOfMemoryError(?::\s*(?P<detail>[^\r\n]+))?"),
+    Signature('jvm_reserve', "Java no pudo reservar la memoria pedida",
+              "Baja la RAM asignada o instala Java de 64 bits.",
+              rb"Could not reserve enough space for (?P<detail>[^\r\n]*object heap)"),
+    Signature('missing_dependency', "Falta una dependencia de un mod",
+              "Reinstala el modpack desde el launcher (Verificar archivos).",
+              rb"(?P<detail>Mod '(?:[^'\r\n]|'(?! \())+' \([^)\r\n]*\) \S+ requires [^\r\n]*?), which is missing"),
+    Signature('wrong_dependency', "Versión incorrecta de una dependencia",
+              "Reinstala el modpack desde el launcher (Verificar archivos).",
+              rb"(?P<detail>Mod '(?:[^'\r\n]|'(?! \())+' \([^)\r\n]*\) \S+ requires [^\r\n]*?), but only the wrong version is present"),
+    Signature('incompatible_mods', "Mods incompatibles entre sí",
+              "Quita los mods añadidos a mano: el modpack ya incluye los necesarios.",
+              rb"(?P<detail>Mod '(?:[^'\r\n]|'(?! \())+' \([^)\r\n]*\) \S+ is incompatible with [^\r\n!]*)"),
+    Signature('duplicate_mods', "Mods duplicados",
+              "Borra las copias repetidas de la carpeta mods.",
+              rb"(?:DuplicateModsFoundException|[Dd]uplicate mods? found)[:\s]*(?P<detail>[^\r\n]*)"),
+    Signature('mixin_conflict', "Conflicto entre mods (Mixin)",
+              "Un mod modifica el mismo código que otro; quita los mods añadidos a mano.",
+              rb"Mixin apply(?: for mod (?P<detail>[\w.-]+))? failed|InvalidInjectionException|MixinTransformerError"),
+    Signature('java_version', "Versión de Java demasiado antigua",
+              "Minecraft 1.20.1 necesita Java 17 o superior.",
+              rb"UnsupportedClassVersionError[^\r\n]*?(?P<detail>class file version \d+(?:\.\d+)?)"),
+    Signature('gpu_driver', "Problema con el driver de la tarjeta gráfica",
+              "Actualiza los drivers de la tarjeta gráfica.",
+              rb"Pixel format not accelerated|GLFW error 6554[23]|(?P<detail>The driver does not appear to support OpenGL)"),
+    Signature('native_crash', "Cierre nativo de Java",
+              "Suele deberse a drivers gráficos o a mods con código nativo; actualiza los drivers.",
+              rb"EXCEPTION_ACCESS_VIOLATION|SIGSEGV \(0xb\)"),
+    Signature('ticking_entity', "Entidad o bloque dañado en el mundo",
+              "Avisa en el ticket de dónde estabas; el staff puede quitar la entidad dañada.",
+              rb"Ticking (?:block )?entity"),
+]
+
+BY_ID = {signature.id: signature for signature in SIGNATURES}
+
+# Bytes con los que puede empezar alguna firma (al añadir una, añadir su inicial)
+FIRST_BYTES = rb"[jCMDdIUPGEST]"
+
+
+def _combined_pattern():
+    """Una alternativa (?P<id>...) por firma; su grupo `detail` pasa a llamarse id__detail"""
+    alternatives = []
+    for signature in SIGNATURES:
+        name = signature.id.encode('ascii')
+        pattern = signature.pattern.replace(rb"(?P<detail>", b"(?P<" + name + b"__detail>")
+        alternatives.append(b"(?P<" + name + b">" + pattern + b")")
+    return re.compile(b"(?=" + FIRST_BYTES + b")(?:" + b"|".join(alternatives) + b")")
+
+
+COMBINED = _combined_pattern()
+
+# Cabecera de línea de log4j con nivel relevante: "[hilo/ERROR]"
+INTERESTING_LINE = re.compile(rb"/(?:ERROR|WARN|FATAL)\]")
+HEADER_SAMPLE = rb"/INFO]"
+MAX_REGION = 64 * 1024  # Texto máximo tomado tras una línea de error (su traza)
+TAIL_SIZE = 256 * 1024  # El final del log siempre se revisa entero
+MAX_CRASH_REPORTS = 3
+MAX_EXAMPLES = 3
+
+
+class Finding:
+    """Coincidencias de una firma"""
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.count = 0
+        self.examples = []
+        self.files = set()
+
+    def add(self, match, file_name):
+        self.count += 1
+        self.files.add(file_name)
+        group = self.signature.id + "__detail"
+        detail = (match.group(group) if group in match.re.groupindex else None) or match.group(0)
+        detail = detail.decode('utf-8', 'replace').strip()[:200]
+        if detail and detail not in self.examples and len(self.examples) < MAX_EXAMPLES:
+            self.examples.append(detail)
+
+
+class CrashReport:
+    """Resultado del análisis: problemas conocidos encontrados y archivos revisados"""
+
+    def __init__(self):
+        self.findings = {}
+        self.files = []
+        self.bytes_scanned = 0
+
+    def add(self, signature, match, file_name):
+        finding = self.findings.get(signature.id)
+        if finding is None:
+            finding = self.findings[signature.id] = Finding(signature)
+        finding.add(match, file_name)
+
+    def summary(self):
+        """Resumen corto para pegar en un ticket de soporte"""
+        lines = [f"🩺 Diagnóstico automático (Sakura Blossom Launcher v{VERSION})"]
+        if not self.findings:
+            lines.append("• No se reconoció ningún problema conocido.")
+        for finding in sorted(self.findings.values(), key=lambda f: SIGNATURES.index(f.signature)):
+            lines.append(f"• {finding.signature.title} (x{finding.count})")
+            for example in finding.examples:
+                lines.append(f"    ↳ {example}")
+            lines.append(f"    ✔ {finding.signature.advice}")
+        if self.files:
+            lines.append(f"Archivos: {', '.join(os.path.basename(path) for path in self.files)}")
+        return "\n".join(lines)
+
+
+def _scan(data, report, file_name):
+    for match in COMBINED.finditer(data):
+        # La alternativa que coincidió es el último grupo cerrado: el de la firma
+        report.add(BY_ID[match.lastgroup], match, file_name)
+
+
+def _map_file(path):
+    """mmap de solo lectura (None si el archivo está vacío o no se puede abrir)"""
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def _interesting_regions(data, end_pos):
+    """Líneas WARN/ERROR/FATAL (hasta `end_pos`) con sus líneas de continuación, en una pasada"""
+    regions = []
+    covered = 0
+    for match in INTERESTING_LINE.finditer(data, 0, end_pos):
+        if match.start() < covered:
+            continue  # Ya incluida en la traza de la región anterior
+        start = data.rfind(b"\n", 0, match.start()) + 1
+        # La región termina en la siguiente línea con cabecera "[..."
+        end = data.find(b"\n[", match.end(), match.end() + MAX_REGION)
+        if end < 0:
+            end = min(len(data), match.end() + MAX_REGION)
+        regions.append(data[start:end])
+        covered = end
+    return regions
+
+
+def analyze_log(path, report):
+    data = _map_file(path)
+    if data is None:
+        return
+    with data:
+        report.files.append(path)
+        report.bytes_scanned += len(data)
+        tail_start = max(0, len(data) - TAIL_SIZE)
+        if tail_start == 0 or data.find(HEADER_SAMPLE, 0, 64 * 1024) < 0:
+            # Archivo pequeño o sin formato log4j: se revisa entero
+            _scan(data, report, os.path.basename(path))
+            return
+        regions = _interesting_regions(data, tail_start)
+        regions.append(data[tail_start:])
+        _scan(b"\n".join(regions), report, os.path.basename(path))
+
+
+def analyze_crash_report(path, report):
+    data = _map_file(path)
+    if data is None:
+        return
+    with data:
+        report.files.append(path)
+        report.bytes_scanned += len(data)
+        _scan(data, report, os.path.basename(path))
+
+
+def analyze_game_dir(game_dir, since=None):
+    """Analiza los últimos crash reports (posteriores a `since`, si se indica) y latest.log"""
+    report = CrashReport()
+    crash_reports = sorted(glob.glob(os.path.join(game_dir, "crash-reports", "*.txt")),
+                           key=os.path.getmtime, reverse=True)
+    for path in crash_reports[:MAX_CRASH_REPORTS]:
+        if since is None or os.path.getmtime(path) >= since:
+            analyze_crash_report(path, report)
+
+    latest_log = os.path.join(game_dir, "logs", "latest.log")
+    if os.path.exists(latest_log):
+        analyze_log(latest_log, report)
+    return report
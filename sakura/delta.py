@@ -0,0 +1,239 @@
+import hashlib
+import os
+import struct
+import zlib
+
+# ============================================
+# PARCHES BINARIOS ENTRE VERSIONES
+# ============================================
+# Formato estilo rsync: el archivo nuevo se describe como una secuencia de
+# copias de bloques del archivo anterior y de datos literales. Cabecera:
+#   MAGIC | tamaño de bloque | sha256 origen | sha256 destino | tamaño destino
+# seguida de un flujo zlib con las operaciones:
+#   b"C" + offset (Q) + longitud (I)  -> copiar desde el archivo de origen
+#   b"L" + longitud (I) + datos       -> escribir datos literales
+#   b"E"                              -> fin del parche
+
+MAGIC = b"SBDIFF1\n"
+HEADER = struct.Struct(">I32s32sQ")
+DEFAULT_BLOCK_SIZE = 2048
+STREAM_CHUNK = 64 * 1024
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+_OP_COPY = b"C"
+_OP_LITERAL = b"L"
+_OP_END = b"E"
+_COPY = struct.Struct(">QI")
+_LENGTH = struct.Struct(">I")
+_MOD = 1 << 16
+
+
+class DeltaError(Exception):
+    """Error al generar o aplicar un parche binario"""
+
+
+def file_sha256(path, chunk_size=STREAM_CHUNK):
+    """Calcula el SHA-256 de un archivo (o del contenido vacío si no existe)"""
+    digest = hashlib.sha256()
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _weak_checksum(data):
+    """Checksum débil tipo Adler usado como suma rodante"""
+    a = 0
+    b = 0
+    length = len(data)
+    for i, byte in enumerate(data):
+        a += byte
+        b += (length - i) * byte
+    return a % _MOD, b % _MOD
+
+
+def _compute_ops(old, new, block_size):
+    """Genera las operaciones (copia/literal) que reconstruyen `new` a partir de `old`"""
+    index = {}
+    for offset in range(0, len(old) - block_size + 1, block_size):
+        weak = _weak_checksum(old[offset:offset + block_size])
+        index.setdefault(weak, []).append(offset)
+
+    ops = []
+    literal_start = 0
+
+    def emit_copy(offset, length):
+        last = ops[-1] if ops else None
+        if last and last[0] == _OP_COPY and last[1] + last[2] == offset:
+            ops[-1] = (_OP_COPY, last[1], last[2] + length)
+        else:
+            ops.append((_OP_COPY, offset, length))
+
+    i = 0
+    end = len(new)
+    if index and end >= block_size:
+        a, b = _weak_checksum(new[0:block_size])
+        while True:
+            match = None
+            for offset in index.get((a, b), ()):
+                if old[offset:offset + block_size] == new[i:i + block_size]:
+                    match = offset
+                    break
+
+            if match is not None:
+                if literal_start < i:
+                    ops.append((_OP_LITERAL, literal_start, i - literal_start))
+                emit_copy(match, block_size)
+                i += block_size
+                literal_start = i
+                if i + block_size > end:
+                    break
+                a, b = _weak_checksum(new[i:i + block_size])
+                continue
+
+            if i + block_size >= end:
+                break
+            out_byte = new[i]
+            in_byte = new[i + block_size]
+            a = (a - out_byte + in_byte) % _MOD
+            b = (b - block_size * out_byte + a) % _MOD
+            i += 1
+
+    if literal_start < end:
+        ops.append((_OP_LITERAL, literal_start, end - literal_start))
+    return ops
+
+
+def make_patch(old_path, new_path, patch_path, block_size=DEFAULT_BLOCK_SIZE):
+    """Genera un parche de `old_path` a `new_path` (old_path puede ser None para un archivo nuevo)"""
+    old = b""
+    if old_path and os.path.exists(old_path):
+        with open(old_path, 'rb') as f:
+            old = f.read()
+    with open(new_path, 'rb') as f:
+        new = f.read()
+
+    ops = _compute_ops(old, new, block_size)
+    compressor = zlib.compressobj(9)
+
+    with open(patch_path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(HEADER.pack(
+            block_size,
+            hashlib.sha256(old).digest(),
+            hashlib.sha256(new).digest(),
+            len(new),
+        ))
+        for op, start, length in ops:
+            if op == _OP_COPY:
+                out.write(compressor.compress(_OP_COPY + _COPY.pack(start, length)))
+            else:
+                # Literales largos se parten para que el aplicador no necesite buffers grandes
+                for pos in range(start, start + length, STREAM_CHUNK):
+                    piece = new[pos:min(pos + STREAM_CHUNK, start + length)]
+                    out.write(compressor.compress(_OP_LITERAL + _LENGTH.pack(len(piece))))
+                    out.write(compressor.compress(piece))
+        out.write(compressor.compress(_OP_END))
+        out.write(compressor.flush())
+
+    return os.path.getsize(patch_path)
+
+
+class _PatchStream:
+    """Lee un parche descomprimiéndolo bajo demanda (sin cargarlo entero en memoria)"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.decompressor = zlib.decompressobj()
+        self.buffer = bytearray()
+        self.eof = False
+
+    def read_exact(self, size):
+        while len(self.buffer) < size and not self.eof:
+            raw = self.fileobj.read(STREAM_CHUNK)
+            if not raw:
+                self.buffer += self.decompressor.flush()
+                self.eof = True
+                break
+            self.buffer += self.decompressor.decompress(raw)
+
+        if len(self.buffer) < size:
+            raise DeltaError("Parche truncado")
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+def read_patch_header(fileobj):
+    """Lee y valida la cabecera de un parche"""
+    magic = fileobj.read(len(MAGIC))
+    if magic != MAGIC:
+        raise DeltaError("Formato de parche desconocido")
+    raw = fileobj.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise DeltaError("Cabecera de parche incompleta")
+    block_size, source_sha, target_sha, target_size = HEADER.unpack(raw)
+    return {
+        'block_size': block_size,
+        'source_sha256': source_sha.hex(),
+        'target_sha256': target_sha.hex(),
+        'target_size': target_size,
+    }
+
+
+def apply_patch(source_path, patch_fileobj, target_path, expected_sha256=None, progress=None):
+    """Aplica un parche en streaming y verifica el hash del resultado.
+
+    `patch_fileobj` puede ser un archivo abierto o directamente la respuesta
+    HTTP, de modo que el parche se aplica mientras se descarga.
+    """
+    header = read_patch_header(patch_fileobj)
+    expected = expected_sha256 or header['target_sha256']
+    if header['target_sha256'] != expected:
+        raise DeltaError("El parche no corresponde al archivo esperado")
+
+    stream = _PatchStream(patch_fileobj)
+    digest = hashlib.sha256()
+    written = 0
+    source = open(source_path, 'rb') if source_path and os.path.exists(source_path) else None
+
+    try:
+        with open(target_path, 'wb') as out:
+            while True:
+                op = stream.read_exact(1)
+                if op == _OP_END:
+                    break
+                if op == _OP_COPY:
+                    offset, length = _COPY.unpack(stream.read_exact(_COPY.size))
+                    if source is None:
+                        raise DeltaError("El parche requiere un archivo de origen")
+                    source.seek(offset)
+                    remaining = length
+                    while remaining:
+                        data = source.read(min(remaining, STREAM_CHUNK))
+                        if not data:
+                            raise DeltaError("El archivo de origen es más corto de lo esperado")
+                        out.write(data)
+                        digest.update(data)
+                        remaining -= len(data)
+                    written += length
+                elif op == _OP_LITERAL:
+                    (length,) = _LENGTH.unpack(stream.read_exact(_LENGTH.size))
+                    data = stream.read_exact(length)
+                    out.write(data)
+                    digest.update(data)
+                    written += length
+                else:
+                    raise DeltaError(f"Operación de parche inválida: {op!r}")
+
+                if progress:
+                    progress(written, header['target_size'])
+    finally:
+        if source:
+            source.close()
+
+    if written != header['target_size'] or digest.hexdigest() != expected:
+        os.remove(target_path)
+        raise DeltaError("El hash del archivo parcheado no coincide")
+    return written
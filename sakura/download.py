@@ -0,0 +1,271 @@
+import hashlib
+import http.client
+import os
+import time
+import urllib.error
+import urllib.request
+
+from sakura import lan_cache, metrics
+from sakura.config import APP_DIR
+from sakura.integrity import IntegrityError, check_digest, verify_chunk_list
+
+# ============================================
+# DESCARGAS CON VERIFICACIÓN EN VUELO
+# ============================================
+
+DOWNLOAD_CHUNK = 64 * 1024
+DOWNLOAD_TIMEOUT = 30
+MAX_REPAIR_ROUNDS = 3
+
+DOWNLOAD_BYTES = metrics.counter(
+    "sakura_download_bytes_total", "Bytes descargados y verificados por origen", ('source',))
+DOWNLOAD_THROUGHPUT = metrics.histogram(
+    "sakura_download_throughput_bytes_per_second", "Velocidad media de cada descarga completada",
+    ('source',), buckets=metrics.THROUGHPUT_BUCKETS)
+DOWNLOAD_FAILURES = metrics.counter(
+    "sakura_download_failures_total", "Descargas fallidas por origen", ('source',))
+
+
+def download_file(url, dest_path, expected_sha256=None, expected_size=None, progress=None,
+                  timeout=DOWNLOAD_TIMEOUT, chunks=None, status=None, max_repairs=MAX_REPAIR_ROUNDS,
+                  job=None, use_lan_cache=True, base_dir=APP_DIR):
+    """Descarga `url` en `dest_path` calculando el SHA-256 mientras llegan los bytes.
+
+    Falla en cuanto se detecta un tamaño incorrecto y borra el archivo si el
+    hash final no coincide, así nunca queda una descarga corrupta en disco.
+    Si el manifiesto trae hashes por bloque (`chunks`), cada bloque se verifica
+    al completarse y sólo se vuelven a pedir los rangos dañados.
+    Con `job` (sakura.scheduler) cada bloque respeta la prioridad y el límite
+    de ancho de banda.
+    Si hay un caché en la red local (sakura.lan_cache) y se conoce el hash, se
+    pide primero a él; ante cualquier fallo se descarga de `url`. `base_dir`
+    es la instalación cuyas opciones dicen qué caché usar.
+    """
+    args = (dest_path, expected_sha256, expected_size, progress, timeout, chunks, status, max_repairs, job)
+    mirror = lan_cache.cached_url(url, expected_sha256, base_dir=base_dir) if use_lan_cache and expected_sha256 else None
+    if mirror:
+        try:
+            return _measured_download('lan_cache', mirror, *args)
+        except (urllib.error.URLError, http.client.HTTPException, OSError, IntegrityError) as e:
+            if not isinstance(e, IntegrityError):
+                lan_cache.report_failure(e)
+            if status:
+                status(f"⚠️ Caché de la red local no disponible ({str(e)}), descargando de internet")
+
+    return _measured_download('direct', url, *args)
+
+
+def _measured_download(source, url, dest_path, *args):
+    """_download() registrando bytes y velocidad (una vez por archivo, no por bloque)"""
+    start = time.perf_counter()
+    try:
+        digest = _download(url, dest_path, *args)
+    except Exception:
+        DOWNLOAD_FAILURES.labels(source=source).inc()
+        raise
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(dest_path)
+    DOWNLOAD_BYTES.labels(source=source).inc(size)
+    if elapsed > 0:
+        DOWNLOAD_THROUGHPUT.labels(source=source).observe(size / elapsed)
+    return digest
+
+
+def _download(url, dest_path, expected_sha256, expected_size, progress, timeout, chunks, status,
+              max_repairs, job):
+    if chunks and expected_size:
+        return _download_chunked(url, dest_path, expected_sha256, expected_size, chunks,
+                                 progress, timeout, status, max_repairs, job)
+
+    digest = hashlib.sha256()
+    received = 0
+
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            total = _announced_size(response, expected_size)
+            reader = job.wrap(response) if job else response
+
+            with open(dest_path, 'wb') as out:
+                while True:
+                    block = reader.read(DOWNLOAD_CHUNK)
+                    if not block:
+                        break
+                    out.write(block)
+                    digest.update(block)
+                    received += len(block)
+
+                    if expected_size is not None and received > expected_size:
+                        raise IntegrityError("La descarga es más grande de lo esperado")
+                    if progress:
+                        progress(received, total)
+
+        check_digest(digest, expected_sha256, received, expected_size)
+    except Exception:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+
+    return digest.hexdigest()
+
+
+def _announced_size(response, expected_size):
+    """Tamaño anunciado por el servidor; falla pronto si no es el del manifiesto"""
+    total = int(response.headers.get('Content-Length') or 0) or expected_size or 0
+    if expected_size is not None and total and total != expected_size:
+        raise IntegrityError(f"El servidor anuncia {total} bytes, se esperaban {expected_size}")
+    return total
+
+
+class _ChunkVerifier:
+    """Va hasheando los bytes recibidos y verifica cada bloque al completarse"""
+
+    def __init__(self, hashes, chunk_size, first_index=0):
+        self.hashes = hashes
+        self.chunk_size = chunk_size
+        self.index = first_index
+        self.current = hashlib.sha256()
+        self.filled = 0
+        self.good = []
+        self.bad = []
+
+    def expected_length(self, total_size):
+        return min(self.chunk_size, total_size - self.index * self.chunk_size)
+
+    def feed(self, block, total_size):
+        view = memoryview(block)
+        while view and self.index < len(self.hashes):
+            take = min(len(view), self.expected_length(total_size) - self.filled)
+            self.current.update(view[:take])
+            self.filled += take
+            view = view[take:]
+            if self.filled == self.expected_length(total_size):
+                target = self.good if self.current.hexdigest() == self.hashes[self.index] else self.bad
+                target.append(self.index)
+                self.index += 1
+                self.current = hashlib.sha256()
+                self.filled = 0
+
+
+def _group_ranges(indices):
+    """Agrupa índices de bloque consecutivos en rangos (inicio, fin) inclusivos"""
+    ranges = []
+    for index in sorted(indices):
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ranges
+
+
+def _download_chunked(url, dest_path, expected_sha256, expected_size, chunks, progress,
+                      timeout, status, max_repairs, job=None):
+    """Descarga verificando bloque a bloque y repara sólo los rangos dañados"""
+    verify_chunk_list(chunks, expected_size)
+    chunk_size = chunks['size']
+    hashes = chunks['sha256']
+
+    digest = hashlib.sha256()
+    verifier = _ChunkVerifier(hashes, chunk_size)
+    received = 0
+
+    try:
+        with open(dest_path, 'wb') as out:
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    total = _announced_size(response, expected_size)
+                    reader = job.wrap(response) if job else response
+                    while True:
+                        block = reader.read(DOWNLOAD_CHUNK)
+                        if not block:
+                            break
+                        if received + len(block) > expected_size:
+                            raise IntegrityError("La descarga es más grande de lo esperado")
+                        out.write(block)
+                        digest.update(block)
+                        verifier.feed(block, expected_size)
+                        received += len(block)
+                        if progress:
+                            progress(received, total)
+            except urllib.error.HTTPError:
+                # 404/403/503: pedir rangos de esa URL daría lo mismo
+                raise
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                # Sin ningún byte (conexión rechazada, caché caído) no hay nada que reparar:
+                # el error llega tal cual a quien decide si reintentar o cambiar de origen
+                if not received:
+                    raise
+                # Un corte a mitad no obliga a empezar de cero: lo que falta se repara por rangos
+                if status:
+                    status(f"⚠️ Descarga interrumpida ({str(e)}), se recuperarán los bloques faltantes")
+
+            # Reservar el tamaño completo para poder escribir los rangos reparados
+            out.truncate(expected_size)
+
+        bad = set(verifier.bad) | set(range(verifier.index, len(hashes)))
+        repaired = bool(bad)
+        network_error = None
+
+        for round_number in range(max_repairs):
+            if not bad:
+                break
+            if status:
+                status(f"🩹 Reparando {len(bad)} de {len(hashes)} bloques (intento {round_number + 1})")
+            bad, network_error = _repair_ranges(url, dest_path, hashes, chunk_size, expected_size, bad,
+                                                timeout, job)
+
+        if bad:
+            # Si los rangos no llegaron por la red, es un error de red (se reintenta), no de integridad
+            if network_error is not None:
+                raise network_error
+            raise IntegrityError(f"{len(bad)} bloques siguen dañados tras {max_repairs} intentos")
+
+        if not repaired:
+            check_digest(digest, expected_sha256, received, expected_size)
+        # Si hubo reparaciones, todos los bloques quedaron verificados contra la lista firmada
+    except Exception:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+
+    return digest.hexdigest() if not repaired else chunks.get('root')
+
+
+def _repair_ranges(url, dest_path, hashes, chunk_size, total_size, bad, timeout, job=None):
+    """Vuelve a pedir con cabeceras Range los bloques dañados.
+
+    Devuelve (bloques que siguen mal, último error de red o None). Un
+    HTTPError no se reintenta: se propaga.
+    """
+    still_bad = set()
+    network_error = None
+
+    with open(dest_path, 'r+b') as out:
+        for first, last in _group_ranges(bad):
+            start = first * chunk_size
+            end = min((last + 1) * chunk_size, total_size) - 1
+            request = urllib.request.Request(url, headers={'Range': f'bytes={start}-{end}'})
+            verifier = _ChunkVerifier(hashes, chunk_size, first_index=first)
+
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    if response.status != 206:
+                        raise IntegrityError("El servidor no admite descargas parciales")
+                    out.seek(start)
+                    reader = job.wrap(response) if job else response
+                    remaining = end - start + 1
+                    while remaining > 0:
+                        block = reader.read(min(DOWNLOAD_CHUNK, remaining))
+                        if not block:
+                            break
+                        out.write(block)
+                        verifier.feed(block, total_size)
+                        remaining -= len(block)
+            except urllib.error.HTTPError:
+                raise
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                network_error = e
+
+            still_bad.update(verifier.bad)
+            still_bad.update(range(verifier.index, last + 1))
+
+    return still_bad, network_error
@@ -0,0 +1,122 @@
+import hashlib
+
+# ============================================
+# FIRMAS ED25519 (RFC 8032)
+# ============================================
+# Implementación de referencia en Python puro: el launcher no depende de
+# `cryptography`. Verificar la firma de un manifiesto tarda unos pocos
+# milisegundos, y sólo se hace una vez por descarga.
+#
+# El launcher sólo lleva la clave pública: quien tenga el código no puede
+# firmar manifiestos (a diferencia de una clave HMAC compartida).
+
+_P = 2 ** 255 - 19
+_Q = 2 ** 252 + 27742317777372353535851937790883648493
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+_SQRT_M1 = pow(2, (_P - 1) // 4, _P)
+
+
+def _sha512_modq(data):
+    return int.from_bytes(hashlib.sha512(data).digest(), 'little') % _Q
+
+
+def _add(a, b):
+    """Suma de puntos en coordenadas extendidas (X, Y, Z, T)"""
+    pa = (a[1] - a[0]) * (b[1] - b[0]) % _P
+    pb = (a[1] + a[0]) * (b[1] + b[0]) % _P
+    pc = 2 * a[3] * b[3] * _D % _P
+    pd = 2 * a[2] * b[2] % _P
+    e, f, g, h = pb - pa, pd - pc, pd + pc, pb + pa
+    return (e * f % _P, g * h % _P, f * g % _P, e * h % _P)
+
+
+def _mul(scalar, point):
+    result = (0, 1, 1, 0)
+    while scalar > 0:
+        if scalar & 1:
+            result = _add(result, point)
+        point = _add(point, point)
+        scalar >>= 1
+    return result
+
+
+def _equal(a, b):
+    return (a[0] * b[2] - b[0] * a[2]) % _P == 0 and (a[1] * b[2] - b[1] * a[2]) % _P == 0
+
+
+def _recover_x(y, sign):
+    if y >= _P:
+        return None
+    x2 = (y * y - 1) * pow(_D * y * y + 1, _P - 2, _P) % _P
+    if x2 == 0:
+        return None if sign else 0
+    x = pow(x2, (_P + 3) // 8, _P)
+    if (x * x - x2) % _P:
+        x = x * _SQRT_M1 % _P
+    if (x * x - x2) % _P:
+        return None
+    if (x & 1) != sign:
+        x = _P - x
+    return x
+
+
+def _compress(point):
+    z_inv = pow(point[2], _P - 2, _P)
+    x, y = point[0] * z_inv % _P, point[1] * z_inv % _P
+    return (y | ((x & 1) << 255)).to_bytes(32, 'little')
+
+
+def _decompress(data):
+    if len(data) != 32:
+        return None
+    y = int.from_bytes(data, 'little')
+    sign = y >> 255
+    y &= (1 << 255) - 1
+    x = _recover_x(y, sign)
+    if x is None:
+        return None
+    return (x, y, 1, x * y % _P)
+
+
+_G_Y = 4 * pow(5, _P - 2, _P) % _P
+_G_X = _recover_x(_G_Y, 0)
+_G = (_G_X, _G_Y, 1, _G_X * _G_Y % _P)
+
+
+def _expand(seed):
+    digest = hashlib.sha512(seed).digest()
+    scalar = int.from_bytes(digest[:32], 'little')
+    scalar &= (1 << 254) - 8
+    scalar |= 1 << 254
+    return scalar, digest[32:]
+
+
+def public_key(seed):
+    """Clave pública (32 bytes) de la clave privada `seed` (32 bytes)"""
+    scalar, _ = _expand(seed)
+    return _compress(_mul(scalar, _G))
+
+
+def sign(seed, message):
+    """Firma de 64 bytes de `message` con la clave privada `seed`"""
+    scalar, prefix = _expand(seed)
+    public = _compress(_mul(scalar, _G))
+    r = _sha512_modq(prefix + message)
+    encoded_r = _compress(_mul(r, _G))
+    h = _sha512_modq(encoded_r + public + message)
+    return encoded_r + ((r + h * scalar) % _Q).to_bytes(32, 'little')
+
+
+def verify(public, message, signature):
+    """True si `signature` es una firma válida de `message` para la clave pública `public`"""
+    if len(public) != 32 or len(signature) != 64:
+        return False
+    point_a = _decompress(public)
+    point_r = _decompress(signature[:32])
+    if point_a is None or point_r is None:
+        return False
+    s = int.from_bytes(signature[32:], 'little')
+    if s >= _Q:
+        return False
+    h = _sha512_modq(signature[:32] + public + message)
+    return _equal(_mul(s, _G), _add(point_r, _mul(h, point_a)))
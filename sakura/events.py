@@ -0,0 +1,33 @@
+import threading
+
+# ============================================
+# EVENTOS SIN QT
+# ============================================
+
+
+class EventEmitter:
+    """Interfaz mínima de eventos con callbacks (sustituye a las pyqtSignal en el núcleo)"""
+
+    def __init__(self):
+        self._listeners = {}
+        self._listeners_lock = threading.Lock()
+
+    def on(self, event, callback):
+        """Registra `callback` para `event`; se llama en el hilo que emite"""
+        with self._listeners_lock:
+            self._listeners.setdefault(event, []).append(callback)
+        return callback
+
+    def off(self, event, callback):
+        """Quita un callback registrado con on()"""
+        with self._listeners_lock:
+            callbacks = self._listeners.get(event, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def emit(self, event, *args):
+        """Llama a todos los callbacks de `event` con `args`"""
+        with self._listeners_lock:
+            callbacks = list(self._listeners.get(event, ()))
+        for callback in callbacks:
+            callback(*args)
@@ -0,0 +1,111 @@
+import glob
+import json
+import os
+import subprocess
+import time
+
+from sakura import metrics
+from sakura.config import APP_DIR
+from sakura.java import find_java
+
+# ============================================
+# LANZAMIENTO DEL CLIENTE DE MINECRAFT
+# ============================================
+
+INSTANCE_FILE = "instance.json"
+
+LAUNCH_SECONDS = metrics.histogram(
+    "sakura_game_launch_seconds", "Preparación y arranque del proceso del juego (incluye buscar Java)")
+
+DEFAULT_INSTANCE = {
+    'name': "Sakura Blossom",
+    'minecraft_version': "1.20.1",
+    'java_version': 17,
+    'game_dir': "instance",
+    'java': "auto",  # "auto" = la mejor instalación de java_version encontrada
+    'jvm_args': ["-Xmx4G"],
+    'main_class': "net.fabricmc.loader.impl.launch.knot.KnotClient",
+    # Rutas (o patrones glob) relativas a game_dir
+    'classpath': [],
+    'game_args': [
+        "--username", "${username}",
+        "--version", "${minecraft_version}",
+        "--gameDir", "${game_dir}",
+        "--assetsDir", "${game_dir}/assets",
+    ],
+}
+
+
+class LaunchError(Exception):
+    """No se pudo preparar o iniciar el cliente"""
+
+
+def load_instance(base_dir=APP_DIR):
+    """Lee instance.json (si existe) sobre los valores por defecto"""
+    instance = dict(DEFAULT_INSTANCE)
+    path = os.path.join(base_dir, INSTANCE_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                instance.update(json.load(f))
+        except (OSError, ValueError) as e:
+            raise LaunchError(f"instance.json no es válido: {e}")
+
+    instance['game_dir'] = os.path.join(base_dir, instance['game_dir'])
+    return instance
+
+
+def _expand(value, variables):
+    for key, replacement in variables.items():
+        value = value.replace("${" + key + "}", str(replacement))
+    return value
+
+
+def build_command(instance, username):
+    """Construye la línea de comandos de Java para la instancia"""
+    game_dir = instance['game_dir']
+    classpath = []
+    for entry in instance.get('classpath', []):
+        pattern = os.path.join(game_dir, entry)
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        classpath.extend(matches)
+
+    if not classpath:
+        raise LaunchError("La instancia no está instalada (instance.json no define el classpath)")
+
+    variables = {
+        'username': username,
+        'game_dir': game_dir,
+        'minecraft_version': instance['minecraft_version'],
+    }
+    return (
+        [instance['java']]
+        + [_expand(arg, variables) for arg in instance.get('jvm_args', [])]
+        + ["-cp", os.pathsep.join(classpath), instance['main_class']]
+        + [_expand(arg, variables) for arg in instance.get('game_args', [])]
+    )
+
+
+def launch_game(username, base_dir=APP_DIR, instance=None, **popen_kwargs):
+    """Inicia el cliente y devuelve el subprocess.Popen"""
+    if not username:
+        raise LaunchError("Falta el nombre de usuario")
+
+    started = time.perf_counter()
+
+    instance = instance or load_instance(base_dir)
+    if instance.get('java', 'auto') == 'auto':
+        runtime = find_java(instance['java_version'], base_dir)
+        if runtime is None:
+            raise LaunchError(f"No se encontró Java {instance['java_version']} o superior. "
+                              "Instálalo o indica su ruta en instance.json (\"java\")")
+        instance = dict(instance, java=runtime.path)
+    command = build_command(instance, username)
+    os.makedirs(instance['game_dir'], exist_ok=True)
+
+    try:
+        process = subprocess.Popen(command, cwd=instance['game_dir'], **popen_kwargs)
+    except OSError as e:
+        raise LaunchError(f"No se pudo ejecutar {command[0]}: {e}")
+    LAUNCH_SECONDS.observe(time.perf_counter() - started)
+    return process
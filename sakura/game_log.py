@@ -0,0 +1,136 @@
+import collections
+import io
+import re
+import threading
+import time
+
+# ============================================
+# LECTURA DEL LOG DEL JUEGO
+# ============================================
+# Un hilo lee la salida del cliente, separa hora, hilo y nivel de cada línea
+# y entrega lotes cada ~100 ms: la GUI recibe unas pocas señales por segundo
+# aunque el juego escriba miles de líneas. Las líneas se guardan en un búfer
+# circular de tamaño fijo, así que la memoria no crece en sesiones largas.
+
+LEVELS = ('TRACE', 'DEBUG', 'INFO', 'WARN', 'ERROR', 'FATAL')
+LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+LEVEL_ALIASES = {'WARNING': 'WARN', 'SEVERE': 'ERROR', 'FINE': 'DEBUG'}
+
+DEFAULT_CAPACITY = 20000
+MAX_LINE_LENGTH = 2000
+BATCH_INTERVAL = 0.1  # Segundos entre lotes enviados a la GUI
+
+# [12:34:56] [Render thread/INFO]: mensaje
+# [12Jan2024 12:34:56.789] [main/INFO] [net.minecraft.client.Minecraft/]: mensaje
+LINE_PATTERN = re.compile(
+    r"^\[(?P<time>[^\]]*?(\d{2}:\d{2}:\d{2})[^\]]*)\]\s*"
+    r"\[(?P<thread>[^\]/]*)/(?P<level>[A-Z]+)\]"
+    r"(?:\s*\[[^\]]*\])?:?\s?(?P<text>.*)$"
+)
+
+LogLine = collections.namedtuple('LogLine', 'time level thread text')
+
+
+def parse_line(line, previous_level='INFO'):
+    """Convierte una línea de log en LogLine.
+
+    Las líneas sin cabecera (trazas de excepciones, salida de Java) heredan el
+    nivel de la anterior para que el filtro no las separe de su error.
+    """
+    line = line.rstrip('\r\n')
+    if len(line) > MAX_LINE_LENGTH:
+        line = line[:MAX_LINE_LENGTH] + "…"
+    match = LINE_PATTERN.match(line)
+    if not match:
+        return LogLine("", previous_level, "", line)
+    level = match.group('level')
+    level = LEVEL_ALIASES.get(level, level)
+    if level not in LEVEL_RANK:
+        level = 'INFO'
+    return LogLine(match.group(2), level, match.group('thread'), match.group('text'))
+
+
+class LogRingBuffer:
+    """Últimas `capacity` líneas del log (las más antiguas se descartan)"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.lines = collections.deque(maxlen=capacity)
+        self.capacity = capacity
+        self.total = 0  # Líneas recibidas desde el inicio (incluidas las descartadas)
+        self.lock = threading.Lock()
+
+    def extend(self, lines):
+        with self.lock:
+            self.lines.extend(lines)
+            self.total += len(lines)
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.lines)
+
+    @property
+    def dropped(self):
+        return self.total - len(self.lines)
+
+
+class LogReader:
+    """Lee `stream` (salida del proceso) en un hilo y entrega lotes de LogLine a `sink`.
+
+    Un segundo hilo agrupa lo leído y llama a `sink` como mucho una vez por
+    `batch_interval`, sea cual sea el ritmo del juego.
+    """
+
+    def __init__(self, stream, sink, buffer=None, batch_interval=BATCH_INTERVAL):
+        if not isinstance(stream, io.TextIOBase):
+            stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+        self.stream = stream
+        self.sink = sink
+        self.buffer = buffer  # Opcional: la GUI guarda las líneas en su propio búfer
+        self.batch_interval = batch_interval
+        self.pending = []
+        self.finished = False
+        self.condition = threading.Condition()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.flusher = threading.Thread(target=self._flush, daemon=True)
+
+    def start(self):
+        self.reader.start()
+        self.flusher.start()
+        return self
+
+    def _read(self):
+        level = 'INFO'
+        try:
+            for raw in self.stream:
+                entry = parse_line(raw, level)
+                level = entry.level
+                with self.condition:
+                    self.pending.append(entry)
+                    if len(self.pending) == 1:
+                        self.condition.notify()
+        except (OSError, ValueError):
+            pass  # Tubería cerrada al terminar el proceso
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify()
+
+    def _flush(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.finished:
+                    self.condition.wait()
+                if not self.pending and self.finished:
+                    return
+            # Dejar que se acumulen más líneas antes de molestar a la GUI
+            time.sleep(self.batch_interval)
+            with self.condition:
+                batch, self.pending = self.pending, []
+            if batch:
+                if self.buffer is not None:
+                    self.buffer.extend(batch)
+                self.sink(batch)
+
+    def join(self, timeout=None):
+        self.reader.join(timeout)
+        self.flusher.join(timeout)
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+
+from sakura.config import APP_DIR
+
+# ============================================
+# CACHÉ EN DISCO DE IMÁGENES YA ESCALADAS
+# ============================================
+# Guarda los píxeles ya escalados (formato crudo, sin compresión) para que un
+# arranque en caliente no tenga que decodificar ni reescalar los PNG. La clave
+# incluye el hash del archivo de origen, así que cuando una actualización
+# reemplaza un asset sus entradas antiguas dejan de usarse y se purgan.
+
+CACHE_DIR = os.path.join("cache", "images")
+INDEX_FILE = "index.json"
+MAGIC = b"SBIMG1\n"
+HEADER = struct.Struct(">IIIIf")  # ancho, alto, bytes por línea, formato QImage, device pixel ratio
+ENTRY_SUFFIX = ".raw"
+
+
+class ImageCache:
+    """Caché de imágenes escaladas indexada por hash de origen, tamaño y device pixel ratio"""
+
+    def __init__(self, base_dir=APP_DIR):
+        self.cache_dir = os.path.join(base_dir, CACHE_DIR)
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        self.lock = threading.Lock()
+        self.sources = None  # ruta (o "paquete:nombre") -> {'size', 'mtime_ns', 'sha256'}
+
+    def _load_index(self):
+        if self.sources is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.sources = json.load(f)
+            except (OSError, ValueError):
+                self.sources = {}
+        return self.sources
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.sources, f)
+        os.replace(tmp_path, self.index_path)
+
+    def source_hash(self, path):
+        """SHA-256 del archivo de origen; sólo se recalcula si cambió su tamaño o fecha"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self.lock:
+            sources = self._load_index()
+            known = sources.get(path)
+            if known and known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns:
+                return known['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        self._remember(path, {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256})
+        return sha256
+
+    def _remember(self, source, entry):
+        with self.lock:
+            sources = self._load_index()
+            old = sources.get(source)
+            if old == entry:
+                return
+            sources[source] = entry
+            if old and old['sha256'] != entry['sha256']:
+                self._purge_hash(old['sha256'])
+            self._save_index()
+
+    def key(self, path, width, height, dpr, mode, sha256=None):
+        """Clave de caché: hash de origen + tamaño destino + device pixel ratio + modo de escalado.
+
+        Con `sha256` (assets de assets.pack, cuyo hash viene en el índice) no se
+        lee el origen; `path` sólo identifica la entrada para poder purgarla.
+        """
+        if sha256:
+            self._remember(path, {'sha256': sha256})
+        else:
+            sha256 = self.source_hash(path)
+        return f"{sha256[:32]}_{width}x{height}@{dpr:g}_{mode}"
+
+    def load(self, key):
+        """Devuelve (ancho, alto, bytes_por_línea, formato, dpr, píxeles) o None"""
+        try:
+            with open(os.path.join(self.cache_dir, key + ENTRY_SUFFIX), 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                width, height, bytes_per_line, image_format, dpr = HEADER.unpack(f.read(HEADER.size))
+                pixels = f.read()
+        except (OSError, struct.error):
+            return None
+        if len(pixels) != bytes_per_line * height:
+            return None
+        return width, height, bytes_per_line, image_format, dpr, pixels
+
+    def store(self, key, width, height, bytes_per_line, image_format, dpr, pixels):
+        """Guarda los píxeles de una imagen ya escalada (escritura atómica)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                f.write(HEADER.pack(width, height, bytes_per_line, image_format, dpr))
+                f.write(pixels)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  ⚠️ No se pudo guardar la imagen en caché: {e}")
+
+    def _purge_hash(self, sha256):
+        prefix = sha256[:32] + "_"
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def invalidate(self, paths=None):
+        """Olvida las entradas de `paths` (o toda la caché); lo usa el actualizador"""
+        with self.lock:
+            sources = self._load_index()
+            if paths is None:
+                targets = list(sources)
+            else:
+                # Un paquete invalida también todas sus entradas ("paquete:nombre")
+                prefixes = tuple(os.path.abspath(p) + ":" for p in paths)
+                targets = [os.path.abspath(p) for p in paths]
+                targets += [source for source in sources if source.startswith(prefixes)]
+            for path in targets:
+                entry = sources.pop(path, None)
+                if entry:
+                    self._purge_hash(entry['sha256'])
+            self._save_index()
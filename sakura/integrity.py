@@ -0,0 +1,79 @@
+import hashlib
+import json
+
+from sakura import ed25519
+
+# ============================================
+# INTEGRIDAD DE MANIFIESTOS Y DESCARGAS
+# ============================================
+
+
+class IntegrityError(Exception):
+    """La descarga o el manifiesto no pasaron la verificación"""
+
+
+def canonical_manifest(manifest):
+    """Serialización estable del manifiesto (sin la firma) usada para firmar"""
+    unsigned = {key: value for key, value in manifest.items() if key != 'signature'}
+    return json.dumps(unsigned, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def sign_manifest(manifest, private_key):
+    """Firma Ed25519 (hex) del manifiesto con la clave privada `private_key` (hex)"""
+    return ed25519.sign(bytes.fromhex(private_key), canonical_manifest(manifest)).hex()
+
+
+def verify_manifest(manifest, public_key):
+    """Comprueba la firma del manifiesto con la clave pública (hex); lanza IntegrityError si no es válida"""
+    signature = manifest.get('signature')
+    if not signature:
+        raise IntegrityError("El manifiesto no está firmado")
+    try:
+        valid = ed25519.verify(bytes.fromhex(public_key), canonical_manifest(manifest), bytes.fromhex(signature))
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise IntegrityError("La firma del manifiesto no es válida")
+
+
+UNSIGNED_WARNING = "⚠️ Firma del manifiesto sin comprobar: no hay clave pública (SAKURA_UPDATE_PUBLIC_KEY)"
+
+
+def check_manifest(manifest, public_key):
+    """Verifica la firma si hay clave pública; devuelve False si no la hay (manifiesto sin comprobar)"""
+    if not public_key:
+        return False
+    verify_manifest(manifest, public_key)
+    return True
+
+
+def check_digest(digest, expected_sha256, received, expected_size=None):
+    """Compara el hash y tamaño calculados durante la descarga con los esperados"""
+    if expected_size is not None and received != expected_size:
+        raise IntegrityError(f"Descarga incompleta: {received} de {expected_size} bytes")
+    if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+        raise IntegrityError("El SHA-256 de la descarga no coincide con el manifiesto")
+
+
+def chunk_root(hashes):
+    """Raíz de la lista Merkle: SHA-256 de la concatenación de los hashes de bloque"""
+    return hashlib.sha256(b"".join(bytes.fromhex(h) for h in hashes)).hexdigest()
+
+
+def build_chunk_list(path, chunk_size):
+    """Calcula la lista de hashes por bloque de un archivo para el manifiesto"""
+    hashes = []
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            hashes.append(hashlib.sha256(block).hexdigest())
+    return {'size': chunk_size, 'sha256': hashes, 'root': chunk_root(hashes)}
+
+
+def verify_chunk_list(chunks, total_size):
+    """Comprueba que la lista de bloques es coherente con su raíz y con el tamaño del archivo"""
+    chunk_size = chunks.get('size') or 0
+    hashes = chunks.get('sha256') or []
+    if chunk_size <= 0 or len(hashes) != -(-total_size // chunk_size):
+        raise IntegrityError("La lista de bloques no corresponde al tamaño del archivo")
+    if chunks.get('root') and chunk_root(hashes) != chunks['root']:
+        raise IntegrityError("La raíz de la lista de bloques no coincide")
@@ -0,0 +1,208 @@
+import collections
+import glob
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from sakura.config import APP_DIR
+from sakura.state import get_store
+
+# ============================================
+# DETECCIÓN DE JAVA
+# ============================================
+# Minecraft 1.20.1 necesita Java 17. Se buscan instalaciones en JAVA_HOME, el
+# PATH y las carpetas habituales de cada sistema (en paralelo, porque listar
+# Program Files o una unidad de red puede tardar) y se ejecuta `java -version`
+# de todos los binarios a la vez. El resultado se guarda en el estado del
+# launcher por ruta + fecha de modificación: en los siguientes inicios sólo se
+# vuelve a probar un binario si cambió.
+
+JAVA_BIN = "java.exe" if sys.platform == "win32" else "java"
+PROBE_TIMEOUT = 10  # Segundos máximos por `java -version`
+MAX_WORKERS = 8
+CACHE_KEY = 'java_runtimes'
+
+# Carpetas que contienen instalaciones (cada coincidencia es un JAVA_HOME)
+if sys.platform == "win32":
+    _program_dirs = [os.environ.get(name) for name in ("ProgramFiles", "ProgramFiles(x86)", "ProgramW6432")]
+    SEARCH_PATTERNS = [
+        os.path.join(base, vendor, "*")
+        for base in filter(None, _program_dirs)
+        for vendor in ("Java", "Eclipse Adoptium", "Eclipse Foundation", "Microsoft",
+                       "Zulu", "BellSoft", "Amazon Corretto", "Semeru")
+    ] + [
+        os.path.join(os.environ.get("APPDATA", ""), ".minecraft", "runtime", "*", "*", "*"),
+    ]
+elif sys.platform == "darwin":
+    SEARCH_PATTERNS = [
+        "/Library/Java/JavaVirtualMachines/*/Contents/Home",
+        os.path.expanduser("~/Library/Java/JavaVirtualMachines/*/Contents/Home"),
+        os.path.expanduser("~/Library/Application Support/minecraft/runtime/*/*/*/jre.bundle/Contents/Home"),
+    ]
+else:
+    SEARCH_PATTERNS = [
+        "/usr/lib/jvm/*",
+        "/usr/lib64/jvm/*",
+        "/usr/java/*",
+        "/opt/java/*",
+        "/opt/jdk*",
+        os.path.expanduser("~/.sdkman/candidates/java/*"),
+        os.path.expanduser("~/.jdks/*"),
+        os.path.expanduser("~/.minecraft/runtime/*/*/*"),
+    ]
+
+# openjdk version "17.0.8" 2023-07-18 / java version "1.8.0_381"
+VERSION_PATTERN = re.compile(r'version "(?P<version>[^"]+)"')
+
+JavaRuntime = collections.namedtuple('JavaRuntime', 'path version major is_64bit vendor')
+
+
+def parse_version_output(output):
+    """(versión, major, 64 bits, fabricante) a partir de la salida de `java -version`"""
+    match = VERSION_PATTERN.search(output)
+    if not match:
+        return None
+    version = match.group('version')
+    numbers = [int(part) for part in re.findall(r"\d+", version)]
+    if not numbers:
+        return None
+    # Java 8 y anteriores se anuncian como 1.x
+    major = numbers[1] if numbers[0] == 1 and len(numbers) > 1 else numbers[0]
+    lines = output.strip().splitlines()
+    vendor = lines[1].strip() if len(lines) > 1 else ""
+    return version, major, "64-Bit" in output, vendor
+
+
+def _version_key(version):
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def _java_in(home):
+    return os.path.join(home, "bin", JAVA_BIN)
+
+
+def _expand_pattern(pattern):
+    return [_java_in(home) for home in glob.glob(pattern)]
+
+
+def candidate_binaries(patterns=None):
+    """Rutas reales de los binarios de Java encontrados (sin duplicados)"""
+    patterns = SEARCH_PATTERNS if patterns is None else patterns
+    candidates = []
+
+    java_home = os.environ.get("JAVA_HOME")
+    if java_home:
+        candidates.append(_java_in(java_home))
+
+    # Todas las apariciones en el PATH, no sólo la primera
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if directory:
+            candidates.append(os.path.join(directory, JAVA_BIN))
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for binaries in pool.map(_expand_pattern, patterns):
+            candidates.extend(binaries)
+
+    unique = []
+    seen = set()
+    for path in candidates:
+        if not (os.path.isfile(path) and os.access(path, os.X_OK)):
+            continue
+        # /usr/bin/java suele ser un enlace a una instalación de /usr/lib/jvm
+        real_path = os.path.realpath(path)
+        if real_path not in seen:
+            seen.add(real_path)
+            unique.append(real_path)
+    return unique
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def _probe(path):
+    """(JavaRuntime o None, si el resultado es definitivo y se puede guardar en caché)"""
+    creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    try:
+        result = subprocess.run([path, "-version"], capture_output=True, text=True,
+                                errors='replace', timeout=PROBE_TIMEOUT,
+                                creationflags=creationflags)
+    except (OSError, subprocess.SubprocessError):
+        # Timeout (equipo cargado, antivirus, disco frío) o error al ejecutar: se reintenta la próxima vez
+        return None, False
+    # `java -version` escribe en stderr
+    parsed = parse_version_output(result.stderr or result.stdout)
+    if parsed is None:
+        return None, True  # Respondió, pero no es una JVM
+    return JavaRuntime(path, *parsed), True
+
+
+def probe(path):
+    """Ejecuta `java -version` y devuelve un JavaRuntime (None si no responde)"""
+    return _probe(path)[0]
+
+
+def find_runtimes(base_dir=APP_DIR, patterns=None, use_cache=True):
+    """Instalaciones de Java disponibles, probando sólo los binarios nuevos o modificados"""
+    store = get_store(base_dir)
+    cache = (store.get(CACHE_KEY) or {}) if use_cache else {}
+
+    runtimes = []
+    to_probe = []
+    stats = {}
+    for path in candidate_binaries(patterns):
+        try:
+            stats[path] = _stat_key(path)
+        except OSError:
+            continue
+        entry = cache.get(path)
+        if entry and (entry['mtime'], entry['size']) == stats[path]:
+            if entry.get('version'):
+                runtimes.append(JavaRuntime(path, entry['version'], entry['major'],
+                                            entry['is_64bit'], entry['vendor']))
+        else:
+            to_probe.append(path)
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            probed = list(pool.map(_probe, to_probe))
+        for path, (runtime, definitive) in zip(to_probe, probed):
+            if not definitive:
+                cache.pop(path, None)
+                continue
+            mtime, size = stats[path]
+            entry = {'mtime': mtime, 'size': size}
+            if runtime is not None:
+                runtimes.append(runtime)
+                entry.update(version=runtime.version, major=runtime.major,
+                             is_64bit=runtime.is_64bit, vendor=runtime.vendor)
+            # Los binarios que no son una JVM también se recuerdan para no volver a probarlos
+            cache[path] = entry
+
+    # Sólo se conservan los binarios que siguen existiendo
+    fresh_cache = {path: entry for path, entry in cache.items() if path in stats}
+    if fresh_cache != (store.get(CACHE_KEY) or {}):
+        store.set(CACHE_KEY, fresh_cache)
+    return runtimes
+
+
+def select_runtime(runtimes, required_major):
+    """La mejor instalación para `required_major`: la misma versión mayor antes que
+    una más nueva, 64 bits antes que 32 y, a igualdad, la actualización más reciente"""
+    compatible = [runtime for runtime in runtimes if runtime.major >= required_major]
+    if not compatible:
+        return None
+    return min(compatible, key=lambda runtime: (
+        runtime.major != required_major,
+        not runtime.is_64bit,
+        runtime.major,
+        tuple(-part for part in _version_key(runtime.version)),
+    ))
+
+
+def find_java(required_major, base_dir=APP_DIR, patterns=None):
+    """JavaRuntime adecuado para la instancia (None si no hay ninguno)"""
+    return select_runtime(find_runtimes(base_dir, patterns), required_major)
@@ -0,0 +1,687 @@
+import hashlib
+import http.client
+import http.server
+import json
+import mimetypes
+import os
+import re
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from sakura import metrics
+from sakura.config import (APP_DIR, INSTANCE_MANIFEST, INSTANCE_SERVER, LAN_CACHE_URL, UPDATE_PUBLIC_KEY,
+                           UPDATE_SERVER, VERSION, VERSION_FILE)
+from sakura.events import EventEmitter
+from sakura.integrity import UNSIGNED_WARNING, IntegrityError, check_manifest
+from sakura.state import get_store
+
+# ============================================
+# CACHÉ DE ACTUALIZACIONES EN LA RED LOCAL
+# ============================================
+# En un local con decenas de equipos, uno arranca con --serve-cache y hace de
+# espejo: los demás le piden primero a él y sólo él sale a internet.
+#
+# - GET /fetch?url=U&sha256=H: archivo direccionado por contenido (zip de la
+#   actualización, archivos de la instancia). Se descarga una única vez por
+#   hash aunque lo pidan muchos equipos a la vez: el primero abre la descarga
+#   y el resto recibe los bytes según van llegando. Se verifica H antes de
+#   guardarlo; si no coincide, se corta la conexión y el cliente recurre a
+#   internet.
+# - GET /fetch?url=U&immutable=1: archivo que no cambia para esa URL (parches,
+#   que van en carpetas por versión); se guarda por URL.
+# - GET /fetch?url=U: manifiestos. Se guardan MANIFEST_TTL segundos y, si
+#   internet no responde, se sirve la última copia (el cliente comprueba la firma).
+# - GET /status: estadísticas en JSON; /metrics y /metrics.json, las del
+#   proceso para el agente de la flota (sakura.metrics).
+#
+# Sólo se sirven URLs que empiezan por una de las permitidas (por defecto
+# UPDATE_SERVER) o a las que apuntan sus manifiestos (download_url, carpeta de
+# parches, archivos de la instancia; firmados si hay UPDATE_PUBLIC_KEY): no es
+# un proxy abierto.
+#
+# Los launchers usan el espejo configurado (--lan-cache URL, SAKURA_LAN_CACHE
+# o 'lan_cache_url' en el estado). Con "auto" lo buscan por broadcast UDP en
+# DISCOVERY_PORT, en segundo plano: cualquier equipo de la red puede responder,
+# así que a un espejo descubierto sólo se le piden archivos con SHA-256 de un
+# manifiesto descargado directamente; los manifiestos y los parches, sólo a
+# uno configurado a mano. Si el espejo falla, se descarga de internet y no se
+# vuelve a probar hasta pasados RETRY_AFTER segundos.
+
+CACHE_PORT = 8733
+DISCOVERY_PORT = 8734
+DISCOVERY_MAGIC = b"SAKURA-CACHE?"
+DISCOVERY_TIMEOUT = 0.5
+MANIFEST_TTL = 60  # Segundos que se reutiliza un manifiesto sin volver a pedirlo
+RETRY_AFTER = 300  # Segundos sin usar un espejo que falló (o sin volver a buscar uno)
+UPSTREAM_TIMEOUT = 30
+CACHE_DIR = "lan_cache"
+CACHE_MAX_BYTES = 20 * 1024 ** 3  # Se borran los archivos menos usados al pasar de aquí
+BLOCK_SIZE = 64 * 1024
+
+_SHA256 = re.compile(r"[0-9a-f]{64}$")
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+# ============================================
+# SERVIDOR
+# ============================================
+
+class _Fill:
+    """Descarga única de un archivo al caché; los lectores siguen el archivo mientras crece"""
+
+    def __init__(self, url, sha256, path):
+        self.url = url
+        self.sha256 = sha256
+        self.path = path + ".part"  # Pasa a `final_path` al verificarse
+        self.final_path = path
+        self.condition = threading.Condition()
+        self.size = None  # Content-Length de internet (None = desconocido)
+        self.started = False  # Ya hay respuesta de internet (o error)
+        self.written = 0
+        self.done = False
+        self.error = None
+
+    def run(self, on_bytes):
+        digest = hashlib.sha256()
+        try:
+            os.makedirs(os.path.dirname(self.final_path), exist_ok=True)
+            with urllib.request.urlopen(self.url, timeout=UPSTREAM_TIMEOUT) as response, \
+                    open(self.path, 'wb') as out:
+                with self.condition:
+                    length = response.headers.get('Content-Length')
+                    self.size = int(length) if length else None
+                    self.started = True
+                    self.condition.notify_all()
+                for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+                    out.write(block)
+                    out.flush()  # Los lectores abren el archivo por su cuenta
+                    digest.update(block)
+                    on_bytes(len(block))
+                    with self.condition:
+                        self.written += len(block)
+                        self.condition.notify_all()
+            if digest.hexdigest() != self.sha256:
+                raise IntegrityError(f"SHA-256 incorrecto para {self.url}")
+            with self.condition:
+                # Dentro del candado: ningún lector tiene el archivo abierto (Windows no deja renombrarlo)
+                os.replace(self.path, self.final_path)
+                self.path = self.final_path
+        except Exception as e:
+            with self.condition:
+                self.error = e
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        finally:
+            with self.condition:
+                self.started = True
+                self.done = True
+                self.condition.notify_all()
+
+    def wait_started(self):
+        with self.condition:
+            while not self.started:
+                self.condition.wait()
+            return self.error, self.size
+
+    def wait_done(self):
+        with self.condition:
+            while not self.done:
+                self.condition.wait()
+            return self.error
+
+    def read_from(self, position):
+        """Siguiente bloque a partir de `position`; b"" al terminar. Lanza el error de la descarga"""
+        with self.condition:
+            while self.written <= position and not self.done:
+                self.condition.wait()
+            if self.error:
+                raise self.error
+            if self.written <= position:
+                return b""
+            with open(self.path, 'rb') as f:
+                f.seek(position)
+                return f.read(min(BLOCK_SIZE, self.written - position))
+
+
+class CacheRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Atiende a los launchers de la red local (self.server.cache es el CacheServer)"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        cache = self.server.cache
+        parsed = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        try:
+            if parsed.path == "/status":
+                self._send_bytes(json.dumps(cache.status()).encode('utf-8'), "application/json")
+            elif parsed.path == "/metrics":
+                self._send_bytes(metrics.REGISTRY.render_text().encode('utf-8'),
+                                 "text/plain; version=0.0.4; charset=utf-8")
+            elif parsed.path == "/metrics.json":
+                self._send_bytes(json.dumps(metrics.REGISTRY.as_dict()).encode('utf-8'), "application/json")
+            elif parsed.path == "/fetch" and query.get('url'):
+                self._fetch(cache, query['url'][0], (query.get('sha256') or [""])[0].lower(),
+                            (query.get('immutable') or [""])[0] == "1")
+            else:
+                self.send_error(404)
+        except (ConnectionError, socket.timeout):
+            pass  # El cliente se fue a mitad
+
+    def _fetch(self, cache, url, sha256, immutable):
+        if not cache.is_allowed(url):
+            cache.count('rejected')
+            self.send_error(403, explain="URL no permitida en este caché")
+            return
+        if sha256:
+            if not _SHA256.match(sha256):
+                self.send_error(400, explain="sha256 no válido")
+                return
+            self._fetch_blob(cache, url, sha256)
+            return
+        try:
+            body = cache.get_document(url, immutable)
+        except urllib.error.HTTPError as e:
+            self.send_error(e.code)
+            return
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            self.send_error(502, explain=f"Sin conexión con el servidor de origen: {e}")
+            return
+        self._send_bytes(body, mimetypes.guess_type(url)[0] or "application/octet-stream")
+
+    def _fetch_blob(self, cache, url, sha256):
+        path, fill = cache.get_blob(url, sha256)
+        if fill is None:
+            self._send_file(path)
+            return
+
+        error, size = fill.wait_started()
+        if error is None and self.headers.get('Range'):
+            # Una petición parcial espera a que el archivo esté completo
+            error = fill.wait_done()
+            if error is None:
+                self._send_file(path)
+                return
+        if error is not None:
+            code = error.code if isinstance(error, urllib.error.HTTPError) else 502
+            self.send_error(code, explain=f"No se pudo descargar del origen: {error}")
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', "application/octet-stream")
+        if size is not None:
+            self.send_header('Content-Length', str(size))
+        self.end_headers()
+        position = 0
+        try:
+            while True:
+                block = fill.read_from(position)
+                if not block:
+                    break
+                self.wfile.write(block)
+                position += len(block)
+                cache.count('served_bytes', len(block))
+        except Exception:
+            # Hash incorrecto o corte con el origen: la conexión se cierra a medias
+            # y el cliente, al no cuadrarle el tamaño o el hash, recurre a internet
+            self.close_connection = True
+
+    def _send_file(self, path):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start, end = self._requested_range(size)
+            if start is None:
+                return
+            f.seek(start)
+            self._send_headers(start, end, size, "application/octet-stream")
+            remaining = end - start + 1
+            while remaining > 0:
+                block = f.read(min(BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                self.wfile.write(block)
+                remaining -= len(block)
+                self.server.cache.count('served_bytes', len(block))
+
+    def _send_bytes(self, body, content_type):
+        start, end = self._requested_range(len(body))
+        if start is None:
+            return
+        self._send_headers(start, end, len(body), content_type)
+        self.wfile.write(body[start:end + 1])
+        self.server.cache.count('served_bytes', end - start + 1)
+
+    def _requested_range(self, size):
+        match = _RANGE.match(self.headers.get('Range', ''))
+        if not match:
+            return 0, size - 1
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if start > end:
+            self.send_error(416, explain="Rango no satisfacible")
+            return None, None
+        return start, end
+
+    def _send_headers(self, start, end, size, content_type):
+        partial = bool(self.headers.get('Range'))
+        self.send_response(206 if partial else 200)
+        self.send_header('Content-Type', content_type)
+        if partial:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+
+
+class CacheServer(EventEmitter):
+    """Espejo HTTP de la red local (modo --serve-cache). Eventos: 'status'(texto)"""
+
+    def __init__(self, cache_dir=None, upstreams=(UPDATE_SERVER,), host="0.0.0.0", port=CACHE_PORT,
+                 discovery_port=DISCOVERY_PORT, max_bytes=CACHE_MAX_BYTES, manifests=None):
+        super().__init__()
+        self.cache_dir = cache_dir or os.path.join(APP_DIR, CACHE_DIR)
+        self.upstreams = tuple(upstreams)
+        # Manifiestos cuyas URLs de descarga también se permiten (p. ej. el zip en otro host)
+        if manifests is None:
+            manifests = (urllib.parse.urljoin(UPDATE_SERVER, VERSION_FILE),
+                         urllib.parse.urljoin(INSTANCE_SERVER, INSTANCE_MANIFEST))
+        self.manifests = tuple(manifests)
+        self.trusted = frozenset()
+        self.trusted_at = None
+        self.trusted_lock = threading.Lock()
+        self.host = host
+        self.port = port
+        self.discovery_port = discovery_port
+        self.max_bytes = max_bytes
+        self.httpd = None
+        self.discovery_socket = None
+        self.threads = []
+        self.lock = threading.Lock()
+        self.fills = {}  # sha256 -> _Fill en curso
+        self.document_locks = {}  # clave -> Lock (una sola petición al origen por URL)
+        self.stats = {
+            'requests': 0, 'hits': 0, 'misses': 0, 'stale': 0, 'rejected': 0,
+            'upstream_bytes': 0, 'served_bytes': 0, 'errors': 0,
+        }
+
+    @property
+    def url(self):
+        host = "127.0.0.1" if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.httpd.server_port}/"
+
+    def start(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.httpd = http.server.ThreadingHTTPServer((self.host, self.port), CacheRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.cache = self
+        self._start_thread(self.httpd.serve_forever)
+        if self.discovery_port is not None:
+            self.discovery_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.discovery_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.discovery_socket.bind((self.host, self.discovery_port))
+            self._start_thread(self._answer_discovery)
+        metrics.register_collector(self.collect_metrics)
+        return self
+
+    def stop(self):
+        metrics.REGISTRY.unregister_collector(self.collect_metrics)
+        if self.discovery_socket:
+            self.discovery_socket.close()
+            self.discovery_socket = None
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _start_thread(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def _answer_discovery(self):
+        reply = json.dumps({'service': "sakura-cache", 'port': self.httpd.server_port,
+                            'version': VERSION}).encode('utf-8')
+        while self.discovery_socket:
+            try:
+                data, address = self.discovery_socket.recvfrom(256)
+            except OSError:
+                return  # Socket cerrado en stop()
+            if data == DISCOVERY_MAGIC:
+                try:
+                    self.discovery_socket.sendto(reply, address)
+                except OSError:
+                    pass
+
+    def is_allowed(self, url):
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ("http", "https") or ".." in parsed.path.split("/"):
+            return False
+        if any(url.startswith(prefix) for prefix in self.upstreams):
+            return True
+        # URL exacta del manifiesto o dentro de una carpeta que termina en "/"
+        return any(url == allowed or (allowed.endswith("/") and url.startswith(allowed))
+                   for allowed in self._trusted_urls())
+
+    def _trusted_urls(self):
+        """URLs a las que apuntan los manifiestos (firmados si hay clave; se recalculan cada MANIFEST_TTL)"""
+        with self.trusted_lock:
+            if self.trusted_at is not None and time.monotonic() - self.trusted_at < MANIFEST_TTL:
+                return self.trusted
+            urls = set()
+            for manifest_url in self.manifests:
+                try:
+                    manifest = json.loads(self.get_document(manifest_url).decode('utf-8'))
+                    if not check_manifest(manifest, UPDATE_PUBLIC_KEY):
+                        self.emit('status', f"{UNSIGNED_WARNING}: {manifest_url}")
+                except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError,
+                        IntegrityError) as e:
+                    self.emit('status', f"⚠️ No se pudo leer {manifest_url}: {e}")
+                    continue
+                urls.update(_manifest_urls(manifest_url, manifest))
+            self.trusted = frozenset(urls)
+            self.trusted_at = time.monotonic()
+            return self.trusted
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def collect_metrics(self):
+        """Colector para sakura.metrics"""
+        stats = self.status()
+        rows = [
+            ("sakura_lan_cache_requests_total", "Peticiones al caché por resultado", {'result': result},
+             stats[key], 'counter')
+            for result, key in (('hit', 'hits'), ('miss', 'misses'), ('stale', 'stale'), ('rejected', 'rejected'),
+                                ('error', 'errors'))
+        ]
+        rows.append(("sakura_lan_cache_upstream_bytes_total", "Bytes descargados de internet", {},
+                     stats['upstream_bytes'], 'counter'))
+        rows.append(("sakura_lan_cache_served_bytes_total", "Bytes servidos a la red local", {},
+                     stats['served_bytes'], 'counter'))
+        rows.append(("sakura_lan_cache_downloads_active", "Descargas de internet en curso", {},
+                     stats['downloading']))
+        return rows
+
+    def status(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['downloading'] = len(self.fills)
+        stats['upstreams'] = list(self.upstreams)
+        return stats
+
+    # ---- Archivos direccionados por contenido ----
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.cache_dir, "blobs", sha256[:2], sha256)
+
+    def get_blob(self, url, sha256):
+        """(ruta, None) si ya está en el caché; si no, (ruta, _Fill) de la descarga compartida"""
+        path = self._blob_path(sha256)
+        with self.lock:
+            self.stats['requests'] += 1
+            fill = self.fills.get(sha256)
+            if fill is None and os.path.exists(path):
+                self.stats['hits'] += 1
+                _touch(path)
+                return path, None
+            if fill is None:
+                self.stats['misses'] += 1
+                fill = self.fills[sha256] = _Fill(url, sha256, path)
+                threading.Thread(target=self._run_fill, args=(fill,), daemon=True).start()
+            else:
+                self.stats['hits'] += 1  # Se comparte la descarga en curso
+        return path, fill
+
+    def _run_fill(self, fill):
+        self.emit('status', f"🌐 Descargando de internet: {fill.url}")
+        fill.run(lambda amount: self.count('upstream_bytes', amount))
+        with self.lock:
+            del self.fills[fill.sha256]
+            if fill.error:
+                self.stats['errors'] += 1
+        if fill.error:
+            self.emit('status', f"❌ {fill.url}: {fill.error}")
+        else:
+            self.emit('status', f"💾 En caché: {os.path.basename(fill.url)} ({fill.written // 1024} KB)")
+            self.prune()
+
+    def prune(self):
+        """Borra los archivos usados hace más tiempo hasta quedar por debajo de max_bytes"""
+        entries = []
+        for folder, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".part"):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    # ---- Manifiestos y archivos por URL ----
+
+    def get_document(self, url, immutable=False):
+        """Contenido de `url` desde el caché (TTL para manifiestos) o desde el origen"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        path = os.path.join(self.cache_dir, "urls", key)
+        with self.lock:
+            self.stats['requests'] += 1
+            lock = self.document_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            cached = _read_fresh(path, None if immutable else MANIFEST_TTL)
+            if cached is not None:
+                self.count('hits')
+                return cached
+
+            self.count('misses')
+            try:
+                with urllib.request.urlopen(url, timeout=UPSTREAM_TIMEOUT) as response:
+                    body = response.read()
+            except urllib.error.HTTPError:
+                self.count('errors')
+                raise
+            except (urllib.error.URLError, http.client.HTTPException, OSError):
+                self.count('errors')
+                stale = _read_fresh(path, None)
+                if stale is None:
+                    raise
+                self.count('stale')
+                self.emit('status', f"⚠️ Sin conexión con el origen: se sirve la copia guardada de {url}")
+                return stale
+
+            self.count('upstream_bytes', len(body))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.part"
+            with open(temp_path, 'wb') as f:
+                f.write(body)
+            try:
+                os.replace(temp_path, path)
+            except OSError:
+                os.remove(temp_path)  # Otro hilo lo está leyendo (Windows): se guarda la próxima vez
+            return body
+
+
+def _manifest_urls(manifest_url, manifest):
+    """URLs de descarga de un manifiesto del launcher o de la instancia"""
+    def folder(url):
+        return urllib.parse.urljoin(urllib.parse.urljoin(manifest_url, url), ".")
+
+    urls = []
+    if manifest.get('download_url'):
+        urls.append(urllib.parse.urljoin(manifest_url, manifest['download_url']))
+    patches = manifest.get('patches') or {}
+    if patches.get('base_url'):
+        urls.append(folder(patches['base_url']))
+    if isinstance(manifest.get('files'), dict):
+        urls.append(folder(manifest.get('base_url', "files/")))
+        urls.extend(urllib.parse.urljoin(manifest_url, entry['url'])
+                    for entry in manifest['files'].values() if isinstance(entry, dict) and entry.get('url'))
+    return urls
+
+
+def _read_fresh(path, ttl):
+    """Contenido de `path` si existe y tiene menos de `ttl` segundos (None = sin caducidad)"""
+    try:
+        if ttl is not None and time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _touch(path):
+    try:
+        os.utime(path)  # La fecha de modificación hace de "último uso" para prune()
+    except OSError:
+        pass
+
+
+# ============================================
+# CLIENTE
+# ============================================
+
+_override = None  # URL fijada con configure() (--lan-cache); "off" lo desactiva
+_found = None  # URL del espejo encontrado por broadcast
+_checked_at = None  # Cuándo se buscó por última vez
+_discovering = False  # Hay una búsqueda en segundo plano en curso
+_down_until = 0.0
+_client_lock = threading.Lock()
+
+
+def configure(url):
+    """Fija el espejo a usar ("off" = ninguno, "auto" = broadcast, None = configuración)"""
+    global _override, _found, _checked_at, _down_until
+    with _client_lock:
+        _override = url
+        _found = None
+        _checked_at = None
+        _down_until = 0.0
+
+
+def discover(port=DISCOVERY_PORT, timeout=DISCOVERY_TIMEOUT):
+    """Pregunta por broadcast UDP (y en este mismo equipo) si hay un caché; devuelve su URL o None"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.settimeout(timeout)
+        for address in ("<broadcast>", "127.0.0.1"):
+            try:
+                sock.sendto(DISCOVERY_MAGIC, (address, port))
+            except OSError:
+                pass  # Sin red o broadcast no permitido
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            sock.settimeout(max(0.01, deadline - time.monotonic()))
+            try:
+                data, (host, _) = sock.recvfrom(512)
+                reply = json.loads(data.decode('utf-8'))
+            except (OSError, ValueError):
+                continue
+            if reply.get('service') == "sakura-cache" and reply.get('port'):
+                return f"http://{host}:{int(reply['port'])}/"
+    finally:
+        sock.close()
+    return None
+
+
+def find_cache(base_dir=APP_DIR, configured_only=False):
+    """URL del espejo de la red local, o None si no hay (o falló hace poco).
+
+    Nunca espera al broadcast: con "auto" devuelve None hasta que la búsqueda
+    en segundo plano encuentre uno. Con `configured_only` no vale un espejo
+    descubierto (cualquier equipo de la red puede haber respondido).
+    """
+    global _checked_at, _discovering
+    with _client_lock:
+        now = time.monotonic()
+        if now < _down_until:
+            return None
+        configured = _override or LAN_CACHE_URL or get_store(base_dir).get('lan_cache_url') or ""
+        if configured in ("", "off"):
+            return None
+        if configured != "auto":
+            return configured.rstrip("/") + "/"
+        if configured_only:
+            return None
+        if _found is None and not _discovering and (_checked_at is None or now - _checked_at > RETRY_AFTER):
+            _checked_at = now
+            _discovering = True
+            threading.Thread(target=_discover_in_background, daemon=True).start()
+        return _found
+
+
+def _discover_in_background():
+    global _found, _discovering
+    url = discover()
+    with _client_lock:
+        _found = url
+        _discovering = False
+
+
+def cached_url(url, sha256=None, immutable=False, base_dir=APP_DIR):
+    """URL equivalente en el espejo de la red local, o None si no hay espejo.
+
+    Sin `sha256` (manifiestos, parches) sólo se usa un espejo configurado a mano.
+    """
+    cache = find_cache(base_dir, configured_only=not sha256)
+    if not cache:
+        return None
+    query = {'url': url}
+    if sha256:
+        query['sha256'] = sha256
+    elif immutable:
+        query['immutable'] = "1"
+    return f"{cache}fetch?{urllib.parse.urlencode(query)}"
+
+
+def report_failure(error=None):
+    """El espejo no respondió: se va directo a internet durante RETRY_AFTER segundos.
+
+    Un error HTTP (403, 404, 502...) es una respuesta del espejo y no cuenta:
+    sólo afecta a ese archivo.
+    """
+    global _down_until, _found, _checked_at
+    if isinstance(error, urllib.error.HTTPError):
+        return
+    with _client_lock:
+        _down_until = time.monotonic() + RETRY_AFTER
+        _found = None
+        _checked_at = None
+
+
+def open_url(url, timeout, immutable=False, base_dir=APP_DIR):
+    """urlopen() que prueba primero el espejo configurado de la red local (manifiestos y parches)"""
+    mirror = cached_url(url, immutable=immutable, base_dir=base_dir)
+    if mirror:
+        try:
+            return urllib.request.urlopen(mirror, timeout=timeout)
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            report_failure(e)
+    return urllib.request.urlopen(url, timeout=timeout)
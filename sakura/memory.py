@@ -0,0 +1,100 @@
+import ctypes
+import os
+import sys
+
+# ============================================
+# USO DE MEMORIA Y PRIORIDAD DEL PROCESO
+# ============================================
+# Sin dependencias externas (psutil): /proc en Linux, la API de Windows con
+# ctypes y getrusage como último recurso.
+
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    _fields_ = [
+        ('cb', ctypes.c_ulong),
+        ('PageFaultCount', ctypes.c_ulong),
+        ('PeakWorkingSetSize', ctypes.c_size_t),
+        ('WorkingSetSize', ctypes.c_size_t),
+        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+        ('PagefileUsage', ctypes.c_size_t),
+        ('PeakPagefileUsage', ctypes.c_size_t),
+    ]
+
+
+def current_rss():
+    """Memoria residente del proceso en bytes (0 si no se puede medir)"""
+    try:
+        if sys.platform == 'win32':
+            counters = _ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return 0
+
+        if os.path.exists('/proc/self/statm'):
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+        import resource
+        # En macOS ru_maxrss viene en bytes (y es el pico, no el valor actual)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (OSError, ValueError, AttributeError, ImportError):
+        return 0
+
+
+def trim_memory():
+    """Devuelve al sistema la memoria ya liberada que el proceso aún retiene"""
+    try:
+        if sys.platform == 'win32':
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.psapi.EmptyWorkingSet(handle)
+        elif sys.platform.startswith('linux'):
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def format_rss(rss=None):
+    """RSS legible para el log de depuración"""
+    rss = current_rss() if rss is None else rss
+    return f"{rss / (1024 * 1024):.1f} MB" if rss else "desconocida"
+
+
+# ============================================
+# PRIORIDAD DEL PROCESO
+# ============================================
+
+BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+NORMAL_PRIORITY_CLASS = 0x0020
+BACKGROUND_NICENESS = 10
+
+_normal_niceness = None
+
+
+def set_background_priority(enabled):
+    """Baja (o restaura) la prioridad de CPU del launcher; True si se pudo.
+
+    En Linux/macOS volver a la prioridad original requiere permisos que un
+    usuario normal no suele tener; en ese caso el launcher sigue con la
+    prioridad baja, lo que no afecta al juego (su proceso ya se creó antes).
+    """
+    global _normal_niceness
+    try:
+        if sys.platform == 'win32':
+            priority = BELOW_NORMAL_PRIORITY_CLASS if enabled else NORMAL_PRIORITY_CLASS
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            return bool(ctypes.windll.kernel32.SetPriorityClass(handle, priority))
+
+        if enabled:
+            if _normal_niceness is None:
+                _normal_niceness = os.getpriority(os.PRIO_PROCESS, 0)
+            os.setpriority(os.PRIO_PROCESS, 0, max(_normal_niceness, BACKGROUND_NICENESS))
+        elif _normal_niceness is not None:
+            os.setpriority(os.PRIO_PROCESS, 0, _normal_niceness)
+        return True
+    except (OSError, AttributeError):
+        return False
@@ -0,0 +1,409 @@
+import bisect
+import http.server
+import json
+import os
+import threading
+import time
+
+from sakura.config import APP_DIR, METRICS_FILE, METRICS_PORT, VERSION
+
+# ============================================
+# MÉTRICAS DE RENDIMIENTO
+# ============================================
+# Contadores, medidores e histogramas en memoria que el agente de la flota
+# recoge en formato Prometheus:
+#
+# - Archivo de texto (METRICS_FILE, por defecto metrics.prom) para el
+#   "textfile collector" de node_exporter; se reescribe cada EXPORT_INTERVAL
+#   segundos con archivo temporal + os.replace.
+# - HTTP en 127.0.0.1:METRICS_PORT: /metrics (texto) y /metrics.json.
+#
+# Registrar un valor es una búsqueda binaria en los límites del histograma y
+# una suma bajo un candado (menos de un microsegundo): se puede llamar en
+# caminos calientes. Lo que ya se cuenta en otra parte (planificador, caché
+# de la red local) no se duplica: se lee sólo al exportar con
+# register_collector().
+
+EXPORT_INTERVAL = 15  # Segundos entre escrituras del archivo de texto
+
+# Límites de los histogramas
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+PAINT_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.05, 0.1, 0.25)
+THROUGHPUT_BUCKETS = tuple(2 ** power * 1024 for power in range(4, 17, 2))  # 16 KB/s ... 64 MB/s
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Value:
+    """Valor de un contador o medidor para una combinación de etiquetas"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self, name, labels):
+        return [(name, labels, self.value)]
+
+    def as_dict(self):
+        return {'value': self.value}
+
+
+class _Buckets:
+    """Histograma para una combinación de etiquetas"""
+
+    def __init__(self, bounds):
+        self.lock = threading.Lock()
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Registra la duración del `with` en segundos"""
+        return _Timer(self)
+
+    def _snapshot(self):
+        with self.lock:
+            return list(self.counts), self.sum, self.count
+
+    def samples(self, name, labels):
+        counts, total, count = self._snapshot()
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds + (float('inf'),), counts):
+            cumulative += bucket_count
+            samples.append((f"{name}_bucket", labels + (('le', _format_value(float(bound))),), cumulative))
+        samples.append((f"{name}_sum", labels, total))
+        samples.append((f"{name}_count", labels, count))
+        return samples
+
+    def as_dict(self):
+        counts, total, count = self._snapshot()
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.bounds + (float('inf'),), counts):
+            cumulative += bucket_count
+            buckets[_format_value(float(bound))] = cumulative
+        return {'count': count, 'sum': total, 'buckets': buckets}
+
+
+class _Timer:
+    """`with` que observa su duración (clase y no contextmanager: cuesta la mitad)"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Metric:
+    """Familia de métricas: un valor por combinación de etiquetas.
+
+    Sin etiquetas se usa directamente (inc/set/observe); con etiquetas,
+    labels(...) devuelve el valor de esa combinación (guárdalo si se usa en
+    un bucle: la búsqueda es un diccionario).
+    """
+
+    def __init__(self, name, help_text, kind, labelnames=(), buckets=None):
+        self.name = name
+        self.help = help_text
+        self.kind = kind  # 'counter', 'gauge' o 'histogram'
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if buckets else None
+        self.children = {}
+        self.lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child(())
+
+    def _child(self, key):
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(key, _Buckets(self.buckets) if self.kind == 'histogram'
+                                                 else _Value())
+        return child
+
+    def labels(self, **labels):
+        return self._child(tuple(str(labels[name]) for name in self.labelnames))
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def set(self, value):
+        self._default.set(value)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def samples(self):
+        samples = []
+        for key, child in sorted(self.children.items()):
+            samples.extend(child.samples(self.name, tuple(zip(self.labelnames, key))))
+        return samples
+
+    def as_dict(self):
+        return {
+            'type': self.kind,
+            'help': self.help,
+            'samples': [dict(child.as_dict(), labels=dict(zip(self.labelnames, key)))
+                        for key, child in sorted(self.children.items())],
+        }
+
+
+class Registry:
+    """Conjunto de métricas del proceso"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def _get(self, name, help_text, kind, labelnames=(), buckets=None):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric(name, help_text, kind, labelnames, buckets)
+            elif metric.kind != kind:
+                raise ValueError(f"La métrica {name} ya existe como {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get(name, help_text, 'counter', labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get(name, help_text, 'gauge', labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DURATION_BUCKETS):
+        return self._get(name, help_text, 'histogram', labelnames, buckets)
+
+    def register_collector(self, collector):
+        """collector() -> [(nombre, ayuda, {etiquetas}, valor[, tipo])] leídos al exportar.
+
+        El tipo es 'gauge' salvo que se indique 'counter' (valores que sólo crecen).
+        """
+        with self.lock:
+            self.collectors.append(collector)
+        return collector
+
+    def unregister_collector(self, collector):
+        with self.lock:
+            if collector in self.collectors:
+                self.collectors.remove(collector)
+
+    def _collected(self):
+        """Valores de los colectores agrupados por nombre: {nombre: (ayuda, tipo, [(etiquetas, valor)])}"""
+        with self.lock:
+            collectors = list(self.collectors)
+        grouped = {}
+        for collector in collectors:
+            try:
+                rows = collector()
+            except Exception as e:
+                print(f"⚠️ Colector de métricas fallido: {e}")
+                continue
+            for name, help_text, labels, value, *kind in rows:
+                entry = grouped.setdefault(name, (help_text, kind[0] if kind else 'gauge', []))
+                entry[2].append((tuple(sorted(labels.items())), value))
+        return grouped
+
+    def render_text(self):
+        """Formato de exposición de texto de Prometheus"""
+        with self.lock:
+            metrics = sorted(self.metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        for name, (help_text, kind, rows) in sorted(self._collected().items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in rows:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self):
+        """Las mismas métricas para /metrics.json"""
+        with self.lock:
+            metrics = sorted(self.metrics.items())
+        result = {name: metric.as_dict() for name, metric in metrics}
+        for name, (help_text, kind, rows) in self._collected().items():
+            result[name] = {
+                'type': kind,
+                'help': help_text,
+                'samples': [{'labels': dict(labels), 'value': value} for labels, value in rows],
+            }
+        return result
+
+    def write_textfile(self, path):
+        """Escribe el archivo para el textfile collector sin dejarlo nunca a medias"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(self.render_text())
+        os.replace(temp_path, path)
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+register_collector = REGISTRY.register_collector
+
+PROCESS_START = time.time()
+
+
+@register_collector
+def _process_info():
+    return [
+        ("sakura_uptime_seconds", "Segundos desde que arrancó el proceso", {}, round(time.time() - PROCESS_START, 3)),
+        ("sakura_info", "Versión del launcher", {'version': VERSION}, 1),
+    ]
+
+
+# ============================================
+# EXPORTACIÓN
+# ============================================
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """/metrics (texto de Prometheus) y /metrics.json"""
+
+    registry = REGISTRY
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = self.registry.render_text().encode('utf-8')
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(self.registry.as_dict()).encode('utf-8')
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsExporter:
+    """Escribe el archivo de texto periódicamente y atiende el endpoint local"""
+
+    def __init__(self, registry=REGISTRY, path=METRICS_FILE, port=METRICS_PORT, interval=EXPORT_INTERVAL):
+        self.registry = registry
+        # "" = metrics.prom junto al launcher, "off" = sin archivo; puerto 0 = sin endpoint
+        self.path = None if path == "off" else path or os.path.join(APP_DIR, "metrics.prom")
+        self.port = port
+        self.interval = interval
+        self.httpd = None
+        self.stopped = threading.Event()
+        self.thread = None
+        self.stopping = None  # Hilo de un stop(wait=False) que aún puede estar cerrando el servidor
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}/" if self.httpd else None
+
+    def start(self):
+        """Arranca (o reanuda tras stop()) el endpoint y la escritura periódica"""
+        if self.stopping:
+            # El puerto tiene que quedar libre antes de volver a abrirlo
+            self.stopping.join()
+            self.stopping = None
+        self.stopped.clear()
+        if self.port:
+            handler = type('RegistryHandler', (MetricsRequestHandler,), {'registry': self.registry})
+            try:
+                # Sólo en este equipo: el agente de la flota corre en local
+                self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), handler)
+                self.httpd.daemon_threads = True
+                threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+            except OSError as e:
+                print(f"⚠️ No se pudo abrir el puerto de métricas {self.port}: {e}")
+                self.httpd = None
+        if self.path:
+            self.thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def _write_loop(self):
+        while True:
+            self.write()
+            if self.stopped.wait(self.interval):
+                return
+
+    def write(self):
+        try:
+            self.registry.write_textfile(self.path)
+        except OSError as e:
+            print(f"⚠️ No se pudieron escribir las métricas en {self.path}: {e}")
+
+    def stop(self, wait=True):
+        """Para el exportador dejando el archivo con los valores finales.
+
+        httpd.shutdown() espera a que serve_forever despierte (hasta medio
+        segundo): con `wait=False` el cierre sigue en otro hilo y la llamada
+        vuelve al instante (p. ej. desde el hilo de la GUI).
+        """
+        self.stopped.set()
+        thread, httpd = self.thread, self.httpd
+        self.thread = self.httpd = None
+        if wait:
+            self._shutdown(thread, httpd)
+        else:
+            self.stopping = threading.Thread(target=self._shutdown, args=(thread, httpd), daemon=True)
+            self.stopping.start()
+
+    def _shutdown(self, thread, httpd):
+        if thread:
+            thread.join(timeout=2)
+        if self.path:
+            self.write()
+        if httpd:
+            httpd.shutdown()
+            httpd.server_close()
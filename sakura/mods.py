@@ -0,0 +1,432 @@
+import collections
+import json
+import os
+import re
+import struct
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from sakura import metrics
+from sakura.config import APP_DIR
+from sakura.state import get_store
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: se leen sólo modId/version/displayName
+    tomllib = None
+
+# ============================================
+# ÍNDICE DE MODS (PESTAÑA MODS)
+# ============================================
+# Un jar de mod puede tener miles de entradas. Para listar los mods no se
+# abre ni se extrae nada: se lee el directorio central del ZIP (al final del
+# archivo, una sola lectura), se busca en esos bytes el nombre del archivo de
+# metadatos y se descomprime sólo esa entrada. zipfile.ZipFile también lee
+# sólo el directorio central, pero crea un ZipInfo por cada entrada; queda
+# como alternativa para los jars que este lector no entiende (ZIP64, cifrado).
+#
+# El resultado se guarda en el estado del launcher por nombre de archivo +
+# (fecha de modificación, tamaño): con la caché caliente listar la carpeta es
+# un os.scandir.
+
+METADATA_FILES = ("fabric.mod.json", "META-INF/mods.toml", "META-INF/neoforge.mods.toml")
+MANIFEST_FILE = "META-INF/MANIFEST.MF"
+MAX_WORKERS = 8
+CACHE_KEY = 'mod_index'
+
+ModInfo = collections.namedtuple('ModInfo', 'file mod_id version name loader depends breaks provides')
+ModIssue = collections.namedtuple('ModIssue', 'kind mod_id files message')
+
+INDEX_SECONDS = metrics.histogram("sakura_mod_index_seconds", "Duración de indexar la carpeta mods/")
+
+_EOCD = struct.Struct("<4s4H2LH")
+_CENTRAL = struct.Struct("<4s6H3L5H2L")
+_LOCAL = struct.Struct("<4s5H3L2H")
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_CENTRAL_SIGNATURE = b"PK\x01\x02"
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+_MAX_COMMENT = 0xFFFF
+_ZIP64_MARK = 0xFFFFFFFF
+
+
+class ModIndexError(Exception):
+    """El jar no se pudo leer"""
+
+
+# ============================================
+# LECTURA DEL DIRECTORIO CENTRAL
+# ============================================
+
+class _UnsupportedZip(Exception):
+    """Caso que el lector rápido no cubre: se recurre a zipfile"""
+
+
+def _read_central_directory(f):
+    """(bytes del directorio central, desplazamiento de datos antepuestos al ZIP)"""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    tail_size = min(size, _EOCD.size + _MAX_COMMENT)
+    f.seek(size - tail_size)
+    tail = f.read(tail_size)
+    position = tail.rfind(_EOCD_SIGNATURE)
+    if position < 0 or position + _EOCD.size > len(tail):
+        raise ModIndexError("No es un archivo ZIP")
+
+    _, disk, _, _, entries, cd_size, cd_offset, _ = _EOCD.unpack_from(tail, position)
+    if disk or entries == 0xFFFF or cd_size == _ZIP64_MARK or cd_offset == _ZIP64_MARK:
+        raise _UnsupportedZip()
+
+    eocd_offset = size - tail_size + position
+    cd_start = eocd_offset - cd_size
+    if cd_start < 0:
+        raise ModIndexError("Directorio central dañado")
+    if cd_start >= size - tail_size:
+        central = tail[cd_start - (size - tail_size):position]
+    else:
+        f.seek(cd_start)
+        central = f.read(cd_size)
+    # Si hay datos antes del ZIP (p. ej. un lanzador autoextraíble), los desplazamientos se corren
+    return central, cd_start - cd_offset
+
+
+def _find_entry(central, name):
+    """Registro del directorio central para `name` (o None)"""
+    encoded = name.encode('utf-8')
+    start = 0
+    while True:
+        position = central.find(encoded, start)
+        if position < 0:
+            return None
+        record = position - _CENTRAL.size
+        # Coincide sólo si es el nombre completo de una entrada, no parte de otra ruta
+        if record >= 0 and central[record:record + 4] == _CENTRAL_SIGNATURE:
+            fields = _CENTRAL.unpack_from(central, record)
+            if fields[10] == len(encoded):
+                return fields
+        start = position + 1
+
+
+def _read_entry(f, record, delta):
+    _, _, _, flags, method, _, _, _, compressed_size, size, _, _, _, _, _, _, local_offset = record
+    if flags & 0x1 or compressed_size == _ZIP64_MARK or local_offset == _ZIP64_MARK:
+        raise _UnsupportedZip()
+    f.seek(local_offset + delta)
+    header = f.read(_LOCAL.size)
+    if len(header) < _LOCAL.size or header[:4] != _LOCAL_SIGNATURE:
+        raise _UnsupportedZip()
+    fields = _LOCAL.unpack(header)
+    f.seek(fields[9] + fields[10], os.SEEK_CUR)
+    data = f.read(compressed_size)
+    if method == zipfile.ZIP_STORED:
+        return data
+    if method == zipfile.ZIP_DEFLATED:
+        return zlib.decompressobj(-zlib.MAX_WBITS).decompress(data, size)
+    raise _UnsupportedZip()
+
+
+def read_entries(path, names):
+    """{nombre: bytes} de las entradas de `names` presentes en el ZIP, leyendo sólo esas"""
+    try:
+        with open(path, 'rb') as f:
+            try:
+                central, delta = _read_central_directory(f)
+                found = {}
+                for name in names:
+                    record = _find_entry(central, name)
+                    if record is not None:
+                        found[name] = _read_entry(f, record, delta)
+                return found
+            except (_UnsupportedZip, zlib.error, struct.error):
+                pass
+        with zipfile.ZipFile(path) as archive:
+            available = set(archive.namelist())
+            return {name: archive.read(name) for name in names if name in available}
+    except (OSError, zipfile.BadZipFile) as e:
+        raise ModIndexError(str(e))
+
+
+# ============================================
+# METADATOS
+# ============================================
+
+def _version_spec(value):
+    """Rango de versión de fabric.mod.json ("*", ">=1.2" o lista de alternativas)"""
+    if isinstance(value, list):
+        return " || ".join(str(item) for item in value)
+    return str(value)
+
+
+def parse_fabric(file_name, data):
+    info = json.loads(data.decode('utf-8-sig'), strict=False)
+    mod_id = info.get('id')
+    if not mod_id:
+        raise ModIndexError("fabric.mod.json sin id")
+    return [ModInfo(
+        file=file_name,
+        mod_id=mod_id,
+        version=str(info.get('version', "")),
+        name=info.get('name') or mod_id,
+        loader="fabric",
+        depends={key: _version_spec(value) for key, value in (info.get('depends') or {}).items()},
+        breaks={key: _version_spec(value) for key, value in (info.get('breaks') or {}).items()},
+        provides=[str(item) for item in info.get('provides') or []],
+    )]
+
+
+_TOML_FIELD = re.compile(r'^\s*(modId|version|displayName)\s*=\s*"([^"]*)"', re.MULTILINE)
+
+
+def parse_mods_toml(file_name, data, loader, manifest=None):
+    """[[mods]] de mods.toml (un jar de Forge puede traer varios mods)"""
+    text = data.decode('utf-8-sig')
+    if tomllib is not None:
+        info = tomllib.loads(text)
+        mods = info.get('mods') or []
+        dependencies = info.get('dependencies') or {}
+    else:
+        fields = dict(_TOML_FIELD.findall(text))
+        mods = [fields] if 'modId' in fields else []
+        dependencies = {}
+
+    result = []
+    for mod in mods:
+        mod_id = mod.get('modId')
+        if not mod_id:
+            continue
+        version = str(mod.get('version', ""))
+        if version.startswith("${") and manifest:
+            # "${file.jarVersion}": la versión real está en el MANIFEST.MF del jar
+            match = re.search(r"^Implementation-Version:\s*(\S+)", manifest, re.MULTILINE)
+            version = match.group(1) if match else version
+        depends, breaks = {}, {}
+        for dependency in dependencies.get(mod_id) or []:
+            target = dependency.get('modId')
+            kind = dependency.get('type', "required" if dependency.get('mandatory', True) else "optional")
+            if target and kind == "required":
+                depends[target] = dependency.get('versionRange', "*")
+            elif target and kind == "incompatible":
+                breaks[target] = dependency.get('versionRange', "*")
+        result.append(ModInfo(file_name, mod_id, version, mod.get('displayName') or mod_id, loader,
+                              depends, breaks, []))
+    if not result:
+        raise ModIndexError("mods.toml sin [[mods]]")
+    return result
+
+
+def read_mod(path):
+    """Mods declarados en un jar (lista vacía si no tiene metadatos: p. ej. una librería)"""
+    file_name = os.path.basename(path)
+    entries = read_entries(path, METADATA_FILES)
+    try:
+        if "fabric.mod.json" in entries:
+            return parse_fabric(file_name, entries["fabric.mod.json"])
+        for name, loader in (("META-INF/neoforge.mods.toml", "neoforge"), ("META-INF/mods.toml", "forge")):
+            if name in entries:
+                manifest = None
+                if b"${file.jarVersion}" in entries[name]:
+                    manifest = read_entries(path, (MANIFEST_FILE,)).get(MANIFEST_FILE, b"").decode('utf-8', 'replace')
+                return parse_mods_toml(file_name, entries[name], loader, manifest)
+    except (ValueError, UnicodeDecodeError, AttributeError, TypeError) as e:
+        raise ModIndexError(f"Metadatos no válidos: {e}")
+    return []
+
+
+def _probe(path):
+    try:
+        return read_mod(path), None
+    except ModIndexError as e:
+        return [], str(e)
+
+
+# ============================================
+# ÍNDICE CON CACHÉ
+# ============================================
+
+def index_mods(mods_dir, base_dir=APP_DIR, use_cache=True):
+    """(mods, errores) de los jars de `mods_dir`; sólo se leen los jars nuevos o modificados.
+
+    `errores` es {archivo: mensaje} de los jars que no se pudieron leer.
+    """
+    with INDEX_SECONDS.time():
+        store = get_store(base_dir)
+        cache = (store.get(CACHE_KEY) or {}) if use_cache else {}
+
+        stats = {}
+        try:
+            with os.scandir(mods_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".jar") and entry.is_file():
+                        stat = entry.stat()
+                        stats[entry.name] = (stat.st_mtime, stat.st_size)
+        except FileNotFoundError:
+            pass
+
+        to_read = [name for name, key in stats.items()
+                   if not cache.get(name) or (cache[name]['mtime'], cache[name]['size']) != key]
+        if to_read:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                results = list(pool.map(_probe, [os.path.join(mods_dir, name) for name in to_read]))
+            for name, (mods, error) in zip(to_read, results):
+                mtime, size = stats[name]
+                cache[name] = {'mtime': mtime, 'size': size, 'mods': [mod._asdict() for mod in mods],
+                               'error': error}
+
+        # Sólo se conservan los jars que siguen en la carpeta
+        fresh_cache = {name: entry for name, entry in cache.items() if name in stats}
+        # store.get devuelve una copia: con la caché caliente no se vuelve a pedir para comparar
+        if to_read or len(fresh_cache) != len(cache) or not use_cache:
+            store.set(CACHE_KEY, fresh_cache)
+
+        mods = [ModInfo(**mod) for name in sorted(stats) for mod in fresh_cache[name]['mods']]
+        errors = {name: fresh_cache[name]['error'] for name in sorted(stats) if fresh_cache[name]['error']}
+        return mods, errors
+
+
+# ============================================
+# RANGOS DE VERSIÓN
+# ============================================
+# Fabric usa predicados semver (">=0.5 <0.6", "~1.2", "1.20.x", "*"; "||"
+# separa alternativas) y Forge rangos de Maven ("[1.0,2.0)", "(,0.5)",
+# "[1.0]"). Si el rango o la versión instalada no se entienden, no se sabe si
+# hay conflicto y no se avisa: mejor callar que marcar un modpack válido.
+
+_MAVEN_RANGE = re.compile(r"([\[(])([^,\])]*)(,([^\])]*))?([\])])")
+_PREDICATE = re.compile(r"(>=|<=|>|<|=|~|\^)?\s*(.+)$")
+_WILDCARDS = ("x", "X", "*")
+
+
+def _version_key(version):
+    """([1, 20, 1], "beta.2") de "1.20.1-beta.2+build", o None si no es numérica"""
+    core, _, pre = version.strip().split('+', 1)[0].partition('-')
+    parts = []
+    for part in core.split('.'):
+        match = re.match(r"\d+", part)
+        if not match:
+            return None
+        parts.append(int(match.group()))
+    return parts, pre
+
+
+def _compare(a, b):
+    length = max(len(a[0]), len(b[0]))
+    core_a = a[0] + [0] * (length - len(a[0]))
+    core_b = b[0] + [0] * (length - len(b[0]))
+    if core_a != core_b:
+        return -1 if core_a < core_b else 1
+    if a[1] == b[1]:
+        return 0
+    # Una versión previa (1.0-beta) va antes que la final (1.0)
+    if not a[1] or not b[1]:
+        return 1 if not a[1] else -1
+    return -1 if a[1] < b[1] else 1
+
+
+def _matches_predicate(key, predicate):
+    """Un predicado de Fabric: True, False o None si no se entiende"""
+    if predicate in _WILDCARDS:
+        return True
+    operator, target = _PREDICATE.match(predicate).groups()
+    parts = target.split('+', 1)[0].split('.')
+    if any(part in _WILDCARDS for part in parts):
+        # "1.20.x": mismos primeros números
+        prefix = []
+        for part in parts:
+            if part in _WILDCARDS:
+                break
+            if not part.isdigit():
+                return None
+            prefix.append(int(part))
+        core = key[0] + [0] * (len(prefix) - len(key[0]))
+        if operator not in (None, "="):
+            return None
+        return core[:len(prefix)] == prefix
+    bound = _version_key(target)
+    if bound is None:
+        return None
+    result = _compare(key, bound)
+    if operator in ("~", "^"):
+        # ~1.2.3 = >=1.2.3 <1.3; ^1.2.3 = >=1.2.3 <2
+        upper = bound[0][:1] if operator == "^" or len(bound[0]) == 1 else bound[0][:2]
+        upper = upper[:-1] + [upper[-1] + 1]
+        return result >= 0 and _compare(key, (upper, "")) < 0
+    return {None: result == 0, "=": result == 0, ">=": result >= 0, "<=": result <= 0,
+            ">": result > 0, "<": result < 0}[operator]
+
+
+def _in_maven_range(key, spec):
+    ranges = _MAVEN_RANGE.findall(spec)
+    if not ranges:
+        # Una versión suelta en Forge es sólo la recomendada: vale cualquiera
+        return True if _version_key(spec) else None
+    for opening, low, comma, high, closing in ranges:
+        low, high = low.strip(), high.strip()
+        if not comma:
+            high = low
+        low_key = _version_key(low) if low else None
+        high_key = _version_key(high) if high else None
+        if (low and low_key is None) or (high and high_key is None):
+            return None
+        if low_key and _compare(key, low_key) < (0 if opening == "[" else 1):
+            continue
+        if high_key and _compare(key, high_key) > (0 if closing == "]" else -1):
+            continue
+        return True
+    return False
+
+
+def version_in_range(version, spec, maven=False):
+    """True si `version` cumple `spec` (de Fabric, o de Maven para Forge), False si no y None si no se sabe"""
+    spec = spec.strip()
+    if spec in ("", "*"):
+        return True
+    key = _version_key(version)
+    if key is None:
+        return None
+    if maven:
+        return _in_maven_range(key, spec)
+    results = []
+    for alternative in spec.split("||"):
+        matches = [_matches_predicate(key, predicate) for predicate in alternative.split()]
+        if False in matches:
+            results.append(False)
+        elif None in matches or not matches:
+            results.append(None)
+        else:
+            return True
+    return None if None in results else False
+
+
+# ============================================
+# PROBLEMAS
+# ============================================
+
+def find_issues(mods):
+    """IDs duplicados (el mismo mod dos veces) y conflictos (breaks/incompatible, provides repetidos)"""
+    issues = []
+    by_id = collections.defaultdict(list)
+    for mod in mods:
+        by_id[mod.mod_id].append(mod)
+
+    for mod_id, copies in sorted(by_id.items()):
+        if len(copies) > 1:
+            versions = sorted({mod.version for mod in copies})
+            detail = "la misma versión" if len(versions) == 1 else "versiones " + ", ".join(versions)
+            issues.append(ModIssue('duplicado', mod_id, [mod.file for mod in copies],
+                                   f"{mod_id} está {len(copies)} veces ({detail})"))
+
+    for mod in mods:
+        for provided in mod.provides:
+            if provided in by_id and provided != mod.mod_id:
+                files = [mod.file] + [other.file for other in by_id[provided]]
+                issues.append(ModIssue('conflicto', provided, files,
+                                       f"{mod.mod_id} reemplaza a {provided}, que también está instalado"))
+        for target, spec in mod.breaks.items():
+            # Sólo las versiones instaladas que caen en el rango (o todas si es "*")
+            others = [other for other in by_id.get(target, ())
+                      if version_in_range(other.version, spec, maven=mod.loader != "fabric")]
+            if others:
+                versions = ", ".join(sorted({other.version for other in others}))
+                issues.append(ModIssue('conflicto', target, [mod.file] + [other.file for other in others],
+                                       f"{mod.mod_id} es incompatible con {target} {versions} ({spec})"))
+    return issues
@@ -0,0 +1,86 @@
+import threading
+import time
+
+# ============================================
+# AGREGADOR DE PROGRESO CON VELOCIDAD Y ETA
+# ============================================
+
+DEFAULT_RATE_HZ = 20
+DEFAULT_SMOOTHING = 0.3  # Peso de la última medición en la media exponencial
+
+
+class ProgressAggregator:
+    """Agrupa las actualizaciones de progreso y las emite a una frecuencia fija.
+
+    Las descargas informan cada bloque recibido; aquí se descartan las
+    intermedias y sólo se llama a `emit(porcentaje, bytes_por_segundo, eta)`
+    como mucho `rate_hz` veces por segundo (más la emisión final al 100 %).
+    """
+
+    def __init__(self, emit, rate_hz=DEFAULT_RATE_HZ, smoothing=DEFAULT_SMOOTHING, clock=time.monotonic):
+        self.emit = emit
+        self.interval = 1.0 / rate_hz
+        self.smoothing = smoothing
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reinicia las mediciones para una nueva fase (descarga, extracción...)"""
+        with self.lock:
+            self.last_emit = None
+            self.last_done = 0
+            self.speed = 0.0
+
+    def update(self, done, total):
+        """Registra el progreso actual; emite sólo si toca según la frecuencia"""
+        now = self.clock()
+        with self.lock:
+            if self.last_emit is None:
+                self.last_emit = now
+                self.last_done = done
+                finished = False
+            else:
+                finished = total > 0 and done >= total
+                elapsed = now - self.last_emit
+                if elapsed < self.interval and not finished:
+                    return
+
+                if elapsed > 0:
+                    instant = (done - self.last_done) / elapsed
+                    if self.speed:
+                        self.speed = self.smoothing * instant + (1 - self.smoothing) * self.speed
+                    else:
+                        self.speed = instant
+                self.last_emit = now
+                self.last_done = done
+
+            percent = min(int(done * 100 / total), 100) if total > 0 else 0
+            if self.speed > 0 and total > 0:
+                eta = max(total - done, 0) / self.speed
+            else:
+                eta = -1.0
+            speed = self.speed
+
+        self.emit(percent, float(speed), float(eta))
+
+
+def format_rate(bytes_per_second):
+    """Formatea una velocidad en B/s, KB/s o MB/s"""
+    if bytes_per_second >= 1024 * 1024:
+        return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+    if bytes_per_second >= 1024:
+        return f"{bytes_per_second / 1024:.0f} KB/s"
+    return f"{bytes_per_second:.0f} B/s"
+
+
+def format_eta(seconds):
+    """Formatea el tiempo restante como mm:ss (o h:mm:ss)"""
+    if seconds < 0:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
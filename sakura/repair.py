@@ -0,0 +1,266 @@
+import functools
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from sakura.concurrency import AimdController
+from sakura.config import APP_DIR, INSTANCE_MANIFEST, INSTANCE_SERVER, UPDATE_PUBLIC_KEY
+from sakura.download import download_file
+from sakura.events import EventEmitter
+from sakura.integrity import UNSIGNED_WARNING, IntegrityError, check_manifest
+from sakura.lan_cache import open_url
+from sakura.progress import ProgressAggregator, format_rate
+from sakura.scheduler import PRIORITY_REPAIR, get_scheduler
+
+# ============================================
+# VERIFICACIÓN Y REPARACIÓN DE LA INSTANCIA
+# ============================================
+# Compara la instancia del juego (librerías, assets, mods, config) con
+# instance/manifest.json del servidor y vuelve a descargar sólo los archivos
+# que faltan o no coinciden, en vez de reinstalar gigas enteros.
+#
+# Los archivos con tamaño distinto se descartan sin leerlos. El resto se
+# reparte entre varios hilos: hashlib suelta el GIL mientras calcula, así que
+# con bloques de 1 MB los hilos leen y hashean en paralelo hasta llenar el
+# disco sin el coste de copiar datos entre procesos.
+#
+# Las descargas de la reparación van en paralelo; cuántas a la vez lo decide
+# un AimdController según la velocidad que se va obteniendo.
+
+HASH_BLOCK = 1024 * 1024
+HASH_WORKERS = max(2, os.cpu_count() or 1)
+MANIFEST_TIMEOUT = 10
+DOWNLOAD_ATTEMPTS = 5  # Intentos por archivo ante errores de red
+RETRY_DELAY = 0.25  # Espera antes del primer reintento (se duplica en cada uno)
+
+# Carpetas cuyo contenido debe coincidir exactamente con el manifiesto
+STRICT_DIRS = ("mods",)
+
+
+def _safe_path(game_dir, rel_path):
+    """Ruta absoluta de `rel_path` dentro de game_dir (ValueError si intenta salirse)"""
+    normalized = os.path.normpath(rel_path)
+    if os.path.isabs(normalized) or normalized.startswith(".."):
+        raise ValueError(f"Ruta no permitida en el manifiesto: {rel_path}")
+    return os.path.join(game_dir, normalized)
+
+
+def hash_file(path, on_block=None):
+    """SHA-256 de `path`, llamando a `on_block(bytes)` tras cada bloque leído"""
+    digest = hashlib.sha256()
+    with open(path, 'rb', buffering=0) as f:
+        buffer = bytearray(HASH_BLOCK)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+            if on_block:
+                on_block(read)
+    return digest.hexdigest()
+
+
+class InstanceRepair(EventEmitter):
+    """Verifica y repara la instancia del juego.
+
+    Eventos:
+        progress(progreso 0-100, bytes/s, segundos restantes o -1)
+        status(estado actual)
+    """
+
+    def __init__(self, game_dir, server=INSTANCE_SERVER, workers=HASH_WORKERS, base_dir=None):
+        super().__init__()
+        self.game_dir = game_dir
+        # Instalación del launcher cuyas opciones se usan (límite de descarga, caché de la red local)
+        self.base_dir = base_dir or APP_DIR
+        self.server = server
+        self.workers = workers
+        self.progress = ProgressAggregator(functools.partial(self.emit, 'progress'))
+        self.manifest = None
+        self.manifest_url = urllib.parse.urljoin(server, INSTANCE_MANIFEST)
+        self.controller = None  # AimdController de la última reparación (métricas)
+
+    def fetch_manifest(self):
+        """Descarga instance/manifest.json y verifica su firma"""
+        self.emit('status', "📡 Descargando la lista de archivos de la instancia...")
+        with open_url(self.manifest_url, timeout=MANIFEST_TIMEOUT, base_dir=self.base_dir) as response:
+            manifest = json.loads(response.read().decode('utf-8'))
+        if not check_manifest(manifest, UPDATE_PUBLIC_KEY):
+            self.emit('status', UNSIGNED_WARNING)
+        if not manifest.get('files'):
+            raise IntegrityError("El manifiesto de la instancia no incluye archivos")
+        self.manifest = manifest
+        return manifest
+
+    def verify(self, manifest=None):
+        """Devuelve (problemas, sobrantes).
+
+        `problemas` es la lista de (ruta, motivo) de los archivos que faltan o
+        no coinciden; `sobrantes`, los archivos de mods/ que no están en el
+        manifiesto (no se tocan: sólo se informan).
+        """
+        manifest = self.manifest = manifest or self.manifest or self.fetch_manifest()
+        files = manifest['files']
+        problems = []
+        to_hash = []
+
+        for rel_path, entry in files.items():
+            full_path = _safe_path(self.game_dir, rel_path)
+            try:
+                size = os.stat(full_path).st_size
+            except OSError:
+                problems.append((rel_path, "falta"))
+                continue
+            if entry.get('size') is not None and size != entry['size']:
+                problems.append((rel_path, "tamaño distinto"))
+            else:
+                to_hash.append((rel_path, full_path, size))
+
+        total = sum(size for _, _, size in to_hash)
+        self.emit('status', f"🔎 Verificando {len(files)} archivos "
+                            f"({total / (1024 * 1024):.0f} MB, {self.workers} hilos)...")
+        self.progress.reset()
+        done = [0]
+        lock = threading.Lock()
+
+        def on_block(read):
+            with lock:
+                done[0] += read
+                current = done[0]
+            self.progress.update(current, total)
+
+        def check(item):
+            rel_path, full_path, _ = item
+            try:
+                digest = hash_file(full_path, on_block)
+            except OSError:
+                return rel_path, "ilegible"
+            if digest != files[rel_path]['sha256'].lower():
+                return rel_path, "modificado"
+            return None
+
+        # Los archivos grandes primero: así ningún hilo se queda con el último gigante
+        to_hash.sort(key=lambda item: item[2], reverse=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            problems.extend(result for result in pool.map(check, to_hash) if result)
+        self.progress.update(total, total)
+
+        problems.sort()
+        return problems, self.find_extra_files(files)
+
+    def find_extra_files(self, files):
+        extra = []
+        for directory in STRICT_DIRS:
+            root = os.path.join(self.game_dir, directory)
+            for current, _, names in os.walk(root):
+                for name in names:
+                    rel_path = os.path.relpath(os.path.join(current, name), self.game_dir).replace(os.sep, "/")
+                    if rel_path not in files:
+                        extra.append(rel_path)
+        return sorted(extra)
+
+    def file_url(self, rel_path):
+        """URL de descarga de un archivo del manifiesto"""
+        entry = self.manifest['files'][rel_path]
+        if entry.get('url'):
+            return urllib.parse.urljoin(self.manifest_url, entry['url'])
+        base_url = urllib.parse.urljoin(self.manifest_url, self.manifest.get('base_url', "files/"))
+        return urllib.parse.urljoin(base_url, urllib.parse.quote(rel_path))
+
+    def repair(self, problems, controller=None):
+        """Vuelve a descargar los archivos de `problems`; devuelve la lista de los que fallaron"""
+        if not problems:
+            return []
+        files = self.manifest['files']
+        total = sum(files[rel_path].get('size') or 0 for rel_path, _ in problems)
+        self.emit('status', f"📥 Descargando {len(problems)} archivos ({total / (1024 * 1024):.1f} MB)...")
+        self.progress.reset()
+
+        self.controller = controller or AimdController(on_change=self._on_concurrency_change)
+        done = [0]
+        lock = threading.Lock()
+
+        with get_scheduler(self.base_dir).job(PRIORITY_REPAIR, "reparación") as job:
+            def fetch(rel_path):
+                entry = files[rel_path]
+                full_path = _safe_path(self.game_dir, rel_path)
+                temp_path = full_path + ".part"
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                error = None
+                # Cada intento (también el paso del caché de la red local a internet dentro de
+                # download_file) empieza de cero: sólo cuentan los bytes que superan lo que ya se
+                # había contado para este archivo, así el progreso y la señal del controlador
+                # nunca retroceden y al terminar suman exactamente lo del intento final
+                counted = [0]
+
+                def progress(current, _):
+                    delta = current - counted[0]
+                    if delta <= 0:
+                        return
+                    counted[0] = current
+                    self.controller.record(delta)
+                    with lock:
+                        done[0] += delta
+                        overall = done[0]
+                    self.progress.update(overall, total)
+
+                for attempt in range(DOWNLOAD_ATTEMPTS):
+                    if attempt:
+                        time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+                    retry = False
+                    with self.controller.slot():
+                        try:
+                            download_file(self.file_url(rel_path), temp_path,
+                                          expected_sha256=entry['sha256'], expected_size=entry.get('size'),
+                                          chunks=entry.get('chunks'), job=job, progress=progress,
+                                          base_dir=self.base_dir)
+                            # El archivo dañado sólo se sustituye cuando el nuevo está verificado
+                            os.replace(temp_path, full_path)
+                            return None
+                        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                            # Errores de red y timeouts: señal para bajar la concurrencia
+                            self.controller.record_error()
+                            error, retry = e, True
+                        except Exception as e:
+                            error = e
+                    if not retry:
+                        break
+                return rel_path, str(error)
+
+            # Hilos para el máximo posible; el controlador decide cuántos descargan a la vez
+            with ThreadPoolExecutor(max_workers=self.controller.maximum) as pool:
+                failed = [result for result in pool.map(fetch, [rel_path for rel_path, _ in problems]) if result]
+
+        for rel_path, reason in failed:
+            self.emit('status', f"⚠️ {rel_path}: {reason}")
+        metrics = self.controller.metrics()
+        peak = max([limit for _, limit, _ in metrics['history']] + [metrics['limit']])
+        self.emit('status', f"📊 Descargas: hasta {peak} simultáneas, {metrics['errors']} errores de red")
+        self.progress.update(total, total)
+        return failed
+
+    def _on_concurrency_change(self, limit, throughput):
+        self.emit('status', f"⚙️ Descargas simultáneas: {limit} ({format_rate(throughput)})")
+
+    def verify_and_repair(self):
+        """Flujo completo; devuelve (reparados, fallidos, sobrantes)"""
+        problems, extra = self.verify()
+        if not problems:
+            self.emit('status', "✅ Todos los archivos de la instancia están bien")
+            return [], [], extra
+        failed = self.repair(problems)
+        failed_paths = {rel_path for rel_path, _ in failed}
+        repaired = [rel_path for rel_path, _ in problems if rel_path not in failed_paths]
+        if failed:
+            self.emit('status', f"⚠️ Reparados {len(repaired)} archivos; fallaron {len(failed)}")
+        else:
+            self.emit('status', f"✅ Reparados {len(repaired)} archivos")
+        return repaired, failed, extra
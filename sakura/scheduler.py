@@ -0,0 +1,223 @@
+import contextlib
+import threading
+import time
+
+from sakura import metrics
+from sakura.config import APP_DIR
+from sakura.state import get_store
+
+# ============================================
+# PLANIFICADOR DE DESCARGAS
+# ============================================
+# Todas las descargas (actualización del launcher, reparación de la instancia,
+# contenido de las pestañas, descargas en segundo plano) piden permiso aquí
+# por cada bloque que leen:
+#
+# - Prioridad estricta por clase: mientras haya un trabajo activo de una
+#   clase más importante, los de clases inferiores esperan entre bloques.
+# - Límite global de ancho de banda (opción "Límite de descarga"): un cubo de
+#   fichas con reloj virtual. Cada bloque reserva su turno en orden de
+#   llegada, así que los trabajos activos se reparten el límite por igual.
+# - Las descargas en segundo plano nunca usan más de BACKGROUND_SHARE del
+#   límite (para no saturar conexiones compartidas) y se pausan mientras se
+#   juega; el resto baja a IN_GAME_RATE si el límite es mayor.
+
+PRIORITY_UPDATE = 0  # Actualización del propio launcher
+PRIORITY_REPAIR = 1  # Reparación de la instancia pedida por el usuario
+PRIORITY_CONTENT = 2  # Contenido de las pestañas
+PRIORITY_BACKGROUND = 3  # Descargas anticipadas en segundo plano
+
+PRIORITY_NAMES = {
+    PRIORITY_UPDATE: "actualización",
+    PRIORITY_REPAIR: "reparación",
+    PRIORITY_CONTENT: "contenido",
+    PRIORITY_BACKGROUND: "segundo plano",
+}
+
+# Opciones de "Límite de descarga" en KB/s (0 = sin límite)
+RATE_LIMIT_CHOICES = [0, 256, 512, 1024, 2048, 5120, 10240]
+BURST_SECONDS = 0.1  # Ráfaga permitida tras un rato sin descargar (pequeña: si no, el primero se la lleva)
+BACKGROUND_SHARE = 0.5  # Fracción del límite disponible para el segundo plano
+BACKGROUND_RATE = 1024 * 1024  # Tope del segundo plano si no hay límite global (bytes/s)
+IN_GAME_RATE = 512 * 1024  # Tope mientras se juega (bytes/s)
+READ_BLOCK = 64 * 1024
+
+
+class TokenBucket:
+    """Cubo de fichas de `rate` bytes/s (0 = sin límite) con reserva por orden de llegada.
+
+    En vez de contar fichas se guarda el instante en que el cubo vuelve a
+    estar vacío: cada consumo lo desplaza n/rate segundos y espera hasta su
+    turno. Las peticiones concurrentes quedan encoladas en el orden en que
+    llegaron, que es lo que reparte el límite entre los trabajos.
+    """
+
+    def __init__(self, rate=0, burst_seconds=BURST_SECONDS, clock=time.monotonic):
+        self.rate = rate
+        self.burst_seconds = burst_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.next_free = clock()
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.rate = rate
+            self.next_free = self.clock()
+
+    def reserve(self, amount):
+        """Reserva `amount` bytes y devuelve los segundos que hay que esperar"""
+        with self.lock:
+            if self.rate <= 0:
+                return 0.0
+            now = self.clock()
+            start = max(self.next_free, now)
+            self.next_free = start + amount / self.rate
+            return max(0.0, self.next_free - now - self.burst_seconds)
+
+    def consume(self, amount):
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class DownloadJob:
+    """Un trabajo registrado en el planificador; consume() antes de leer cada bloque"""
+
+    def __init__(self, scheduler, priority, name):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.name = name
+        self.transferred = 0
+
+    def consume(self, amount):
+        scheduler = self.scheduler
+        scheduler._wait_turn(self)
+        # Se reserva en todos los cubos que aplican y se espera al más lento
+        delay = scheduler.bucket.reserve(amount)
+        if self.priority == PRIORITY_BACKGROUND:
+            delay = max(delay, scheduler.background_bucket.reserve(amount))
+        elif scheduler.game_running:
+            delay = max(delay, scheduler.game_bucket.reserve(amount))
+        if delay > 0:
+            time.sleep(delay)
+        self.transferred += amount
+
+    def wrap(self, response):
+        """Respuesta HTTP cuyas lecturas pasan por el planificador"""
+        return _ScheduledStream(response, self)
+
+
+class _ScheduledStream:
+    """Envuelve una respuesta: read() pide turno antes de cada bloque"""
+
+    def __init__(self, response, job):
+        self.response = response
+        self.job = job
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            blocks = []
+            for block in iter(lambda: self.read(READ_BLOCK), b""):
+                blocks.append(block)
+            return b"".join(blocks)
+        self.job.consume(size)
+        return self.response.read(size)
+
+    def __getattr__(self, name):
+        # headers, status, getheader... de la respuesta original
+        return getattr(self.response, name)
+
+
+class DownloadScheduler:
+    """Reparte el enlace entre los trabajos de descarga según su prioridad"""
+
+    def __init__(self, rate_limit=0):
+        self.condition = threading.Condition()
+        self.active = {}  # prioridad -> número de trabajos activos
+        self.game_running = False
+        self.bucket = TokenBucket()
+        self.background_bucket = TokenBucket()
+        self.game_bucket = TokenBucket(IN_GAME_RATE)
+        self.rate_limit = None
+        self.set_rate_limit(rate_limit)
+
+    def set_rate_limit(self, rate_limit):
+        """Cambia el límite global en bytes/s (0 = sin límite); afecta a las descargas en curso"""
+        self.rate_limit = rate_limit
+        self.bucket.set_rate(rate_limit)
+        self.background_bucket.set_rate(rate_limit * BACKGROUND_SHARE if rate_limit else BACKGROUND_RATE)
+        self.game_bucket.set_rate(min(rate_limit, IN_GAME_RATE) if rate_limit else IN_GAME_RATE)
+
+    def set_game_running(self, running):
+        """Con el juego abierto el segundo plano se pausa y el resto se modera"""
+        with self.condition:
+            self.game_running = running
+            self.condition.notify_all()
+
+    @contextlib.contextmanager
+    def job(self, priority, name=""):
+        """Registra un trabajo mientras dure el `with`"""
+        job = DownloadJob(self, priority, name)
+        with self.condition:
+            self.active[priority] = self.active.get(priority, 0) + 1
+        try:
+            yield job
+        finally:
+            with self.condition:
+                self._remove(job.priority)
+                self.condition.notify_all()
+
+    def promote(self, job, priority):
+        """Sube la prioridad de un trabajo en curso (p. ej. el usuario pide ya la descarga)"""
+        with self.condition:
+            if priority >= job.priority:
+                return
+            self._remove(job.priority)
+            job.priority = priority
+            self.active[priority] = self.active.get(priority, 0) + 1
+            self.condition.notify_all()
+
+    def _remove(self, priority):
+        self.active[priority] -= 1
+        if not self.active[priority]:
+            del self.active[priority]
+
+    def _blocked(self, job):
+        if job.priority == PRIORITY_BACKGROUND and self.game_running:
+            return True
+        return any(priority < job.priority for priority in self.active)
+
+    def _wait_turn(self, job):
+        with self.condition:
+            while self._blocked(job):
+                self.condition.wait()
+
+    def status(self):
+        """Resumen para mostrar: trabajos activos por clase"""
+        with self.condition:
+            return {PRIORITY_NAMES[priority]: count for priority, count in sorted(self.active.items())}
+
+    def collect_metrics(self):
+        """Colector para sakura.metrics (se lee al exportar, no en cada bloque)"""
+        with self.condition:
+            active = dict(self.active)
+        rows = [("sakura_download_jobs_active", "Trabajos de descarga activos por clase",
+                 {'class': name}, active.get(priority, 0)) for priority, name in PRIORITY_NAMES.items()]
+        rows.append(("sakura_download_rate_limit_bytes_per_second", "Límite global de descarga (0 = sin límite)",
+                     {}, self.rate_limit))
+        return rows
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(base_dir=APP_DIR):
+    """Planificador compartido por todo el proceso (el límite se lee de las opciones de `base_dir`)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            limit_kbps = get_store(base_dir).get('download_limit_kbps') or 0
+            _scheduler = DownloadScheduler(limit_kbps * 1024)
+            metrics.register_collector(_scheduler.collect_metrics)
+        return _scheduler
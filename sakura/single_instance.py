@@ -0,0 +1,163 @@
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+
+from sakura.config import APP_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ============================================
+# INSTANCIA ÚNICA CON TRASPASO DE ARGUMENTOS
+# ============================================
+# El primer launcher bloquea launcher.lock y escucha en un socket TCP de
+# 127.0.0.1 (funciona igual en Windows y Linux). Su puerto y un token
+# aleatorio quedan en launcher.ipc; una segunda invocación los lee, envía
+# sus argumentos y termina sin cargar Qt.
+
+LOCK_FILE = "launcher.lock"
+IPC_FILE = "launcher.ipc"
+CONNECT_TIMEOUT = 1.0
+CLAIM_TIMEOUT = 3.0
+
+
+class SingleInstance:
+    """Garantiza un único launcher por instalación y recibe los argumentos de los demás"""
+
+    def __init__(self, base_dir=APP_DIR):
+        self.lock_path = os.path.join(base_dir, LOCK_FILE)
+        self.ipc_path = os.path.join(base_dir, IPC_FILE)
+        self.lock_file = None
+        self.server = None
+        self.token = None
+        self.callback = None
+        self.pending = []
+        self.callback_lock = threading.Lock()
+
+    def acquire(self):
+        """Intenta ser la instancia principal; True si se obtuvo el bloqueo"""
+        if self.lock_file:
+            return True
+        lock_file = open(self.lock_path, 'a+')
+        try:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        self.lock_file = lock_file
+        return True
+
+    def forward(self, argv, timeout=CONNECT_TIMEOUT):
+        """Envía `argv` a la instancia principal; True si ésta confirmó la recepción"""
+        try:
+            with open(self.ipc_path, 'r') as f:
+                info = json.load(f)
+            message = json.dumps({'token': info['token'], 'argv': list(argv)}) + "\n"
+            with socket.create_connection(('127.0.0.1', info['port']), timeout=timeout) as conn:
+                conn.sendall(message.encode('utf-8'))
+                return conn.makefile('r').readline().strip() == "ok"
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def claim(self, argv, timeout=CLAIM_TIMEOUT):
+        """Devuelve True si somos la instancia principal, False si se reenvió `argv`.
+
+        Reintenta durante `timeout` para cubrir el arranque de la principal (aún
+        sin launcher.ipc) o su cierre (por ejemplo, al reiniciarse tras actualizar).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.acquire():
+                return True
+            if self.forward(argv):
+                return False
+            if time.monotonic() >= deadline:
+                raise RuntimeError("Hay otro launcher abierto que no responde")
+            time.sleep(0.05)
+
+    def listen(self, callback=None):
+        """Empieza a aceptar argumentos de otras invocaciones.
+
+        `callback(argv)` corre en el hilo del socket; si aún no hay callback
+        (la GUI todavía está arrancando) los mensajes quedan en cola.
+        """
+        if not self.lock_file:
+            raise RuntimeError("Sólo la instancia principal puede escuchar")
+        if callback:
+            self.set_callback(callback)
+
+        self.token = secrets.token_hex(16)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(5)
+
+        # Escritura atómica para que nadie lea un launcher.ipc a medias
+        tmp_path = self.ipc_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'port': self.server.getsockname()[1], 'token': self.token, 'pid': os.getpid()}, f)
+        os.replace(tmp_path, self.ipc_path)
+
+        thread = threading.Thread(target=self._serve, args=(self.server,), daemon=True)
+        thread.start()
+
+    def set_callback(self, callback):
+        """Define quién atiende los argumentos recibidos y entrega los que estaban en cola"""
+        with self.callback_lock:
+            self.callback = callback
+            pending, self.pending = self.pending, []
+        for argv in pending:
+            callback(argv)
+
+    def _serve(self, server):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return  # Socket cerrado por release()
+            with conn:
+                try:
+                    conn.settimeout(CONNECT_TIMEOUT)
+                    message = json.loads(conn.makefile('r', encoding='utf-8').readline())
+                    if message.get('token') != self.token:
+                        continue
+                    conn.sendall(b"ok\n")
+                except (OSError, ValueError):
+                    continue
+            argv = list(message.get('argv', []))
+            with self.callback_lock:
+                callback = self.callback
+                if callback is None:
+                    self.pending.append(argv)
+            if callback:
+                callback(argv)
+
+    def release(self):
+        """Libera el bloqueo y deja de escuchar (antes de reiniciar o salir)"""
+        if self.server:
+            self.server.close()
+            self.server = None
+            try:
+                os.remove(self.ipc_path)
+            except OSError:
+                pass
+        if self.lock_file:
+            try:
+                if fcntl:
+                    fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    self.lock_file.seek(0)
+                    msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+            self.lock_file.close()
+            self.lock_file = None
@@ -0,0 +1,270 @@
+import atexit
+import contextlib
+import copy
+import json
+import os
+import threading
+
+from sakura.config import APP_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ============================================
+# ESTADO PERSISTENTE DEL LAUNCHER
+# ============================================
+# Un único launcher_state.json con todo el estado (última verificación,
+# actualización pendiente y, más adelante, opciones y perfiles). Se lee una
+# vez y se consulta en memoria; las escrituras se agrupan y se vuelcan tras
+# un breve retardo, siempre con archivo temporal + fsync + os.replace para
+# que un corte nunca deje el archivo a medias.
+#
+# La GUI y la CLI (java, mods, repair, serve-cache) pueden tener el mismo
+# estado abierto a la vez: cada escritura, con launcher_state.json.lock
+# bloqueado, vuelve a leer el archivo y sólo pone encima las claves que este
+# proceso cambió, así no se pisan las del otro.
+
+STATE_FILE = "launcher_state.json"
+LOCK_SUFFIX = ".lock"
+SCHEMA_VERSION = 2
+WRITE_DELAY = 0.5  # Segundos que se esperan para agrupar escrituras
+
+DEFAULT_STATE = {
+    'last_check': None,  # Timestamp de la última búsqueda de actualizaciones
+    'update_info': None,  # Actualización pendiente (antes update_info.json)
+    'staged_update': None,  # Actualización ya descargada y verificada, lista para instalar
+    'java_runtimes': {},  # Binarios de Java ya probados, por ruta (sakura/java.py)
+    'mod_index': {},  # Metadatos de los jars de mods/, por archivo (sakura/mods.py)
+    'content': {'version': 0, 'index_etag': None, 'tabs': {}},  # Contenido remoto de las pestañas (sakura/content.py)
+    'download_limit_kbps': 0,  # Límite de descarga de OPCIONES (0 = sin límite)
+    'lan_cache_url': "",  # Caché de la red local (URL, "auto" = buscar por broadcast, "" = no usar)
+}
+
+
+def _migrate_legacy(state, base_dir):
+    """Esquema 0 → 1: importa last_check.txt y update_info.json"""
+    legacy_files = []
+
+    last_check_file = os.path.join(base_dir, "last_check.txt")
+    if os.path.exists(last_check_file):
+        legacy_files.append(last_check_file)
+        try:
+            with open(last_check_file, 'r') as f:
+                state['last_check'] = float(f.read().strip())
+        except (OSError, ValueError):
+            pass
+
+    update_info_file = os.path.join(base_dir, "update_info.json")
+    if os.path.exists(update_info_file):
+        legacy_files.append(update_info_file)
+        try:
+            with open(update_info_file, 'r') as f:
+                state['update_info'] = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    return legacy_files
+
+
+def _migrate_content_state(state, base_dir):
+    """Esquema 1 → 2: importa cache/content/state.json (ETag y versión del contenido)"""
+    content_state_file = os.path.join(base_dir, "cache", "content", "state.json")
+    if not os.path.exists(content_state_file):
+        return []
+    try:
+        with open(content_state_file, 'r', encoding='utf-8') as f:
+            state['content'].update(json.load(f))
+    except (OSError, ValueError, TypeError):
+        pass
+    return [content_state_file]
+
+
+# Migración desde cada versión de esquema a la siguiente
+MIGRATIONS = {
+    0: _migrate_legacy,
+    1: _migrate_content_state,
+}
+
+
+class StateStore:
+    """Vista en memoria del estado con escrituras atómicas agrupadas"""
+
+    def __init__(self, base_dir=APP_DIR, write_delay=WRITE_DELAY):
+        self.base_dir = base_dir
+        self.path = os.path.join(base_dir, STATE_FILE)
+        self.write_delay = write_delay
+        self.lock = threading.RLock()
+        self.timer = None
+        self.dirty = False
+        self.changed = set()  # Claves cambiadas desde la última escritura
+        self.legacy_files = []  # Archivos migrados que se borran tras la primera escritura
+        self.data = self._load()
+
+    def _load(self):
+        stored = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            # Se aparta el archivo dañado para poder revisarlo y se empieza de cero
+            print(f"⚠️ Estado del launcher ilegible ({e}); se usarán valores por defecto")
+            try:
+                os.replace(self.path, self.path + ".corrupt")
+            except OSError:
+                pass
+
+        data = copy.deepcopy(DEFAULT_STATE)
+        data.update(stored)
+        schema = stored.get('schema', 0)
+        if schema > SCHEMA_VERSION:
+            print(f"⚠️ El estado es de una versión más nueva del launcher (esquema {schema})")
+            return data
+
+        legacy_files = []
+        while schema < SCHEMA_VERSION:
+            legacy_files += MIGRATIONS[schema](data, self.base_dir) or []
+            schema += 1
+        data['schema'] = SCHEMA_VERSION
+
+        # Leer el estado no escribe nada: la migración se guarda con el primer set()
+        self.legacy_files = legacy_files
+        return data
+
+    def get(self, key, default=None):
+        """Valor de `key` (una copia: modificarlo no cambia el estado)"""
+        with self.lock:
+            value = self.data.get(key, default)
+            return copy.deepcopy(value)
+
+    def set(self, key, value):
+        """Cambia `key` y programa la escritura"""
+        with self.lock:
+            self.data[key] = copy.deepcopy(value)
+            self.changed.add(key)
+            self._schedule()
+
+    def update(self, values):
+        """Cambia varias claves de una vez (una sola escritura)"""
+        with self.lock:
+            for key, value in values.items():
+                self.data[key] = copy.deepcopy(value)
+                self.changed.add(key)
+            self._schedule()
+
+    def delete(self, key):
+        with self.lock:
+            if key in DEFAULT_STATE:
+                self.data[key] = copy.deepcopy(DEFAULT_STATE[key])
+            else:
+                self.data.pop(key, None)
+            self.changed.add(key)
+            self._schedule()
+
+    def _schedule(self):
+        self.dirty = True
+        if self.timer is None and self.write_delay > 0:
+            # Los cambios que lleguen mientras tanto se escriben juntos
+            self.timer = threading.Timer(self.write_delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+        elif self.write_delay <= 0:
+            self.flush()
+
+    def flush(self, force=False):
+        """Escribe el estado pendiente en disco (atómico)"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not (self.dirty or force):
+                return
+            tmp_path = self.path + ".tmp"
+            try:
+                with _file_lock(self.path + LOCK_SUFFIX):
+                    data = self._merge_from_disk()
+                    payload = json.dumps(data, indent=2, ensure_ascii=False)
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        f.write(payload)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar el estado del launcher: {e}")
+                return
+            # Lo que escribieron otros procesos también queda a la vista de este
+            self.data = data
+            self.dirty = False
+            self.changed = set()
+            # Los archivos antiguos sólo se borran cuando el nuevo ya está en disco
+            for path in self.legacy_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.legacy_files = []
+
+
+    def _merge_from_disk(self):
+        """El estado en disco (otro proceso pudo escribirlo) con las claves cambiadas aquí encima"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return self.data
+        # Sin migrar (o de otra versión): se escribe entero lo de este proceso, como al migrar
+        if not isinstance(stored, dict) or stored.get('schema') != self.data.get('schema'):
+            return self.data
+        merged = copy.deepcopy(DEFAULT_STATE)
+        merged.update(stored)
+        for key in self.changed:
+            if key in self.data:
+                merged[key] = copy.deepcopy(self.data[key])
+            else:
+                merged.pop(key, None)
+        return merged
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Bloqueo exclusivo entre procesos (espera a que el otro termine de escribir)"""
+    with open(path, 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(base_dir=APP_DIR):
+    """StateStore compartido por todos los componentes de una instalación"""
+    key = os.path.abspath(base_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = StateStore(base_dir)
+        return _stores[key]
+
+
+@atexit.register
+def flush_all():
+    """Vuelca los cambios pendientes (al salir o antes de reiniciar el proceso)"""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
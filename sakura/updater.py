@@ -0,0 +1,654 @@
+import functools
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+from datetime import datetime
+
+from sakura import metrics
+from sakura.asset_pack import PACK_FILE, release_open_packs
+from sakura.config import (APP_DIR, CHECK_INTERVAL, PATCH_STAGING_DIR, UPDATE_FILE, UPDATE_PUBLIC_KEY,
+                           UPDATE_SERVER, VERSION, VERSION_FILE)
+from sakura.delta import DeltaError, apply_patch, file_sha256
+from sakura.download import download_file
+from sakura.events import EventEmitter
+from sakura.image_cache import ImageCache
+from sakura.integrity import UNSIGNED_WARNING, IntegrityError, check_manifest
+from sakura.lan_cache import open_url
+from sakura.progress import ProgressAggregator
+from sakura.scheduler import PRIORITY_BACKGROUND, PRIORITY_UPDATE, get_scheduler
+from sakura.state import get_store
+
+UPDATE_CHECK_SECONDS = metrics.histogram(
+    "sakura_update_check_seconds", "Latencia de la búsqueda de actualizaciones (descarga y firma del manifiesto)")
+UPDATE_CHECKS = metrics.counter(
+    "sakura_update_checks_total", "Búsquedas de actualizaciones por resultado", ('result',))
+BACKUP_SECONDS = metrics.histogram(
+    "sakura_update_backup_seconds", "Duración de la copia de seguridad previa a actualizar")
+APPLY_SECONDS = metrics.histogram(
+    "sakura_update_apply_seconds", "Duración de la instalación de una actualización (incluye la copia)")
+UPDATES_APPLIED = metrics.counter(
+    "sakura_updates_applied_total", "Actualizaciones instaladas por resultado", ('result',))
+
+
+def _safe_parts(rel_path):
+    """Componentes de una ruta relativa del manifiesto o del zip (ValueError si intenta salirse)"""
+    parts = [part for part in rel_path.replace('\\', '/').split('/') if part and part != '.']
+    if not parts or '..' in parts or os.path.isabs(rel_path) or ':' in parts[0]:
+        raise ValueError(f"Ruta no permitida: {rel_path}")
+    return parts
+
+# ============================================
+# CLASE PARA MANEJAR ACTUALIZACIONES
+# ============================================
+
+class Updater(EventEmitter):
+    """Manejador de actualizaciones automáticas (núcleo sin Qt).
+    
+    Eventos:
+        update_available(nueva_versión, changelog)
+        progress(progreso 0-100, bytes/s, segundos restantes o -1)
+        finished(éxito, mensaje)
+        status(estado actual)
+    """
+    
+    def __init__(self, base_dir=None, update_server=UPDATE_SERVER):
+        super().__init__()
+        # base_dir permite trabajar sobre otra instalación (benchmarks, pruebas)
+        self.script_dir = base_dir or APP_DIR
+        self.update_server = update_server
+        self.temp_dir = os.path.join(self.script_dir, "temp_updates")
+        self.backup_dir = os.path.join(self.script_dir, "backup")
+        # Última verificación y actualización pendiente viven en el estado compartido
+        self.state = get_store(self.script_dir)
+        # Una sola descarga de la actualización a la vez (la de segundo plano o la pedida)
+        self.download_lock = threading.Lock()
+        self.download_job = None
+        # Archivos y carpetas que crea la instalación en curso (se borran si hay que restaurar)
+        self.created_paths = []
+        
+        # Limita las señales de progreso a ~20 por segundo (una por bloque saturaba la GUI)
+        self.progress = ProgressAggregator(functools.partial(self.emit, 'progress'))
+        self.last_error = None
+        
+        # Crear directorios si no existen
+        os.makedirs(self.temp_dir, exist_ok=True)
+        os.makedirs(self.backup_dir, exist_ok=True)
+    
+    def should_check_update(self):
+        """Determina si debe verificar actualizaciones basado en la última verificación"""
+        last_check = self.state.get('last_check')
+        if last_check is None:
+            return True
+        
+        elapsed = datetime.now().timestamp() - last_check
+        return elapsed > CHECK_INTERVAL
+    
+    def update_last_check(self):
+        """Actualiza el timestamp de la última verificación"""
+        self.state.set('last_check', datetime.now().timestamp())
+    
+    def check_for_updates(self, force=False):
+        """Verifica si hay actualizaciones disponibles"""
+        if not force and not self.should_check_update():
+            return False
+        
+        self.emit('status', "🔍 Buscando actualizaciones...")
+        self.last_error = None
+        
+        try:
+            with UPDATE_CHECK_SECONDS.time():
+                data, version_url = self.fetch_manifest()
+            
+            remote_version = data.get('version', '0.0.0')
+            changelog = data.get('changelog', 'Sin información de cambios')
+            download_url = data.get('download_url', '')
+            
+            self.emit('status', f"🔄 Versión remota: {remote_version}")
+            
+            # Comparar versiones
+            if self.compare_versions(remote_version, VERSION) > 0:
+                self.emit('status', f"🎯 ¡Nueva versión disponible! ({remote_version})")
+                
+                # Guardar información de la actualización
+                update_info = {
+                    'remote_version': remote_version,
+                    'changelog': changelog,
+                    'download_url': download_url,
+                    'sha256': data.get('sha256'),
+                    'size': data.get('size'),
+                    'chunks': data.get('chunks'),
+                    'files': data.get('files', []),
+                    'file_hashes': data.get('file_hashes', {}),
+                    'patches': data.get('patches'),
+                    'manifest_url': version_url,
+                    'timestamp': datetime.now().isoformat()
+                }
+                
+                self.state.update({'update_info': update_info, 'last_check': datetime.now().timestamp()})
+                
+                UPDATE_CHECKS.labels(result='available').inc()
+                self.emit('update_available', remote_version, changelog)
+                return True
+            else:
+                UPDATE_CHECKS.labels(result='current').inc()
+                self.emit('status', "✅ Estás en la última versión")
+                if force:
+                    self.emit('finished', True, "Ya tienes la última versión")
+                self.update_last_check()
+                return False
+                
+        except urllib.error.URLError as e:
+            UPDATE_CHECKS.labels(result='connection_error').inc()
+            self.last_error = f"Error de conexión: {str(e)}"
+            self.emit('status', f"⚠️ {self.last_error}")
+            return False
+        except IntegrityError as e:
+            UPDATE_CHECKS.labels(result='rejected').inc()
+            self.last_error = f"Manifiesto rechazado: {str(e)}"
+            self.emit('status', f"🛑 {self.last_error}")
+            return False
+        except Exception as e:
+            UPDATE_CHECKS.labels(result='error').inc()
+            self.last_error = str(e)
+            self.emit('status', f"❌ Error: {str(e)}")
+            return False
+    
+    def fetch_manifest(self):
+        """Descarga el manifiesto remoto y verifica su firma"""
+        version_url = f"{self.update_server}{VERSION_FILE}"
+        self.emit('status', f"📡 Conectando a {self.update_server}")
+        
+        response = open_url(version_url, timeout=10, base_dir=self.script_dir)
+        data = json.loads(response.read().decode('utf-8'))
+        
+        # Verificar la firma antes de confiar en cualquier dato del manifiesto
+        if not check_manifest(data, UPDATE_PUBLIC_KEY):
+            self.emit('status', UNSIGNED_WARNING)
+        
+        return data, version_url
+    
+    def verify_installation(self, manifest=None):
+        """Compara los archivos instalados con los hashes del manifiesto.
+        
+        Devuelve la lista de (ruta, motivo) de los archivos que no coinciden.
+        Sólo tiene sentido si la versión instalada es la del manifiesto.
+        """
+        if manifest is None:
+            manifest, _ = self.fetch_manifest()
+        
+        remote_version = manifest.get('version', '0.0.0')
+        if self.compare_versions(remote_version, VERSION) != 0:
+            raise ValueError(f"La versión instalada ({VERSION}) no es la del manifiesto ({remote_version}); actualiza primero")
+        
+        file_hashes = manifest.get('file_hashes') or {}
+        if not file_hashes:
+            raise ValueError("El manifiesto no incluye hashes de archivos")
+        
+        self.emit('status', f"🔎 Verificando {len(file_hashes)} archivos...")
+        problems = []
+        for i, (rel_path, expected) in enumerate(sorted(file_hashes.items())):
+            full_path = os.path.join(self.script_dir, *_safe_parts(rel_path))
+            if not os.path.exists(full_path):
+                problems.append((rel_path, "falta"))
+            elif file_sha256(full_path) != expected:
+                problems.append((rel_path, "modificado"))
+            self.progress.update(i + 1, len(file_hashes))
+        
+        return problems
+    
+    def report_status(self, text):
+        """Publica un mensaje de estado (útil como callback)"""
+        self.emit('status', text)
+    
+    def compare_versions(self, v1, v2):
+        """Compara dos versiones en formato semántico (x.y.z)"""
+        v1_parts = list(map(int, v1.split('.')))
+        v2_parts = list(map(int, v2.split('.')))
+        
+        # Asegurar que ambas versiones tengan la misma longitud
+        while len(v1_parts) < len(v2_parts):
+            v1_parts.append(0)
+        while len(v2_parts) < len(v1_parts):
+            v2_parts.append(0)
+        
+        for i in range(len(v1_parts)):
+            if v1_parts[i] > v2_parts[i]:
+                return 1
+            elif v1_parts[i] < v2_parts[i]:
+                return -1
+        
+        return 0
+    
+    def download_update(self, priority=PRIORITY_UPDATE):
+        """Descarga la actualización (parches binarios si es posible, si no el zip completo).
+        
+        Si ya se descargó y verificó en segundo plano, devuelve esa copia sin
+        tocar la red. Si la descarga en segundo plano está en curso, se le sube
+        la prioridad y se espera a que termine.
+        """
+        if not self.download_lock.acquire(blocking=False):
+            job = self.download_job
+            if job is not None:
+                get_scheduler(self.script_dir).promote(job, priority)
+            self.emit('status', "⏫ Terminando la descarga que estaba en segundo plano...")
+            self.download_lock.acquire()
+        
+        try:
+            staged = self.get_staged_update()
+            if staged:
+                self.emit('status', "📦 La actualización ya estaba descargada y verificada")
+                self.progress.update(1, 1)
+                return staged
+            
+            with get_scheduler(self.script_dir).job(priority, "actualización") as job:
+                self.download_job = job
+                try:
+                    update_file = self._download_update(job)
+                finally:
+                    self.download_job = None
+            
+            if update_file:
+                update_info = self.get_update_info() or {}
+                self.state.set('staged_update', {
+                    'version': update_info.get('remote_version'),
+                    'path': os.path.relpath(update_file, self.script_dir),
+                    'timestamp': datetime.now().isoformat(),
+                })
+            return update_file
+        finally:
+            self.download_lock.release()
+    
+    def prefetch_update(self):
+        """Descarga y verifica la actualización pendiente en segundo plano (baja prioridad)"""
+        return self.download_update(priority=PRIORITY_BACKGROUND)
+    
+    def get_staged_update(self):
+        """Ruta de la actualización ya descargada si sigue siendo válida (si no, None).
+        
+        Se vuelve a comprobar contra el manifiesto: leer del disco local lleva
+        un instante y evita instalar una copia dañada o de otra versión.
+        """
+        staged = self.state.get('staged_update')
+        update_info = self.get_update_info()
+        if not staged or not update_info:
+            return None
+        
+        path = os.path.join(self.script_dir, staged.get('path', ''))
+        valid = (staged.get('version') == update_info.get('remote_version')
+                 and self.compare_versions(update_info.get('remote_version', '0.0.0'), VERSION) > 0
+                 and os.path.exists(path)
+                 and self._verify_staged(path, update_info))
+        if not valid:
+            self.state.delete('staged_update')
+            return None
+        return path
+    
+    def _verify_staged(self, path, update_info):
+        if os.path.isdir(path):
+            patch_files = (update_info.get('patches') or {}).get('files') or {}
+            for rel_path, entry in patch_files.items():
+                expected = entry.get('target_sha256')
+                try:
+                    staged_path = os.path.join(path, *_safe_parts(rel_path))
+                except ValueError:
+                    return False
+                if expected and file_sha256(staged_path) != expected:
+                    return False
+            return True
+        if update_info.get('size') is not None and os.path.getsize(path) != update_info['size']:
+            return False
+        return not update_info.get('sha256') or file_sha256(path) == update_info['sha256']
+    
+    def apply_staged_update(self):
+        """Instala la actualización descargada en segundo plano (None si no hay ninguna)"""
+        staged = self.get_staged_update()
+        if not staged:
+            return None
+        version = (self.get_update_info() or {}).get('remote_version')
+        self.emit('status', f"📦 Instalando la actualización {version} descargada en segundo plano...")
+        success, message = self.apply_update(staged)
+        if not success:
+            # No volver a intentarlo en cada inicio: se ofrecerá de nuevo con el diálogo
+            self.state.delete('staged_update')
+            self.state.flush()
+        return success, message
+    
+    def discard_staged_update(self):
+        """Olvida la actualización descargada en segundo plano (el usuario la canceló)"""
+        self.state.delete('staged_update')
+        self.state.flush()
+        # Si hay otra descarga en curso su carpeta no se toca: al terminar se volverá a ofrecer
+        if self.download_lock.acquire(blocking=False):
+            try:
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+            finally:
+                self.download_lock.release()
+        self.emit('status', "🗑️ Actualización descargada descartada")
+    
+    def _download_update(self, job):
+        try:
+            update_info = self.get_update_info()
+            if not update_info:
+                raise ValueError("No hay ninguna actualización pendiente")
+            
+            # Limpiar directorio temporal
+            os.makedirs(self.temp_dir, exist_ok=True)
+            for file in os.listdir(self.temp_dir):
+                path = os.path.join(self.temp_dir, file)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            
+            # Intentar primero con parches desde la versión actual
+            staged_dir = self.download_patches(update_info, job)
+            if staged_dir:
+                return staged_dir
+            
+            download_url = update_info.get('download_url')
+            if not download_url:
+                self.emit('status', "❌ No hay URL de descarga disponible")
+                return False
+            
+            self.emit('status', "📥 Descargando actualización...")
+            self.progress.reset()
+            
+            # Descargar archivo
+            temp_file = os.path.join(self.temp_dir, UPDATE_FILE)
+            
+            # El SHA-256 se calcula mientras llegan los bytes: sin segunda lectura
+            download_file(download_url, temp_file,
+                          expected_sha256=update_info.get('sha256'),
+                          expected_size=update_info.get('size'),
+                          chunks=update_info.get('chunks'),
+                          progress=self.progress.update,
+                          status=self.report_status,
+                          job=job,
+                          base_dir=self.script_dir)
+            
+            if update_info.get('sha256'):
+                self.emit('status', "✅ Descarga completada y verificada")
+            else:
+                self.emit('status', "✅ Descarga completada (el manifiesto no incluye hash)")
+            return temp_file
+            
+        except IntegrityError as e:
+            self.last_error = f"Descarga corrupta: {str(e)}"
+            self.emit('status', f"🛑 {self.last_error}")
+            return False
+        except Exception as e:
+            self.last_error = f"Error en descarga: {str(e)}"
+            self.emit('status', f"❌ {self.last_error}")
+            return False
+    
+    def download_patches(self, update_info, job=None):
+        """Descarga y aplica en streaming los parches N-1 → N en una carpeta de staging.
+        
+        Devuelve la carpeta con los archivos reconstruidos, o None si hay que
+        recurrir a la descarga completa.
+        """
+        patches = update_info.get('patches') or {}
+        patch_files = patches.get('files') or {}
+        if not patch_files or patches.get('from') != VERSION:
+            return None
+        
+        base_url = urllib.parse.urljoin(update_info.get('manifest_url', self.update_server), patches.get('base_url', ''))
+        staged_dir = os.path.join(self.temp_dir, PATCH_STAGING_DIR)
+        total_size = sum(entry.get('size', 0) for entry in patch_files.values()) or 1
+        done_size = 0
+        
+        try:
+            # Las rutas salen del manifiesto: nada de '..' ni rutas absolutas (el staging se instala tal cual)
+            parts = {rel_path: _safe_parts(rel_path) for rel_path in patch_files}
+            
+            # Comprobar que los archivos locales son exactamente los de la versión de origen
+            for rel_path, entry in patch_files.items():
+                source_sha = entry.get('source_sha256')
+                if source_sha and file_sha256(os.path.join(self.script_dir, *parts[rel_path])) != source_sha:
+                    self.emit('status', f"⚠️ {rel_path} fue modificado localmente, se usará la descarga completa")
+                    return None
+            
+            self.emit('status', f"🧩 Descargando {len(patch_files)} parches...")
+            self.progress.reset()
+            
+            for rel_path, entry in patch_files.items():
+                patch_url = urllib.parse.urljoin(base_url, urllib.parse.quote(entry['patch']))
+                source_path = os.path.join(self.script_dir, *parts[rel_path]) if entry.get('source_sha256') else None
+                target_path = os.path.join(staged_dir, *parts[rel_path])
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                
+                # El parche se aplica mientras llega desde la red
+                # Los parches van en carpetas por versión: el caché local puede guardarlos por URL
+                with open_url(patch_url, timeout=30, immutable=True, base_dir=self.script_dir) as response:
+                    apply_patch(source_path, job.wrap(response) if job else response,
+                                target_path, entry.get('target_sha256'))
+                
+                done_size += entry.get('size', 0)
+                self.progress.update(done_size, total_size)
+            
+            self.emit('status', "✅ Parches aplicados y verificados")
+            return staged_dir
+            
+        except (DeltaError, urllib.error.URLError, OSError, ValueError) as e:
+            self.emit('status', f"⚠️ Falló el parche ({str(e)}), descargando actualización completa...")
+            shutil.rmtree(staged_dir, ignore_errors=True)
+            return None
+    
+    def create_backup(self):
+        """Crea una copia de seguridad de los archivos actuales"""
+        self.emit('status', "💾 Creando copia de seguridad...")
+        
+        with BACKUP_SECONDS.time():
+            try:
+                # Limpiar backup anterior
+                if os.path.exists(self.backup_dir):
+                    shutil.rmtree(self.backup_dir)
+                os.makedirs(self.backup_dir, exist_ok=True)
+                
+                # Archivos a respaldar
+                files_to_backup = [
+                    'launcher.py',
+                    PACK_FILE,
+                    'assets/logo.png',
+                    'assets/fondo.png',
+                    'assets/background.png'
+                ]
+                
+                # Incluir también los archivos que trae la actualización
+                update_info = self.get_update_info() or {}
+                for file_path in update_info.get('files', []):
+                    if file_path not in files_to_backup:
+                        files_to_backup.append(file_path)
+                
+                for file_path in files_to_backup:
+                    # La lista sale del manifiesto: nada fuera de la instalación
+                    try:
+                        parts = _safe_parts(file_path)
+                    except ValueError as e:
+                        self.emit('status', f"⚠️ {e}, no se respalda")
+                        continue
+                    full_path = os.path.join(self.script_dir, *parts)
+                    if os.path.isfile(full_path):
+                        # Crear directorios necesarios
+                        dest_path = os.path.join(self.backup_dir, *parts)
+                        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                        
+                        # Copiar archivo
+                        shutil.copy2(full_path, dest_path)
+                
+                self.emit('status', "✅ Copia de seguridad creada")
+                return True
+                
+            except Exception as e:
+                self.emit('status', f"⚠️ Error en backup: {str(e)}")
+                return False
+    
+    def apply_update(self, update_file):
+        """Aplica la actualización"""
+        with APPLY_SECONDS.time():
+            success, message = self._apply_update(update_file)
+        UPDATES_APPLIED.labels(result='ok' if success else 'failed').inc()
+        return success, message
+    
+    def _apply_update(self, update_file):
+        try:
+            self.emit('status', "🔄 Aplicando actualización...")
+            self.created_paths = []
+            
+            # Crear backup primero
+            if not self.create_backup():
+                self.emit('status', "⚠️ Continuando sin backup...")
+            
+            # Un archivo proyectado en memoria no se puede reemplazar en Windows
+            release_open_packs()
+            
+            if os.path.isdir(update_file):
+                # Copiar los archivos ya reconstruidos a partir de parches
+                changed_files = self.install_staged_files(update_file)
+            else:
+                changed_files = self.extract_update_zip(update_file)
+            
+            # Leer la información de versión antes de que la limpieza la borre
+            update_info = self.get_update_info() or {}
+            
+            # Los assets pueden haber cambiado: descartar sus imágenes preescaladas
+            ImageCache(self.script_dir).invalidate(
+                [os.path.join(self.script_dir, rel_path) for rel_path in changed_files])
+            self.emit('files_changed', changed_files)
+            
+            # Limpiar archivos temporales
+            self.cleanup_temp_files()
+            
+            self.emit('status', "✨ ¡Actualización aplicada con éxito!")
+            
+            return True, update_info.get('remote_version', '')
+            
+        except Exception as e:
+            self.emit('status', f"❌ Error aplicando update: {str(e)}")
+            
+            # Intentar restaurar desde backup
+            self.restore_backup()
+            return False, str(e)
+    
+    def extract_update_zip(self, update_file):
+        """Extrae el zip completo de la actualización"""
+        with zipfile.ZipFile(update_file, 'r') as zip_ref:
+            # Obtener lista de archivos
+            members = zip_ref.infolist()
+            total_size = sum(member.file_size for member in members) or 1
+            extracted = 0
+            self.progress.reset()
+            
+            # Extraer cada archivo a un temporal y reemplazarlo de una vez: así
+            # un assets.pack abierto (mmap) nunca se ve truncado a medias
+            for member in members:
+                dst_path = os.path.join(self.script_dir, *_safe_parts(member.filename))
+                self._record_created(dst_path)
+                if member.is_dir():
+                    os.makedirs(dst_path, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                tmp_path = dst_path + ".new"
+                self._record_created(tmp_path)
+                with zip_ref.open(member) as src, open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                os.replace(tmp_path, dst_path)
+                
+                # Actualizar progreso
+                extracted += member.file_size
+                self.progress.update(extracted, total_size)
+        
+        return [member.filename for member in members if not member.is_dir()]
+    
+    def install_staged_files(self, staged_dir):
+        """Copia los archivos parcheados desde la carpeta de staging"""
+        staged_files = []
+        for root, dirs, files in os.walk(staged_dir):
+            for file in files:
+                staged_files.append(os.path.relpath(os.path.join(root, file), staged_dir))
+        
+        total_size = sum(os.path.getsize(os.path.join(staged_dir, f)) for f in staged_files) or 1
+        installed = 0
+        self.progress.reset()
+        for rel_path in staged_files:
+            src_path = os.path.join(staged_dir, rel_path)
+            dst_path = os.path.join(self.script_dir, rel_path)
+            self._record_created(dst_path)
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            installed += os.path.getsize(src_path)
+            # os.replace es atómico dentro del mismo volumen
+            os.replace(src_path, dst_path)
+            
+            self.progress.update(installed, total_size)
+        
+        return [rel_path.replace(os.sep, '/') for rel_path in staged_files]
+    
+    def _record_created(self, path):
+        """Anota `path` (o su primera carpeta que aún no existe) si la instalación lo va a crear"""
+        created = path
+        parent = os.path.dirname(path)
+        while parent != self.script_dir and not os.path.exists(parent):
+            created = parent
+            parent = os.path.dirname(parent)
+        if not os.path.exists(created) and created not in self.created_paths:
+            self.created_paths.append(created)
+    
+    def restore_backup(self):
+        """Restaura la copia de seguridad en caso de error"""
+        try:
+            self.emit('status', "🔄 Restaurando desde copia de seguridad...")
+            
+            # Lo que trajo la actualización y no existía antes no está en la copia: se borra
+            for path in reversed(self.created_paths):
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.exists(path):
+                    os.remove(path)
+            self.created_paths = []
+            
+            if os.path.exists(self.backup_dir):
+                # Copiar archivos del backup
+                for root, dirs, files in os.walk(self.backup_dir):
+                    for file in files:
+                        src_path = os.path.join(root, file)
+                        rel_path = os.path.relpath(src_path, self.backup_dir)
+                        dst_path = os.path.join(self.script_dir, rel_path)
+                        
+                        # Crear directorio si no existe
+                        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                        
+                        # Copiar archivo
+                        shutil.copy2(src_path, dst_path)
+                
+                self.emit('status', "✅ Restauración completada")
+                return True
+            else:
+                self.emit('status', "⚠️ No hay copia de seguridad disponible")
+                return False
+                
+        except Exception as e:
+            self.emit('status', f"❌ Error en restauración: {str(e)}")
+            return False
+    
+    def cleanup_temp_files(self):
+        """Limpia archivos temporales"""
+        try:
+            if os.path.exists(self.temp_dir):
+                shutil.rmtree(self.temp_dir)
+        except OSError as e:
+            self.emit('status', f"⚠️ No se pudo limpiar {self.temp_dir}: {e}")
+        
+        # Olvidar la actualización pendiente (se escribe ya: tras esto suele reiniciarse el proceso)
+        self.state.delete('update_info')
+        self.state.delete('staged_update')
+        self.state.flush()
+        self.emit('status', "🧹 Archivos temporales limpiados")
+    
+    def get_update_info(self):
+        """Obtiene información de la actualización pendiente"""
+        return self.state.get('update_info')
@@ -0,0 +1,68 @@
+import http.server
+import os
+import re
+import socket
+import sys
+import threading
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Las pruebas nunca deben usar un caché de la red local de verdad
+os.environ['SAKURA_LAN_CACHE'] = "off"
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Sirve server.files (ruta → bytes) con soporte para una cabecera Range"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('Range')))
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        match = _RANGE.match(self.headers.get('Range') or "")
+        if match and self.server.ranges:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(data)}")
+            data = data[start:end + 1]
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.after_request()
+
+
+@pytest.fixture
+def http_server():
+    """Servidor HTTP local: server.files[ruta] = bytes; server.url es la raíz"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.files = {}
+    server.requests = []
+    server.ranges = True
+    server.after_request = lambda: None  # Para cambiar lo que se sirve entre peticiones
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_port_url():
+    """URL de un puerto local en el que no escucha nadie (conexión rechazada)"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
@@ -0,0 +1,71 @@
+"""Paquete de assets en un solo archivo (sakura/asset_pack.py)"""
+import hashlib
+import os
+
+import pytest
+
+from sakura.asset_pack import ALIGNMENT, AssetPack, PackError, build_pack, release_open_packs
+
+
+def make_files(tmp_path, contents):
+    files = {}
+    for name, data in contents.items():
+        path = tmp_path / "src" / (name.replace("/", "_") + ".png")
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+        files[name] = str(path)
+    return files
+
+
+def test_build_and_read_back(tmp_path):
+    contents = {'logo': b"logo" * 10, 'icons/discord': b"d", 'background': os.urandom(5000)}
+    pack_path = str(tmp_path / "assets.pack")
+    entries = build_pack(make_files(tmp_path, contents), pack_path)
+
+    assert list(entries) == sorted(contents)
+    assert all(entry['offset'] % ALIGNMENT == 0 for entry in entries.values())
+
+    pack = AssetPack(pack_path)
+    assert sorted(pack.names()) == sorted(contents)
+    for name, data in contents.items():
+        view = pack.view(name)
+        assert view.readonly
+        assert bytes(view) == data
+        view.release()
+        assert pack.entry(name)['sha256'] == hashlib.sha256(data).hexdigest()
+    assert pack.release()
+
+
+def test_same_input_gives_the_same_pack(tmp_path):
+    files = make_files(tmp_path, {'b': b"bb", 'a': b"a"})
+    build_pack(files, str(tmp_path / "one.pack"))
+    build_pack(dict(reversed(list(files.items()))), str(tmp_path / "two.pack"))
+
+    assert (tmp_path / "one.pack").read_bytes() == (tmp_path / "two.pack").read_bytes()
+
+
+def test_release_waits_for_open_views(tmp_path):
+    pack_path = str(tmp_path / "assets.pack")
+    build_pack(make_files(tmp_path, {'logo': b"logo"}), pack_path)
+    pack = AssetPack(pack_path)
+
+    view = pack.view('logo')
+    assert not release_open_packs()
+    view.release()
+    assert release_open_packs()
+    # Se vuelve a proyectar sola en la siguiente lectura
+    with pack.view('logo') as view:
+        assert bytes(view) == b"logo"
+
+
+def test_invalid_packs_are_rejected(tmp_path):
+    not_a_pack = tmp_path / "bad.pack"
+    not_a_pack.write_bytes(b"PNG...")
+    with pytest.raises(PackError):
+        AssetPack(str(not_a_pack))
+
+    pack_path = tmp_path / "assets.pack"
+    build_pack(make_files(tmp_path, {'logo': b"x" * 1000}), str(pack_path))
+    pack_path.write_bytes(pack_path.read_bytes()[:-500])
+    with pytest.raises(PackError):
+        AssetPack(str(pack_path))
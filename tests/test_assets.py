@@ -0,0 +1,61 @@
+"""Índice de assets por nombre lógico (sakura/assets.py)"""
+from sakura.asset_pack import build_pack
+from sakura.assets import AssetIndex
+
+
+def test_loose_files_and_legacy_backgrounds(tmp_path):
+    (tmp_path / "assets" / "icons").mkdir(parents=True)
+    (tmp_path / "assets" / "icons" / "discord.png").write_bytes(b"discord")
+    (tmp_path / "assets" / "logo.png").write_bytes(b"logo")
+    (tmp_path / "fondo.jpg").write_bytes(b"fondo")
+    (tmp_path / "notes.txt").write_bytes(b"no es una imagen")
+    index = AssetIndex(str(tmp_path))
+
+    assert index.names() == ["fondo", "icons/discord", "logo"]
+    # "background" es un alias que prefiere "fondo"
+    background = index.resolve('background')
+    assert background.name == "fondo"
+    with background.open() as data:
+        assert data == b"fondo"
+    assert background.sha256 is None
+    assert index.resolve('missing') is None
+
+
+def test_pack_entries_win_over_loose_files(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "logo.png").write_bytes(b"loose")
+    source = tmp_path / "logo-packed.png"
+    source.write_bytes(b"packed")
+    build_pack({'logo': str(source)}, str(tmp_path / "assets.pack"))
+    source.unlink()
+    index = AssetIndex(str(tmp_path))
+
+    logo = index.resolve('logo')
+    assert logo.pack is not None
+    assert logo.source.endswith("assets.pack:logo")
+    with logo.open() as data:
+        assert bytes(data) == b"packed"
+
+
+def test_index_is_scanned_once_until_invalidated(tmp_path):
+    (tmp_path / "assets").mkdir()
+    index = AssetIndex(str(tmp_path))
+    assert index.names() == []
+
+    (tmp_path / "assets" / "logo.png").write_bytes(b"logo")
+    assert index.names() == []
+    index.invalidate()
+    assert index.names() == ["logo"]
+    assert index.generation == 1
+
+
+def test_extra_roots_fill_in_missing_names(tmp_path):
+    for root, name in (("install", "logo"), ("bundle", "background")):
+        (tmp_path / root / "assets").mkdir(parents=True)
+        (tmp_path / root / "assets" / f"{name}.png").write_bytes(root.encode())
+    (tmp_path / "bundle" / "assets" / "logo.png").write_bytes(b"bundle")
+    index = AssetIndex(str(tmp_path / "install"), extra_roots=[str(tmp_path / "bundle")])
+
+    with index.resolve('logo').open() as data:
+        assert data == b"install"
+    assert index.resolve('background').path.startswith(str(tmp_path / "bundle"))
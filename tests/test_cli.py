@@ -0,0 +1,69 @@
+"""Modo sin interfaz (sakura/cli.py) y eventos del núcleo (sakura/events.py)"""
+import os
+
+import pytest
+
+from sakura import cli
+from sakura.events import EventEmitter
+from sakura.game import LaunchError
+from sakura.mods import ModInfo
+
+
+def test_event_emitter_calls_listeners_in_order():
+    emitter = EventEmitter()
+    calls = []
+    first = emitter.on('status', lambda text: calls.append(("a", text)))
+    emitter.on('status', lambda text: calls.append(("b", text)))
+    emitter.emit('status', "hola")
+    emitter.off('status', first)
+    emitter.off('status', first)
+    emitter.emit('status', "adiós")
+    emitter.emit('progress', 50)
+
+    assert calls == [("a", "hola"), ("b", "hola"), ("b", "adiós")]
+
+
+def test_parser_requires_a_command():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args([])
+    args = cli.build_parser().parse_args(["--limit-rate", "512", "repair", "--dry-run"])
+    assert (args.limit_rate, args.dry_run, args.func) == (512, True, cli.cmd_repair)
+
+
+@pytest.fixture
+def game_dir(tmp_path, monkeypatch):
+    game_dir = tmp_path / "instance"
+    game_dir.mkdir()
+    monkeypatch.setattr(cli, 'load_instance', lambda: {'game_dir': str(game_dir), 'java_version': 17})
+    return game_dir
+
+
+def test_diagnose_prints_the_summary(game_dir, capsys):
+    assert cli.main(["diagnose"]) == cli.EXIT_OK
+    assert "No hay crash reports" in capsys.readouterr().out
+
+    (game_dir / "logs").mkdir()
+    (game_dir / "logs" / "latest.log").write_bytes(b"java.lang.OutOfMemoryError: Java heap space\n")
+    assert cli.main(["diagnose"]) == cli.EXIT_OK
+    assert "Memoria insuficiente (x1)" in capsys.readouterr().out
+
+
+def test_commands_report_a_broken_instance(monkeypatch, capsys):
+    def broken():
+        raise LaunchError("instance.json no es válido")
+    monkeypatch.setattr(cli, 'load_instance', broken)
+
+    for command in (["diagnose"], ["java"], ["mods"], ["repair"]):
+        assert cli.main(command) == cli.EXIT_ERROR
+    assert capsys.readouterr().err.count("instance.json no es válido") == 4
+
+
+def test_mods_exit_code_on_conflicts(game_dir, monkeypatch, capsys):
+    mods = [ModInfo("a-1.jar", "a", "1", "A", "fabric", {}, {}, []),
+            ModInfo("a-2.jar", "a", "2", "A", "fabric", {}, {}, [])]
+    seen = []
+    monkeypatch.setattr(cli, 'index_mods', lambda mods_dir, use_cache: seen.append(mods_dir) or (mods, {}))
+
+    assert cli.main(["mods"]) == cli.EXIT_MISMATCH
+    assert seen == [os.path.join(str(game_dir), "mods")]
+    assert "a está 2 veces" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+"""Concurrencia adaptativa de descargas (sakura/concurrency.py)"""
+import contextlib
+import threading
+
+from sakura.concurrency import AimdController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_window(controller, clock, amount, saturated=True):
+    """Una ventana de medición con `amount` bytes (usando todas las conexiones si `saturated`)"""
+    with contextlib.ExitStack() as stack:
+        if saturated:
+            for _ in range(controller.limit):
+                stack.enter_context(controller.slot())
+        clock.now += controller.window
+        controller.record(amount)
+    return controller.limit
+
+
+def make_controller(**kwargs):
+    clock = FakeClock()
+    changes = []
+    controller = AimdController(clock=clock, on_change=lambda limit, _: changes.append(limit), **kwargs)
+    return controller, clock, changes
+
+
+def test_slow_start_doubles_until_throughput_stops_improving():
+    controller, clock, changes = make_controller(initial=2, maximum=16)
+
+    assert run_window(controller, clock, 1000) == 4
+    assert run_window(controller, clock, 2000) == 8
+    # Sin mejora con el doble de conexiones: fin del arranque lento y se quita una
+    assert run_window(controller, clock, 2000) == 7
+    # A partir de aquí se crece de uno en uno
+    assert run_window(controller, clock, 3000) == 8
+    # Sin mejora pero sin caída fuerte por conexión: se mantiene
+    assert run_window(controller, clock, 3000) == 8
+    assert changes == [4, 8, 7, 8]
+
+
+def test_saturated_link_removes_one_connection():
+    controller, clock, _ = make_controller(initial=4, maximum=16)
+    run_window(controller, clock, 1000)  # 4 → 8
+    # Con el doble de conexiones la velocidad total no sube: por conexión cae a la mitad
+    assert run_window(controller, clock, 1000) == 7
+    assert controller.decreases == 1
+
+
+def test_unsaturated_windows_are_not_evaluated():
+    controller, clock, changes = make_controller(initial=4)
+
+    assert run_window(controller, clock, 10 ** 6, saturated=False) == 4
+    assert run_window(controller, clock, 10 ** 9, saturated=False) == 4
+    assert changes == []
+    assert controller.metrics()['throughput'] == 10 ** 9 / controller.window
+
+
+def test_error_burst_halves_the_limit_once():
+    controller, clock, changes = make_controller(initial=8)
+
+    controller.record_error()
+    controller.record_error()
+    assert controller.limit == 4
+    # Pasada la ventana, un nuevo error vuelve a recortar; nunca por debajo del mínimo
+    clock.now += controller.window
+    controller.record_error()
+    clock.now += controller.window
+    controller.record_error()
+    clock.now += controller.window
+    controller.record_error()
+    assert controller.limit == 1
+    assert changes == [4, 2, 1]
+    assert controller.metrics()['errors'] == 5
+    # Tras un error se acabó el arranque lento
+    assert run_window(controller, clock, 1000) == 2
+
+
+def test_limit_stays_within_bounds():
+    controller, clock, _ = make_controller(initial=50, minimum=2, maximum=6)
+    assert controller.limit == 6
+    for amount in (1000, 2000, 4000):
+        run_window(controller, clock, amount)
+    assert controller.limit == 6
+
+
+def test_slot_blocks_at_the_limit_and_wakes_on_increase():
+    controller, clock, _ = make_controller(initial=1)
+    entered = threading.Event()
+
+    def worker():
+        with controller.slot():
+            entered.set()
+
+    with controller.slot():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not entered.wait(0.1)
+        # La ventana estaba saturada: el límite sube y el hilo en espera entra
+        clock.now += controller.window
+        controller.record(1000)
+        assert entered.wait(2)
+    thread.join(2)
+    assert controller.metrics()['active'] == 0
+
+
+def test_history_records_each_window():
+    controller, clock, _ = make_controller(initial=2)
+    run_window(controller, clock, 1000)
+    run_window(controller, clock, 500, saturated=False)
+
+    history = controller.metrics()['history']
+    assert [limit for _, limit, _ in history] == [4, 4]
+    assert history[0][2] == 1000 / controller.window
@@ -0,0 +1,61 @@
+"""Contenido remoto de las pestañas (sakura/content.py)"""
+import hashlib
+import json
+import os
+
+from sakura.content import ContentStore
+from sakura.state import StateStore, flush_all, get_store
+
+
+def publish(server, tabs, version=1):
+    index = {'version': version, 'tabs': {}}
+    for tab_id, html in tabs.items():
+        server.files[f"/{tab_id}.html"] = html
+        index['tabs'][tab_id] = {'title': tab_id.upper(), 'file': f"{tab_id}.html",
+                                 'sha256': hashlib.sha256(html).hexdigest()}
+    server.files["/index.json"] = json.dumps(index).encode('utf-8')
+
+
+def test_refresh_downloads_only_changed_tabs(tmp_path, http_server):
+    base_dir = str(tmp_path)
+    publish(http_server, {'home': b"<p>hola</p>", 'lore': b"<p>historia</p>"})
+    store = ContentStore(base_dir, server=http_server.url)
+
+    assert sorted(store.refresh()) == ['home', 'lore']
+    assert store.get('home') == ("HOME", "<p>hola</p>")
+
+    publish(http_server, {'home': b"<p>hola</p>", 'lore': b"<p>nueva</p>"}, version=2)
+    http_server.requests.clear()
+    assert store.refresh() == ['lore']
+    assert [path for path, _ in http_server.requests] == ["/index.json", "/lore.html"]
+
+    # Versión y hashes viven en el estado del launcher, no en un archivo propio
+    flush_all()
+    assert get_store(base_dir).get('content')['version'] == 2
+    assert not os.path.exists(os.path.join(base_dir, "cache", "content", "state.json"))
+    assert ContentStore(base_dir, server=http_server.url).get('lore') == ("LORE", "<p>nueva</p>")
+
+
+def test_tampered_tab_is_not_stored(tmp_path, http_server):
+    publish(http_server, {'home': b"<p>hola</p>"})
+    http_server.files["/home.html"] = b"<script>malo</script>"
+    store = ContentStore(str(tmp_path), server=http_server.url)
+
+    assert store.refresh() == []
+    assert store.get('home') is None
+
+
+def test_old_content_state_file_is_migrated(tmp_path):
+    content_dir = tmp_path / "cache" / "content"
+    content_dir.mkdir(parents=True)
+    (content_dir / "state.json").write_text(json.dumps(
+        {'version': 3, 'index_etag': '"abc"', 'tabs': {'home': {'title': "INICIO", 'sha256': "00"}}}))
+    (tmp_path / "launcher_state.json").write_text(json.dumps({'schema': 1, 'last_check': 5}))
+
+    store = StateStore(str(tmp_path), write_delay=0)
+    assert store.get('content')['index_etag'] == '"abc"'
+    assert store.get('last_check') == 5
+
+    store.set('last_check', 6)
+    assert not (content_dir / "state.json").exists()
+    assert json.loads((tmp_path / "launcher_state.json").read_text())['content']['version'] == 3
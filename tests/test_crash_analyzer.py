@@ -0,0 +1,99 @@
+"""Diagnóstico de cierres del juego (sakura/crash_analyzer.py)"""
+import pytest
+
+from sakura import crash_analyzer
+from sakura.crash_analyzer import SIGNATURES, CrashReport, analyze_game_dir
+
+# Una línea de ejemplo por firma y el detalle que debe mostrarse
+SAMPLES = {
+    'out_of_memory': (b"java.lang.OutOfMemoryError: Java heap space", "Java heap space"),
+    'jvm_reserve': (b"Could not reserve enough space for 4194304KB object heap", "4194304KB object heap"),
+    'missing_dependency': (b"Mod 'Sodium' (sodium) 0.5.3 requires any version of mod 'Fabric API', which is missing!",
+                           "Mod 'Sodium' (sodium) 0.5.3 requires any version of mod 'Fabric API'"),
+    'wrong_dependency': (b"Mod 'Iris' (iris) 1.6 requires version 0.5 of 'Sodium', but only the wrong version is present",
+                         "Mod 'Iris' (iris) 1.6 requires version 0.5 of 'Sodium'"),
+    'incompatible_mods': (b"Mod 'OptiFine' (optifine) HD_U is incompatible with 'Sodium'!",
+                          "Mod 'OptiFine' (optifine) HD_U is incompatible with 'Sodium'"),
+    'duplicate_mods': (b"DuplicateModsFoundException: jei, jei", "jei, jei"),
+    'mixin_conflict': (b"Mixin apply for mod create failed", "create"),
+    'java_version': (b"java.lang.UnsupportedClassVersionError: Main has been compiled by class file version 61.0",
+                     "class file version 61.0"),
+    'gpu_driver': (b"The driver does not appear to support OpenGL", "The driver does not appear to support OpenGL"),
+    'native_crash': (b"#  EXCEPTION_ACCESS_VIOLATION (0xc0000005)", "EXCEPTION_ACCESS_VIOLATION"),
+    'ticking_entity': (b"Description: Ticking block entity", "Ticking block entity"),
+}
+
+
+def scan(data):
+    report = CrashReport()
+    crash_analyzer._scan(data, report, "test.log")
+    return report
+
+
+def test_every_signature_has_a_sample():
+    assert sorted(SAMPLES) == sorted(signature.id for signature in SIGNATURES)
+
+
+@pytest.mark.parametrize('signature_id', sorted(SAMPLES))
+def test_signature_is_detected_with_its_detail(signature_id):
+    line, detail = SAMPLES[signature_id]
+    report = scan(b"[12:00:00] [main/INFO]: ok\n" + line + b"\n")
+
+    assert list(report.findings) == [signature_id]
+    assert report.findings[signature_id].examples == [detail]
+
+
+def test_all_signatures_in_one_text_are_found_in_order():
+    data = b"\n".join(line for line, _ in SAMPLES.values()) * 2
+    report = scan(data)
+
+    assert sorted(report.findings) == sorted(SAMPLES)
+    assert all(finding.count == 2 for finding in report.findings.values())
+    assert all(len(finding.examples) == 1 for finding in report.findings.values())
+
+
+def test_summary_lists_findings_and_advice():
+    summary = scan(SAMPLES['out_of_memory'][0]).summary()
+
+    assert "Memoria insuficiente (x1)" in summary
+    assert "↳ Java heap space" in summary
+    assert "No se reconoció" not in summary
+    assert "No se reconoció" in scan(b"todo bien").summary()
+
+
+def write_log(game_dir, lines):
+    logs = game_dir / "logs"
+    logs.mkdir(parents=True)
+    (logs / "latest.log").write_bytes(b"\n".join(lines) + b"\n")
+
+
+def test_large_log4j_log_only_scans_error_regions_and_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(crash_analyzer, 'TAIL_SIZE', 1024)
+    filler = [b"[12:00:00] [Render thread/INFO]: Loaded 1234 recipes"] * 200
+    write_log(tmp_path, filler + [
+        # Línea INFO: fuera de las regiones revisadas
+        b"[12:00:01] [main/INFO]: Ticking entity in a harmless message",
+        b"[12:00:02] [main/ERROR]: Crash",
+        b"java.lang.OutOfMemoryError: Java heap space",
+        b"\tat net.minecraft.Main.run(Main.java:1)",
+    ] + filler + [b"[12:00:03] [main/INFO]: Mod 'A' (a) 1.0 is incompatible with 'B'"])
+
+    report = analyze_game_dir(str(tmp_path))
+
+    assert sorted(report.findings) == ['incompatible_mods', 'out_of_memory']
+
+
+def test_small_log_is_scanned_whole(tmp_path):
+    write_log(tmp_path, [b"[12:00:01] [main/INFO]: Ticking entity"])
+
+    assert list(analyze_game_dir(str(tmp_path)).findings) == ['ticking_entity']
+
+
+def test_only_recent_crash_reports_are_read(tmp_path):
+    reports = tmp_path / "crash-reports"
+    reports.mkdir()
+    (reports / "crash-old.txt").write_bytes(SAMPLES['native_crash'][0])
+    report = analyze_game_dir(str(tmp_path), since=(reports / "crash-old.txt").stat().st_mtime + 10)
+
+    assert report.findings == {}
+    assert list(analyze_game_dir(str(tmp_path)).findings) == ['native_crash']
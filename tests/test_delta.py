@@ -0,0 +1,63 @@
+"""Parches binarios (sakura/delta.py)"""
+import hashlib
+import io
+import os
+
+import pytest
+
+from sakura.delta import DeltaError, apply_patch, file_sha256, make_patch
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize('change', ['insert', 'delete', 'append', 'new_file'])
+def test_patch_round_trip(tmp_path, change):
+    old = os.urandom(64 * 1024)
+    new = {
+        'insert': old[:1000] + b"nuevo" + old[1000:],
+        'delete': old[:5000] + old[9000:],
+        'append': old + os.urandom(3000),
+        'new_file': os.urandom(5000),
+    }[change]
+    old_path, new_path = str(tmp_path / "old"), str(tmp_path / "new")
+    write(old_path, old)
+    write(new_path, new)
+    patch_path, target_path = str(tmp_path / "patch"), str(tmp_path / "target")
+
+    make_patch(old_path if change != 'new_file' else None, new_path, patch_path)
+    with open(patch_path, 'rb') as patch:
+        apply_patch(old_path if change != 'new_file' else None, patch, target_path, hashlib.sha256(new).hexdigest())
+
+    assert file_sha256(target_path) == hashlib.sha256(new).hexdigest()
+    if change == 'insert':
+        assert os.path.getsize(patch_path) < len(new) // 4
+
+
+def test_patch_against_wrong_source_is_rejected(tmp_path):
+    old_path, new_path, other_path = str(tmp_path / "old"), str(tmp_path / "new"), str(tmp_path / "other")
+    old = os.urandom(10000)
+    write(old_path, old)
+    write(new_path, old[:4000] + b"cambio" + old[4000:])
+    write(other_path, os.urandom(10000))
+    patch_path = str(tmp_path / "patch")
+    make_patch(old_path, new_path, patch_path)
+
+    with open(patch_path, 'rb') as patch, pytest.raises(DeltaError):
+        apply_patch(other_path, patch, str(tmp_path / "target"))
+    assert not os.path.exists(tmp_path / "target")
+
+
+def test_truncated_patch_is_rejected(tmp_path):
+    old_path, new_path = str(tmp_path / "old"), str(tmp_path / "new")
+    write(old_path, os.urandom(10000))
+    write(new_path, os.urandom(10000))
+    patch_path = str(tmp_path / "patch")
+    make_patch(old_path, new_path, patch_path)
+    with open(patch_path, 'rb') as f:
+        data = f.read()
+
+    with pytest.raises(DeltaError):
+        apply_patch(old_path, io.BytesIO(data[:len(data) // 2]), str(tmp_path / "target"))
@@ -0,0 +1,86 @@
+"""Descargas verificadas por bloques (sakura/download.py)"""
+import hashlib
+import os
+import urllib.error
+
+import pytest
+
+from sakura import lan_cache
+from sakura.download import download_file
+from sakura.integrity import IntegrityError, build_chunk_list
+
+CHUNK = 4096
+
+
+def chunk_list(tmp_path, data):
+    path = tmp_path / "source"
+    path.write_bytes(data)
+    return build_chunk_list(str(path), CHUNK)
+
+
+def test_plain_download_is_verified(tmp_path, http_server):
+    data = os.urandom(10000)
+    http_server.files["/a.bin"] = data
+    dest = str(tmp_path / "a.bin")
+
+    download_file(http_server.url + "a.bin", dest, hashlib.sha256(data).hexdigest(), len(data), use_lan_cache=False)
+    assert open(dest, 'rb').read() == data
+
+    with pytest.raises(IntegrityError):
+        download_file(http_server.url + "a.bin", dest, hashlib.sha256(b"otro").hexdigest(), use_lan_cache=False)
+    assert not os.path.exists(dest)
+
+
+def test_chunked_download_repairs_only_damaged_ranges(tmp_path, http_server):
+    data = os.urandom(CHUNK * 8)
+    chunks = chunk_list(tmp_path, data)
+    damaged = bytearray(data)
+    damaged[CHUNK * 3 + 10] ^= 0xFF
+    http_server.files["/a.bin"] = bytes(damaged)
+
+    # La primera respuesta llega dañada; los rangos se sirven ya bien
+    http_server.after_request = lambda: http_server.files.update({"/a.bin": data})
+    dest = str(tmp_path / "a.bin")
+    download_file(http_server.url + "a.bin", dest, hashlib.sha256(data).hexdigest(), len(data),
+                  chunks=chunks, use_lan_cache=False)
+
+    assert open(dest, 'rb').read() == data
+    assert http_server.requests[1] == ("/a.bin", f"bytes={CHUNK * 3}-{CHUNK * 4 - 1}")
+
+
+def test_chunked_download_raises_http_errors_without_repairing(tmp_path, http_server):
+    data = os.urandom(CHUNK * 4)
+    messages = []
+    dest = str(tmp_path / "a.bin")
+
+    with pytest.raises(urllib.error.HTTPError):
+        download_file(http_server.url + "missing.bin", dest, hashlib.sha256(data).hexdigest(), len(data),
+                      chunks=chunk_list(tmp_path, data), status=messages.append, use_lan_cache=False)
+
+    assert len(http_server.requests) == 1
+    assert not any("Reparando" in message for message in messages)
+    assert not os.path.exists(dest)
+
+
+def test_chunked_download_raises_refused_connection(tmp_path, closed_port_url):
+    data = os.urandom(CHUNK * 4)
+    with pytest.raises(urllib.error.URLError):
+        download_file(closed_port_url + "a.bin", str(tmp_path / "a.bin"), hashlib.sha256(data).hexdigest(),
+                      len(data), chunks=chunk_list(tmp_path, data), use_lan_cache=False)
+
+
+def test_dead_mirror_is_reported_and_skipped(tmp_path, http_server, closed_port_url):
+    data = os.urandom(CHUNK * 4)
+    http_server.files["/a.bin"] = data
+    chunks = chunk_list(tmp_path, data)
+    lan_cache.configure(closed_port_url)
+    try:
+        for name in ("a", "b"):
+            download_file(http_server.url + "a.bin", str(tmp_path / name), hashlib.sha256(data).hexdigest(),
+                          len(data), chunks=chunks, base_dir=str(tmp_path))
+        # Tras el primer fallo el espejo queda en pausa: el segundo archivo va directo
+        assert lan_cache.cached_url(http_server.url + "a.bin", hashlib.sha256(data).hexdigest(),
+                                    base_dir=str(tmp_path)) is None
+    finally:
+        lan_cache.configure(None)
+    assert open(tmp_path / "b", 'rb').read() == data
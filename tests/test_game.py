@@ -0,0 +1,67 @@
+"""Lanzamiento del cliente de Minecraft (sakura/game.py)"""
+import json
+import os
+import sys
+
+import pytest
+
+from sakura.game import LaunchError, build_command, launch_game, load_instance
+
+
+def test_load_instance_merges_instance_json(tmp_path):
+    (tmp_path / "instance.json").write_text(json.dumps({'jvm_args': ["-Xmx6G"], 'game_dir': "game"}))
+    instance = load_instance(str(tmp_path))
+
+    assert instance['jvm_args'] == ["-Xmx6G"]
+    assert instance['java_version'] == 17
+    assert instance['game_dir'] == os.path.join(str(tmp_path), "game")
+
+    (tmp_path / "instance.json").write_text("{roto")
+    with pytest.raises(LaunchError):
+        load_instance(str(tmp_path))
+
+
+def test_build_command_expands_classpath_and_variables(tmp_path):
+    (tmp_path / "libraries" / "a").mkdir(parents=True)
+    (tmp_path / "libraries" / "a" / "one.jar").write_bytes(b"")
+    (tmp_path / "libraries" / "two.jar").write_bytes(b"")
+    instance = dict(load_instance(str(tmp_path)), java="/jvm/bin/java", game_dir=str(tmp_path),
+                    classpath=["libraries/**/*.jar", "client.jar"])
+
+    command = build_command(instance, "Sakura")
+
+    classpath = command[command.index("-cp") + 1].split(os.pathsep)
+    assert classpath == [str(tmp_path / "libraries" / "a" / "one.jar"), str(tmp_path / "libraries" / "two.jar"),
+                         str(tmp_path / "client.jar")]
+    assert command[:2] == ["/jvm/bin/java", "-Xmx4G"]
+    assert command[command.index("--username") + 1] == "Sakura"
+    assert command[command.index("--assetsDir") + 1] == f"{tmp_path}/assets"
+
+
+def test_build_command_requires_an_installed_instance(tmp_path):
+    with pytest.raises(LaunchError):
+        build_command(load_instance(str(tmp_path)), "Sakura")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="el java de prueba es un script de shell")
+def test_launch_game_runs_the_configured_java(tmp_path):
+    java = tmp_path / "java"
+    java.write_text('#!/bin/sh\nprintf "%s\\n" "$PWD" "$@" > "$PWD/args.txt"\n')
+    java.chmod(0o755)
+    instance = dict(load_instance(str(tmp_path)), java=str(java), classpath=["client.jar"])
+
+    process = launch_game("Sakura", str(tmp_path), instance)
+
+    assert process.wait(10) == 0
+    args = (tmp_path / "instance" / "args.txt").read_text().splitlines()
+    # Se ejecuta dentro de game_dir, que se crea si no existe
+    assert os.path.samefile(args[0], instance['game_dir'])
+    assert args[1:] == build_command(instance, "Sakura")[1:]
+
+
+def test_launch_game_errors(tmp_path):
+    with pytest.raises(LaunchError):
+        launch_game("", str(tmp_path))
+    instance = dict(load_instance(str(tmp_path)), java=str(tmp_path / "missing-java"), classpath=["x"])
+    with pytest.raises(LaunchError):
+        launch_game("Sakura", str(tmp_path), instance)
@@ -0,0 +1,69 @@
+"""Lectura del log del juego (sakura/game_log.py)"""
+import io
+import threading
+
+from sakura.game_log import MAX_LINE_LENGTH, LogLine, LogReader, LogRingBuffer, parse_line
+
+
+def test_parse_vanilla_and_forge_headers():
+    assert parse_line("[12:34:56] [Render thread/INFO]: Loaded 12 recipes\n") == \
+        LogLine("12:34:56", 'INFO', "Render thread", "Loaded 12 recipes")
+    assert parse_line("[12Jan2024 12:34:56.789] [main/WARN] [net.minecraft.client.Minecraft/]: Low memory\r\n") == \
+        LogLine("12:34:56", 'WARN', "main", "Low memory")
+
+
+def test_level_aliases_and_unknown_levels():
+    assert parse_line("[12:00:00] [main/SEVERE]: boom").level == 'ERROR'
+    assert parse_line("[12:00:00] [main/WARNING]: hmm").level == 'WARN'
+    assert parse_line("[12:00:00] [main/NOTICE]: ?").level == 'INFO'
+
+
+def test_lines_without_header_inherit_the_previous_level():
+    line = parse_line("\tat net.minecraft.Main.run(Main.java:1)", previous_level='ERROR')
+    assert line == LogLine("", 'ERROR', "", "\tat net.minecraft.Main.run(Main.java:1)")
+
+
+def test_long_lines_are_truncated():
+    text = parse_line("x" * (MAX_LINE_LENGTH * 3)).text
+    assert len(text) == MAX_LINE_LENGTH + 1
+    assert text.endswith("…")
+
+
+def test_ring_buffer_keeps_the_last_lines():
+    buffer = LogRingBuffer(capacity=3)
+    buffer.extend([1, 2])
+    buffer.extend([3, 4, 5])
+
+    assert buffer.snapshot() == [3, 4, 5]
+    assert buffer.total == 5
+    assert buffer.dropped == 2
+
+
+def test_reader_delivers_batches_and_fills_the_buffer():
+    output = b"".join(b"[12:00:00] [main/INFO]: line %d\n" % i for i in range(500))
+    output += b"[12:00:01] [main/ERROR]: crash\n\tat Foo.bar(Foo.java:1)\n"
+    batches = []
+    lock = threading.Lock()
+
+    def sink(batch):
+        with lock:
+            batches.append(batch)
+
+    buffer = LogRingBuffer(capacity=100)
+    reader = LogReader(io.BytesIO(output), sink, buffer=buffer, batch_interval=0.01).start()
+    reader.join(5)
+
+    lines = [line for batch in batches for line in batch]
+    assert len(lines) == 502
+    # Se agrupan: muchas menos llamadas que líneas
+    assert len(batches) < 50
+    assert lines[-1] == LogLine("", 'ERROR', "", "\tat Foo.bar(Foo.java:1)")
+    assert buffer.total == 502
+    assert buffer.snapshot()[-2].text == "crash"
+
+
+def test_reader_replaces_invalid_utf8():
+    batches = []
+    reader = LogReader(io.BytesIO(b"[12:00:00] [main/INFO]: caf\xe9\n"), batches.append, batch_interval=0).start()
+    reader.join(5)
+    assert batches[0][0].text == "caf�"
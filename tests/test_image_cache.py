@@ -0,0 +1,52 @@
+"""Caché en disco de imágenes escaladas (sakura/image_cache.py)"""
+import os
+
+from sakura.image_cache import ImageCache
+
+
+def store_entry(cache, key, pixels=b"\x01\x02\x03\x04" * 4):
+    cache.store(key, 2, 2, 8, 6, 1.0, pixels)
+
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    source = tmp_path / "logo.png"
+    source.write_bytes(b"png")
+    key = cache.key(str(source), 100, 50, 1.5, 1)
+    store_entry(cache, key)
+
+    assert ImageCache(str(tmp_path)).load(key) == (2, 2, 8, 6, 1.0, b"\x01\x02\x03\x04" * 4)
+
+
+def test_truncated_entry_is_ignored(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    store_entry(cache, "k", pixels=b"\x00" * 15)
+    assert cache.load("k") is None
+    assert cache.load("missing") is None
+
+
+def test_key_changes_and_old_entries_are_purged_when_the_source_changes(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    source = tmp_path / "fondo.png"
+    source.write_bytes(b"v1")
+    old_key = cache.key(str(source), 100, 100, 1.0, 1)
+    store_entry(cache, old_key)
+
+    source.write_bytes(b"version 2")
+    new_key = cache.key(str(source), 100, 100, 1.0, 1)
+
+    assert new_key != old_key
+    assert cache.load(old_key) is None
+
+
+def test_invalidate_drops_entries_of_updated_files(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    source = tmp_path / "logo.png"
+    source.write_bytes(b"png")
+    key = cache.key(str(source), 10, 10, 1.0, 1)
+    store_entry(cache, key)
+
+    cache.invalidate([str(source)])
+
+    assert cache.load(key) is None
+    assert not [name for name in os.listdir(cache.cache_dir) if name.endswith(".raw")]
@@ -0,0 +1,74 @@
+"""Firmas de manifiestos y hashes de descarga (sakura/integrity.py, sakura/ed25519.py)"""
+import hashlib
+
+import pytest
+
+from sakura import ed25519
+from sakura.integrity import (IntegrityError, build_chunk_list, check_digest, check_manifest, chunk_root,
+                              sign_manifest, verify_chunk_list, verify_manifest)
+
+PRIVATE_KEY = hashlib.sha256(b"sakura-tests").hexdigest()
+PUBLIC_KEY = ed25519.public_key(bytes.fromhex(PRIVATE_KEY)).hex()
+
+
+def test_ed25519_rfc8032_vector():
+    # RFC 8032, sección 7.1, TEST 1 (mensaje vacío)
+    seed = bytes.fromhex("9d61b19deffd5a60ba844af492ec2cc44449c5697b326919703bac031cae7f60")
+    public = ed25519.public_key(seed)
+    signature = ed25519.sign(seed, b"")
+    assert public.hex() == "d75a980182b10ab7d54bfed3c964073a0ee172f3daa62325af021a68f707511a"
+    assert signature.hex() == ("e5564300c360ac729086e2cc806e828a84877f1eb8e5d974d873e06522490155"
+                               "5fb8821590a33bacc61e39701cf9b46bd25bf5f0595bbe24655141438e7a100b")
+    assert ed25519.verify(public, b"", signature)
+    assert not ed25519.verify(public, b"x", signature)
+
+
+def test_signed_manifest_verifies():
+    manifest = {'version': "1.0.0", 'download_url': "https://example.com/update.zip"}
+    manifest['signature'] = sign_manifest(manifest, PRIVATE_KEY)
+    verify_manifest(manifest, PUBLIC_KEY)
+    assert check_manifest(manifest, PUBLIC_KEY)
+
+
+def test_tampered_manifest_is_rejected():
+    manifest = {'version': "1.0.0", 'download_url': "https://example.com/update.zip"}
+    manifest['signature'] = sign_manifest(manifest, PRIVATE_KEY)
+    manifest['download_url'] = "https://evil.example/update.zip"
+    with pytest.raises(IntegrityError):
+        verify_manifest(manifest, PUBLIC_KEY)
+
+
+@pytest.mark.parametrize('signature', [None, "", "zz", "00" * 64])
+def test_missing_or_malformed_signature_is_rejected(signature):
+    manifest = {'version': "1.0.0"}
+    if signature is not None:
+        manifest['signature'] = signature
+    with pytest.raises(IntegrityError):
+        check_manifest(manifest, PUBLIC_KEY)
+
+
+def test_without_public_key_the_manifest_is_not_checked():
+    assert check_manifest({'version': "1.0.0"}, "") is False
+
+
+def test_check_digest():
+    data = b"sakura" * 100
+    check_digest(hashlib.sha256(data), hashlib.sha256(data).hexdigest().upper(), len(data), len(data))
+    with pytest.raises(IntegrityError):
+        check_digest(hashlib.sha256(data), hashlib.sha256(b"otro").hexdigest(), len(data))
+    with pytest.raises(IntegrityError):
+        check_digest(hashlib.sha256(data), None, len(data) - 1, len(data))
+
+
+def test_chunk_list(tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(b"a" * 2500)
+    chunks = build_chunk_list(str(path), 1000)
+    assert len(chunks['sha256']) == 3
+    assert chunks['root'] == chunk_root(chunks['sha256'])
+    verify_chunk_list(chunks, 2500)
+
+    with pytest.raises(IntegrityError):
+        verify_chunk_list(chunks, 3500)
+    with pytest.raises(IntegrityError):
+        verify_chunk_list(dict(chunks, root="00" * 32), 2500)
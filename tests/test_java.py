@@ -0,0 +1,93 @@
+"""Detección de Java (sakura/java.py)"""
+import os
+import shutil
+import sys
+
+import pytest
+
+from sakura import java
+from sakura.java import JavaRuntime, find_runtimes, parse_version_output, select_runtime
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="los binarios de prueba son scripts de shell")
+
+OPENJDK_17 = ('openjdk version "17.0.8" 2023-07-18\n'
+              'OpenJDK Runtime Environment Temurin-17.0.8+7 (build 17.0.8+7)\n'
+              'OpenJDK 64-Bit Server VM Temurin-17.0.8+7 (build 17.0.8+7, mixed mode)\n')
+JAVA_8 = ('java version "1.8.0_381"\n'
+          'Java(TM) SE Runtime Environment (build 1.8.0_381-b09)\n'
+          'Java HotSpot(TM) Client VM (build 25.381-b09, mixed mode)\n')
+
+
+def test_parse_version_output():
+    assert parse_version_output(OPENJDK_17) == (
+        "17.0.8", 17, True, "OpenJDK Runtime Environment Temurin-17.0.8+7 (build 17.0.8+7)")
+    assert parse_version_output(JAVA_8)[:3] == ("1.8.0_381", 8, False)
+    assert parse_version_output("bash: java: command not found") is None
+
+
+def runtime(version, major, is_64bit=True):
+    return JavaRuntime(f"/jvm/{version}/bin/java", version, major, is_64bit, "")
+
+
+def test_select_runtime_prefers_the_required_major_then_64_bits_then_newest():
+    runtimes = [runtime("21.0.1", 21), runtime("17.0.2", 17, is_64bit=False),
+                runtime("17.0.8", 17), runtime("17.0.10", 17), runtime("1.8.0_381", 8)]
+
+    assert select_runtime(runtimes, 17).version == "17.0.10"
+    assert select_runtime(runtimes[:2] + runtimes[4:], 17).version == "17.0.2"
+    assert select_runtime([runtime("21.0.1", 21), runtime("22", 22)], 17).version == "21.0.1"
+    assert select_runtime([runtime("1.8.0_381", 8)], 17) is None
+
+
+def fake_java(root, name, script):
+    """JAVA_HOME falso en root/name cuyo bin/java es un script de shell"""
+    binary = root / name / "bin" / "java"
+    binary.parent.mkdir(parents=True)
+    # El PATH de la prueba está vacío: cat y sleep van con su ruta completa
+    binary.write_text("#!/bin/sh\n" + script.format(cat=CAT, sleep=SLEEP))
+    binary.chmod(0o755)
+    return str(binary)
+
+
+CAT = shutil.which("cat")
+SLEEP = shutil.which("sleep")
+
+
+@pytest.fixture
+def jvm_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("JAVA_HOME", raising=False)
+    monkeypatch.setenv("PATH", "")
+    root = tmp_path / "jvm"
+    root.mkdir()
+    return root
+
+
+def test_find_runtimes_probes_only_new_binaries(tmp_path, jvm_dir, monkeypatch):
+    temurin = fake_java(jvm_dir, "temurin-17", "{cat} >&2 <<'EOF'\n" + OPENJDK_17 + "EOF\n")
+    fake_java(jvm_dir, "not-java", "echo hola\n")
+    patterns = [str(jvm_dir / "*")]
+    base_dir = str(tmp_path)
+
+    found = find_runtimes(base_dir, patterns)
+    assert [(r.path, r.major) for r in found] == [(os.path.realpath(temurin), 17)]
+
+    probed = []
+    real_probe = java._probe
+    monkeypatch.setattr(java, '_probe', lambda path: probed.append(path) or real_probe(path))
+    assert find_runtimes(base_dir, patterns) == found
+    # Tanto la JVM como el binario que no lo es quedan en la caché
+    assert probed == []
+
+    java8 = fake_java(jvm_dir, "java-8", "{cat} >&2 <<'EOF'\n" + JAVA_8 + "EOF\n")
+    found = find_runtimes(base_dir, patterns)
+    assert probed == [os.path.realpath(java8)]
+    assert sorted(r.major for r in found) == [8, 17]
+
+
+def test_probes_that_time_out_are_not_cached(tmp_path, jvm_dir, monkeypatch):
+    monkeypatch.setattr(java, 'PROBE_TIMEOUT', 0.2)
+    slow = fake_java(jvm_dir, "slow", "{sleep} 5\n")
+    patterns = [str(jvm_dir / "*")]
+
+    assert find_runtimes(str(tmp_path), patterns) == []
+    assert os.path.realpath(slow) not in java.get_store(str(tmp_path)).get(java.CACHE_KEY)
@@ -0,0 +1,152 @@
+"""Caché de actualizaciones en la red local (sakura/lan_cache.py)"""
+import hashlib
+import http.client
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from sakura import lan_cache
+from sakura.lan_cache import CacheServer, _manifest_urls, cached_url, configure, find_cache, report_failure
+
+
+@pytest.fixture
+def client():
+    """Estado del cliente limpio antes y después de cada prueba"""
+    configure(None)
+    yield
+    configure(None)
+
+
+def test_manifest_urls():
+    manifest = {
+        'download_url': "https://cdn.example.com/sakura-1.0.zip",
+        'patches': {'base_url': "patches/1.0/"},
+        'base_url': "objects/",
+        'files': {'mods/a.jar': {'sha256': "00"}, 'mods/b.jar': {'url': "https://mirror.example.com/b.jar"}},
+    }
+    assert _manifest_urls("https://updates.example.com/launcher/version.json", manifest) == [
+        "https://cdn.example.com/sakura-1.0.zip",
+        "https://updates.example.com/launcher/patches/1.0/",
+        "https://updates.example.com/launcher/objects/",
+        "https://mirror.example.com/b.jar",
+    ]
+
+
+def make_cache(tmp_path, http_server, manifest=None):
+    if manifest is not None:
+        http_server.files["/version.json"] = json.dumps(manifest).encode('utf-8')
+    return CacheServer(str(tmp_path / "lan_cache"), upstreams=(http_server.url + "launcher/",),
+                       host="127.0.0.1", port=0, discovery_port=None,
+                       manifests=(http_server.url + "version.json",))
+
+
+def test_is_allowed_only_upstreams_and_manifest_targets(tmp_path, http_server):
+    cache = make_cache(tmp_path, http_server, {'download_url': "https://cdn.example.com/sakura.zip",
+                                               'patches': {'base_url': "patches/"}})
+    base = http_server.url
+
+    assert cache.is_allowed(base + "launcher/app.zip")
+    assert cache.is_allowed("https://cdn.example.com/sakura.zip")
+    assert cache.is_allowed(base + "patches/1.0/a.patch")
+    assert not cache.is_allowed("https://cdn.example.com/other.zip")
+    assert not cache.is_allowed("https://evil.example.com/launcher/")
+    assert not cache.is_allowed(base + "launcher/../secret")
+    assert not cache.is_allowed("file:///etc/passwd")
+
+
+def fetch(cache, url, sha256=None):
+    query = {'url': url}
+    if sha256:
+        query['sha256'] = sha256
+    with urllib.request.urlopen(f"{cache.url}fetch?{urllib.parse.urlencode(query)}", timeout=5) as response:
+        return response.read()
+
+
+def test_blob_is_downloaded_once_and_verified(tmp_path, http_server):
+    data = b"zip" * 100000
+    http_server.files["/launcher/app.zip"] = data
+    sha256 = hashlib.sha256(data).hexdigest()
+    url = http_server.url + "launcher/app.zip"
+
+    with make_cache(tmp_path, http_server) as cache:
+        assert fetch(cache, url, sha256) == data
+        assert fetch(cache, url, sha256) == data
+        assert [path for path, _ in http_server.requests] == ["/launcher/app.zip"]
+        assert cache.status()['hits'] == 1
+
+        # Hash incorrecto: el archivo no se guarda. Según lo rápido que responda el origen la
+        # conexión se corta o llega entera; en los dos casos el cliente lo detecta con el hash
+        wrong = hashlib.sha256(b"otro").hexdigest()
+        try:
+            received = fetch(cache, url, wrong)
+        except (urllib.error.URLError, http.client.HTTPException, OSError):
+            received = None
+        assert received is None or hashlib.sha256(received).hexdigest() != wrong
+        assert not (tmp_path / "lan_cache" / "blobs" / wrong[:2] / wrong).exists()
+
+
+def test_rejected_and_missing_urls(tmp_path, http_server):
+    with make_cache(tmp_path, http_server) as cache:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(cache, "https://evil.example.com/x")
+        assert error.value.code == 403
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(cache, http_server.url + "launcher/missing.json")
+        assert error.value.code == 404
+        assert cache.status()['rejected'] == 1
+
+
+def test_manifest_copy_is_served_when_the_origin_is_down(tmp_path, http_server):
+    http_server.files["/launcher/version.json"] = b'{"version": "1.0"}'
+    url = http_server.url + "launcher/version.json"
+
+    with make_cache(tmp_path, http_server) as cache:
+        assert fetch(cache, url) == b'{"version": "1.0"}'
+        http_server.shutdown()
+        http_server.server_close()
+        # Caducado el TTL, el origen no responde: se sirve la copia guardada
+        for path in (tmp_path / "lan_cache" / "urls").iterdir():
+            os.utime(path, (0, 0))
+        assert fetch(cache, url) == b'{"version": "1.0"}'
+        assert cache.status()['stale'] == 1
+
+
+def test_prune_removes_least_recently_used(tmp_path, http_server):
+    cache = make_cache(tmp_path, http_server)
+    cache.max_bytes = 150
+    folder = tmp_path / "lan_cache" / "blobs" / "aa"
+    folder.mkdir(parents=True)
+    for age, name in enumerate(["new", "middle", "old"]):
+        path = folder / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 - age, 1000 - age))
+
+    cache.prune()
+    assert sorted(path.name for path in folder.iterdir()) == ["new"]
+
+
+def test_find_cache_uses_configured_mirror(client):
+    assert find_cache() is None
+    configure("http://10.0.0.5:8733")
+    assert find_cache() == "http://10.0.0.5:8733/"
+    assert cached_url("https://example.com/version.json") == \
+        "http://10.0.0.5:8733/fetch?url=https%3A%2F%2Fexample.com%2Fversion.json"
+
+    # Tras un fallo de conexión se va directo a internet un rato; un error HTTP no cuenta
+    report_failure(urllib.error.HTTPError("http://x", 404, "Not Found", {}, None))
+    assert find_cache() is not None
+    report_failure(ConnectionRefusedError())
+    assert find_cache() is None
+
+
+def test_discovered_mirror_only_serves_hashed_files(client, monkeypatch):
+    monkeypatch.setattr(lan_cache, '_found', "http://10.0.0.9:8733/")
+    monkeypatch.setattr(lan_cache, '_checked_at', lan_cache.time.monotonic())
+    monkeypatch.setattr(lan_cache, '_override', "auto")
+
+    assert cached_url("https://example.com/version.json") is None
+    assert cached_url("https://example.com/app.zip", sha256="ab" * 32).startswith("http://10.0.0.9:8733/fetch?")
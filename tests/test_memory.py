@@ -0,0 +1,35 @@
+"""Uso de memoria y prioridad del proceso (sakura/memory.py)"""
+import os
+import sys
+
+import pytest
+
+from sakura import memory
+from sakura.memory import current_rss, format_rss, set_background_priority, trim_memory
+
+
+def test_current_rss_grows_with_allocations():
+    before = current_rss()
+    assert before > 0
+    block = bytearray(64 * 1024 * 1024)
+    block[::4096] = b"x" * len(block[::4096])  # Tocar cada página para que cuente como residente
+    assert current_rss() > before
+    del block
+    trim_memory()
+
+
+def test_format_rss():
+    assert format_rss(3 * 1024 * 1024) == "3.0 MB"
+    assert format_rss(0) == "desconocida"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="niceness sólo en Linux/macOS")
+def test_background_priority_lowers_niceness(monkeypatch):
+    calls = []
+    monkeypatch.setattr(memory, '_normal_niceness', None)
+    monkeypatch.setattr(os, 'getpriority', lambda which, who: 0)
+    monkeypatch.setattr(os, 'setpriority', lambda which, who, value: calls.append(value))
+
+    assert set_background_priority(True)
+    assert set_background_priority(False)
+    assert calls == [memory.BACKGROUND_NICENESS, 0]
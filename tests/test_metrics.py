@@ -0,0 +1,60 @@
+"""Registro y exportador de métricas (sakura/metrics.py)"""
+import json
+import socket
+import time
+import urllib.request
+
+from sakura.metrics import MetricsExporter, Registry
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_text_format_and_json():
+    registry = Registry()
+    downloads = registry.counter("test_downloads_total", "Descargas", ('source',))
+    downloads.labels(source='direct').inc(3)
+    latency = registry.histogram("test_latency_seconds", "Latencia", buckets=(0.1, 1.0))
+    latency.observe(0.5)
+
+    text = registry.render_text()
+    assert 'test_downloads_total{source="direct"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'test_latency_seconds_bucket{le="1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 1' in text
+    assert 'test_latency_seconds_count 1' in text
+    assert json.loads(json.dumps(registry.as_dict()))['test_downloads_total']['type'] == "counter"
+
+
+def test_textfile_is_written_on_stop(tmp_path):
+    registry = Registry()
+    registry.gauge("test_value", "Valor").set(7)
+    path = tmp_path / "metrics.prom"
+    exporter = MetricsExporter(registry, path=str(path), port=0, interval=3600).start()
+    registry.gauge("test_value", "Valor").set(8)
+    exporter.stop()
+    assert "test_value 8" in path.read_text()
+
+
+def test_stop_without_waiting_returns_at_once_and_can_restart():
+    registry = Registry()
+    registry.gauge("test_value", "Valor").set(1)
+    exporter = MetricsExporter(registry, path="off", port=free_port(), interval=3600).start()
+    url = exporter.url
+    with urllib.request.urlopen(url + "metrics", timeout=5) as response:
+        assert b"test_value 1" in response.read()
+
+    start = time.perf_counter()
+    exporter.stop(wait=False)
+    assert time.perf_counter() - start < 0.2
+
+    # Reanudar en el mismo puerto espera a que el cierre anterior lo libere
+    exporter.start()
+    try:
+        with urllib.request.urlopen(url + "metrics", timeout=5) as response:
+            assert response.status == 200
+    finally:
+        exporter.stop()
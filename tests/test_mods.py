@@ -0,0 +1,172 @@
+"""Índice de mods y rangos de versión (sakura/mods.py)"""
+import json
+import os
+import zipfile
+
+import pytest
+
+from sakura import mods
+from sakura.mods import ModIndexError, ModInfo, find_issues, index_mods, read_entries, read_mod, version_in_range
+
+
+@pytest.mark.parametrize('version, spec, expected', [
+    ("1.2.3", "*", True),
+    ("1.2.3", "", True),
+    ("1.2.3", ">=1.2", True),
+    ("1.1.9", ">=1.2", False),
+    ("0.5.3", ">=0.5 <0.6", True),
+    ("0.6.0", ">=0.5 <0.6", False),
+    ("1.20.1", "1.20.x", True),
+    ("1.19.4", "1.20.x", False),
+    ("1.2.9", "~1.2.3", True),
+    ("1.3.0", "~1.2.3", False),
+    ("1.9.0", "^1.2.3", True),
+    ("2.0.0", "^1.2.3", False),
+    ("2.0.0", "<1.0 || >=2.0", True),
+    ("1.5.0", "<1.0 || >=2.0", False),
+    ("1.0-beta.1", "<1.0", True),
+    ("1.0-beta.1", ">=1.0", False),
+    ("1.0+build.5", "=1.0", True),
+    # Lo que no se entiende no se marca ni como dentro ni como fuera
+    ("snapshot", ">=1.0", None),
+    ("1.0", ">=banana", None),
+])
+def test_fabric_predicates(version, spec, expected):
+    assert version_in_range(version, spec) is expected
+
+
+@pytest.mark.parametrize('version, spec, expected', [
+    ("1.5", "[1.0,2.0)", True),
+    ("2.0", "[1.0,2.0)", False),
+    ("1.0", "(1.0,2.0]", False),
+    ("2.0", "(1.0,2.0]", True),
+    ("0.4", "(,0.5)", True),
+    ("0.5", "(,0.5)", False),
+    ("3.0", "[2.0,)", True),
+    ("1.0", "[1.0]", True),
+    ("1.0.1", "[1.0]", False),
+    ("3.0", "(,1.0],[3.0,)", True),
+    ("2.0", "(,1.0],[3.0,)", False),
+    # Una versión suelta en Forge es sólo la recomendada
+    ("0.1", "1.0", True),
+    ("1.0", "[foo,2.0)", None),
+])
+def test_maven_ranges(version, spec, expected):
+    assert version_in_range(version, spec, maven=True) is expected
+
+
+def mod(file, mod_id, version="1.0", loader="fabric", breaks=None, provides=()):
+    return ModInfo(file, mod_id, version, mod_id, loader, {}, breaks or {}, list(provides))
+
+
+def test_find_issues_reports_duplicates_and_matching_breaks():
+    issues = find_issues([
+        mod("sodium-0.5.jar", "sodium", "0.5.3"),
+        mod("sodium-0.4.jar", "sodium", "0.4.0"),
+        mod("iris.jar", "iris", breaks={'sodium': "<0.5"}),
+        mod("indium.jar", "indium", provides=["sodium"]),
+    ])
+
+    kinds = [(issue.kind, issue.mod_id) for issue in issues]
+    assert kinds == [('duplicado', 'sodium'), ('conflicto', 'sodium'), ('conflicto', 'sodium')]
+    breaks = [issue for issue in issues if issue.files[0] == "iris.jar"]
+    assert breaks[0].files == ["iris.jar", "sodium-0.4.jar"]
+
+
+def test_breaks_outside_the_installed_version_are_ignored():
+    assert find_issues([
+        mod("sodium.jar", "sodium", "0.5.3"),
+        mod("old.jar", "oldmod", breaks={'sodium': "<0.5"}),
+        mod("forge.jar", "forgemod", loader="forge", breaks={'sodium': "[0.1,0.2)"}),
+    ]) == []
+
+
+def make_jar(path, entries, compression=zipfile.ZIP_DEFLATED, prefix=b""):
+    with zipfile.ZipFile(path, 'w', compression) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    if prefix:
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(prefix + data)
+
+
+FABRIC_JSON = json.dumps({'id': "sodium", 'version': "0.5.3", 'name': "Sodium",
+                          'depends': {'minecraft': ["1.20", "1.20.1"]}, 'breaks': {'optifabric': "*"}})
+
+
+@pytest.mark.parametrize('compression', [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_read_entries_only_returns_requested_names(tmp_path, compression):
+    path = str(tmp_path / "mod.jar")
+    make_jar(path, {'fabric.mod.json': FABRIC_JSON, 'assets/big.bin': b"x" * 100000}, compression)
+
+    assert read_entries(path, ("fabric.mod.json", "META-INF/mods.toml")) == {
+        'fabric.mod.json': FABRIC_JSON.encode('utf-8')}
+
+
+def test_read_entries_with_data_before_the_zip(tmp_path):
+    # Jars con un lanzador antepuesto: los desplazamientos del directorio central no empiezan en 0
+    path = str(tmp_path / "mod.jar")
+    make_jar(path, {'fabric.mod.json': FABRIC_JSON}, prefix=b"#!/bin/sh\n" * 10)
+
+    assert read_entries(path, ("fabric.mod.json",)) == {'fabric.mod.json': FABRIC_JSON.encode('utf-8')}
+
+
+def test_read_mod_fabric_and_forge(tmp_path):
+    fabric_path = str(tmp_path / "sodium.jar")
+    make_jar(fabric_path, {'fabric.mod.json': FABRIC_JSON})
+    forge_path = str(tmp_path / "create.jar")
+    make_jar(forge_path, {
+        'META-INF/mods.toml': '[[mods]]\nmodId="create"\nversion="${file.jarVersion}"\ndisplayName="Create"\n'
+                              '[[dependencies.create]]\nmodId="flywheel"\ntype="incompatible"\n'
+                              'versionRange="[0.1,0.6)"\n',
+        'META-INF/MANIFEST.MF': "Manifest-Version: 1.0\nImplementation-Version: 0.5.1\n",
+    })
+
+    [sodium] = read_mod(fabric_path)
+    assert (sodium.mod_id, sodium.version, sodium.loader) == ("sodium", "0.5.3", "fabric")
+    assert sodium.depends == {'minecraft': "1.20 || 1.20.1"}
+    assert sodium.breaks == {'optifabric': "*"}
+
+    [create] = read_mod(forge_path)
+    assert (create.mod_id, create.version, create.name, create.loader) == ("create", "0.5.1", "Create", "forge")
+    assert create.breaks == {'flywheel': "[0.1,0.6)"}
+
+
+def test_read_mod_errors(tmp_path):
+    library = str(tmp_path / "library.jar")
+    make_jar(library, {'com/example/A.class': b"\xca\xfe\xba\xbe"})
+    assert read_mod(library) == []
+
+    broken = str(tmp_path / "broken.jar")
+    with open(broken, 'wb') as f:
+        f.write(b"no es un zip")
+    with pytest.raises(ModIndexError):
+        read_mod(broken)
+
+
+def test_index_mods_only_reads_new_or_changed_jars(tmp_path, monkeypatch):
+    mods_dir = tmp_path / "mods"
+    mods_dir.mkdir()
+    make_jar(str(mods_dir / "sodium.jar"), {'fabric.mod.json': FABRIC_JSON})
+    (mods_dir / "broken.jar").write_bytes(b"no es un zip")
+    base_dir = str(tmp_path)
+
+    found, errors = index_mods(str(mods_dir), base_dir=base_dir)
+    assert [m.mod_id for m in found] == ["sodium"]
+    assert list(errors) == ["broken.jar"]
+
+    probed = []
+    real_probe = mods._probe
+    monkeypatch.setattr(mods, '_probe', lambda path: probed.append(os.path.basename(path)) or real_probe(path))
+    found, errors = index_mods(str(mods_dir), base_dir=base_dir)
+    assert probed == []
+    assert [m.mod_id for m in found] == ["sodium"]
+
+    (mods_dir / "broken.jar").unlink()
+    make_jar(str(mods_dir / "iris.jar"), {'fabric.mod.json': json.dumps({'id': "iris", 'version': "1.6"})})
+    found, errors = index_mods(str(mods_dir), base_dir=base_dir)
+    assert probed == ["iris.jar"]
+    assert [m.mod_id for m in found] == ["iris", "sodium"]
+    assert errors == {}
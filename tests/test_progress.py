@@ -0,0 +1,77 @@
+"""Agregador de progreso (sakura/progress.py)"""
+import pytest
+
+from sakura.progress import ProgressAggregator, format_eta, format_rate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_aggregator(**kwargs):
+    clock = FakeClock()
+    emitted = []
+    aggregator = ProgressAggregator(lambda *args: emitted.append(args), clock=clock, **kwargs)
+    return aggregator, clock, emitted
+
+
+def test_updates_are_throttled_but_the_final_one_is_not():
+    aggregator, clock, emitted = make_aggregator(rate_hz=10)
+
+    aggregator.update(0, 1000)
+    for done in range(1, 100):
+        clock.now += 0.001
+        aggregator.update(done, 1000)
+    assert len(emitted) == 1
+
+    clock.now += 0.001
+    aggregator.update(1000, 1000)
+    assert len(emitted) == 2
+    assert emitted[-1][0] == 100
+
+
+def test_speed_is_smoothed_and_eta_follows_it():
+    aggregator, clock, emitted = make_aggregator(rate_hz=1, smoothing=0.5)
+
+    aggregator.update(0, 10000)
+    assert emitted[-1] == (0, 0.0, -1.0)
+    clock.now += 1
+    aggregator.update(1000, 10000)
+    assert emitted[-1] == (10, 1000.0, 9.0)
+    clock.now += 1
+    aggregator.update(4000, 10000)
+    # Media exponencial: 0.5 * 3000 + 0.5 * 1000
+    assert emitted[-1] == (40, 2000.0, 3.0)
+
+
+def test_reset_starts_a_new_phase():
+    aggregator, clock, emitted = make_aggregator(rate_hz=1)
+    aggregator.update(0, 100)
+    clock.now += 1
+    aggregator.update(100, 100)
+    aggregator.reset()
+
+    aggregator.update(0, 50)
+    assert emitted[-1] == (0, 0.0, -1.0)
+
+
+def test_unknown_total():
+    aggregator, clock, emitted = make_aggregator(rate_hz=1)
+    aggregator.update(0, 0)
+    clock.now += 1
+    aggregator.update(500, 0)
+    assert emitted[-1] == (0, 500.0, -1.0)
+
+
+@pytest.mark.parametrize('rate, text', [(512, "512 B/s"), (2048, "2 KB/s"), (3.5 * 1024 * 1024, "3.5 MB/s")])
+def test_format_rate(rate, text):
+    assert format_rate(rate) == text
+
+
+@pytest.mark.parametrize('seconds, text', [(-1, "--:--"), (65.9, "01:05"), (3725, "1:02:05")])
+def test_format_eta(seconds, text):
+    assert format_eta(seconds) == text
@@ -0,0 +1,117 @@
+"""Verificación y reparación de la instancia (sakura/repair.py)"""
+import hashlib
+import json
+import os
+
+import pytest
+
+from sakura import repair
+from sakura.repair import InstanceRepair, hash_file
+
+
+def entry(data):
+    return {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+
+
+FILES = {
+    'mods/sodium.jar': b"sodium" * 1000,
+    'config/options.txt': b"fov:90\n",
+    'libraries/big.jar': os.urandom(3 * 1024 * 1024 + 17),
+}
+
+
+def publish(server, files=FILES):
+    server.files["/instance/manifest.json"] = json.dumps(
+        {'files': {path: entry(data) for path, data in files.items()}}).encode('utf-8')
+    for path, data in files.items():
+        server.files["/instance/files/" + path] = data
+
+
+def install(game_dir, files=FILES):
+    for path, data in files.items():
+        full_path = game_dir / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(data)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(repair, 'RETRY_DELAY', 0)
+
+
+def make_repair(tmp_path, http_server):
+    statuses = []
+    instance = InstanceRepair(str(tmp_path / "game"), server=http_server.url + "instance/", workers=2,
+                              base_dir=str(tmp_path))
+    instance.on('status', statuses.append)
+    return instance, statuses
+
+
+def test_hash_file_reports_every_block(tmp_path):
+    data = os.urandom(repair.HASH_BLOCK * 2 + 5)
+    path = tmp_path / "data"
+    path.write_bytes(data)
+    blocks = []
+
+    assert hash_file(str(path), blocks.append) == hashlib.sha256(data).hexdigest()
+    assert blocks == [repair.HASH_BLOCK, repair.HASH_BLOCK, 5]
+
+
+def test_verify_finds_missing_resized_modified_and_extra_files(tmp_path, http_server):
+    publish(http_server)
+    game_dir = tmp_path / "game"
+    install(game_dir)
+    (game_dir / "config" / "options.txt").unlink()
+    (game_dir / "mods" / "sodium.jar").write_bytes(b"x" * len(FILES['mods/sodium.jar']))
+    (game_dir / "libraries" / "big.jar").write_bytes(b"short")
+    (game_dir / "mods" / "extra.jar").write_bytes(b"added by hand")
+    instance, statuses = make_repair(tmp_path, http_server)
+
+    problems, extra = instance.verify()
+
+    assert problems == [('config/options.txt', "falta"), ('libraries/big.jar', "tamaño distinto"),
+                        ('mods/sodium.jar', "modificado")]
+    assert extra == ['mods/extra.jar']
+    # Sin clave pública configurada se avisa de que el manifiesto no está firmado
+    assert repair.UNSIGNED_WARNING in statuses
+
+
+def test_verify_and_repair_only_downloads_broken_files(tmp_path, http_server):
+    publish(http_server)
+    game_dir = tmp_path / "game"
+    install(game_dir)
+    (game_dir / "mods" / "sodium.jar").write_bytes(b"broken")
+    instance, _ = make_repair(tmp_path, http_server)
+
+    repaired, failed, extra = instance.verify_and_repair()
+
+    assert (repaired, failed, extra) == (['mods/sodium.jar'], [], [])
+    assert (game_dir / "mods" / "sodium.jar").read_bytes() == FILES['mods/sodium.jar']
+    downloads = [path for path, _ in http_server.requests if path.startswith("/instance/files/")]
+    assert downloads == ["/instance/files/mods/sodium.jar"]
+    assert instance.verify(instance.manifest) == ([], [])
+
+
+def test_failed_downloads_keep_the_old_file(tmp_path, http_server):
+    publish(http_server)
+    game_dir = tmp_path / "game"
+    install(game_dir)
+    (game_dir / "config" / "options.txt").write_bytes(b"fov:70\n")
+    # El servidor sirve un archivo que no coincide con el manifiesto
+    http_server.files["/instance/files/config/options.txt"] = b"fov:30\n"
+    instance, _ = make_repair(tmp_path, http_server)
+
+    repaired, failed, _ = instance.verify_and_repair()
+
+    assert repaired == []
+    assert [path for path, _ in failed] == ['config/options.txt']
+    assert (game_dir / "config" / "options.txt").read_bytes() == b"fov:70\n"
+    assert not (game_dir / "config" / "options.txt.part").exists()
+
+
+def test_paths_outside_the_game_dir_are_rejected(tmp_path, http_server):
+    publish(http_server, {'../evil.txt': b"x"})
+    instance, _ = make_repair(tmp_path, http_server)
+
+    with pytest.raises(ValueError):
+        instance.verify()
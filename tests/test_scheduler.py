@@ -0,0 +1,134 @@
+"""Planificador de descargas y cubo de fichas (sakura/scheduler.py)"""
+import io
+import threading
+import time
+
+import pytest
+
+from sakura import scheduler as scheduler_module
+from sakura.scheduler import (PRIORITY_BACKGROUND, PRIORITY_CONTENT, PRIORITY_REPAIR, PRIORITY_UPDATE,
+                              DownloadScheduler, TokenBucket)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(0, clock=FakeClock())
+    assert bucket.reserve(10 ** 9) == 0.0
+
+
+def test_bucket_reserves_turns_in_order_of_arrival():
+    clock = FakeClock()
+    bucket = TokenBucket(1000, burst_seconds=0, clock=clock)
+
+    # Cada reserva va detrás de la anterior: 1000 bytes a 1000 B/s = 1 s cada una
+    assert bucket.reserve(1000) == pytest.approx(1.0)
+    assert bucket.reserve(1000) == pytest.approx(2.0)
+    clock.now += 2.0
+    assert bucket.reserve(500) == pytest.approx(0.5)
+
+
+def test_bucket_burst_and_idle_time():
+    clock = FakeClock()
+    bucket = TokenBucket(1000, burst_seconds=0.1, clock=clock)
+
+    # La ráfaga cubre los primeros 100 ms
+    assert bucket.reserve(100) == 0.0
+    assert bucket.reserve(100) == pytest.approx(0.1)
+    # Tras un rato parado no se acumula crédito: se empieza desde ahora
+    clock.now += 60
+    assert bucket.reserve(1000) == pytest.approx(0.9)
+
+
+def test_set_rate_resets_the_queue():
+    clock = FakeClock()
+    bucket = TokenBucket(100, burst_seconds=0, clock=clock)
+    bucket.reserve(10000)
+    bucket.set_rate(0)
+    assert bucket.reserve(10000) == 0.0
+    bucket.set_rate(1000)
+    assert bucket.reserve(1000) == pytest.approx(1.0)
+
+
+def test_rate_limit_applies_to_every_bucket():
+    scheduler = DownloadScheduler(2 * 1024 * 1024)
+    assert scheduler.bucket.rate == 2 * 1024 * 1024
+    assert scheduler.background_bucket.rate == 1024 * 1024
+    assert scheduler.game_bucket.rate == scheduler_module.IN_GAME_RATE
+
+    scheduler.set_rate_limit(0)
+    assert scheduler.bucket.rate == 0
+    assert scheduler.background_bucket.rate == scheduler_module.BACKGROUND_RATE
+
+
+def wait_until(predicate, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_lower_priority_waits_while_a_higher_one_is_active():
+    scheduler = DownloadScheduler()
+    consumed = threading.Event()
+
+    def background():
+        with scheduler.job(PRIORITY_CONTENT) as job:
+            job.consume(1)
+            consumed.set()
+
+    with scheduler.job(PRIORITY_REPAIR):
+        thread = threading.Thread(target=background)
+        thread.start()
+        wait_until(lambda: scheduler.status() == {"reparación": 1, "contenido": 1})
+        assert not consumed.wait(0.1)
+    thread.join(2)
+    assert consumed.is_set()
+    assert scheduler.status() == {}
+
+
+def test_promote_lets_a_job_through():
+    scheduler = DownloadScheduler()
+    with scheduler.job(PRIORITY_REPAIR), scheduler.job(PRIORITY_BACKGROUND) as job:
+        assert scheduler._blocked(job)
+        scheduler.promote(job, PRIORITY_UPDATE)
+        assert not scheduler._blocked(job)
+        assert scheduler.status() == {"actualización": 1, "reparación": 1}
+        # Bajar de prioridad no está permitido
+        scheduler.promote(job, PRIORITY_BACKGROUND)
+        assert job.priority == PRIORITY_UPDATE
+    assert scheduler.status() == {}
+
+
+def test_background_pauses_while_the_game_runs():
+    scheduler = DownloadScheduler()
+    with scheduler.job(PRIORITY_BACKGROUND) as background, scheduler.job(PRIORITY_BACKGROUND) as other:
+        scheduler.set_game_running(True)
+        assert scheduler._blocked(background)
+        scheduler.set_game_running(False)
+        assert not scheduler._blocked(other)
+
+
+def test_wrapped_response_counts_every_block():
+    scheduler = DownloadScheduler()
+    with scheduler.job(PRIORITY_UPDATE) as job:
+        stream = job.wrap(io.BytesIO(b"x" * 200000))
+        assert stream.read(1000) == b"x" * 1000
+        assert len(stream.read()) == 199000
+        assert stream.tell() == 200000
+    assert job.transferred >= 200000
+
+
+def test_collect_metrics():
+    scheduler = DownloadScheduler(1024)
+    with scheduler.job(PRIORITY_REPAIR):
+        rows = {(name, tuple(labels.items())): value for name, _, labels, value in scheduler.collect_metrics()}
+    assert rows[("sakura_download_jobs_active", (('class', "reparación"),))] == 1
+    assert rows[("sakura_download_jobs_active", (('class', "contenido"),))] == 0
+    assert rows[("sakura_download_rate_limit_bytes_per_second", ())] == 1024
@@ -0,0 +1,60 @@
+"""Instancia única con traspaso de argumentos (sakura/single_instance.py)"""
+import json
+import threading
+
+import pytest
+
+from sakura.single_instance import SingleInstance
+
+
+@pytest.fixture
+def primary(tmp_path):
+    instance = SingleInstance(str(tmp_path))
+    assert instance.acquire()
+    yield instance
+    instance.release()
+
+
+def test_second_instance_forwards_its_arguments(tmp_path, primary):
+    received = []
+    done = threading.Event()
+    primary.listen(lambda argv: received.append(argv) or done.set())
+
+    assert SingleInstance(str(tmp_path)).claim(["--update"], timeout=1) is False
+    assert done.wait(2)
+    assert received == [["--update"]]
+
+
+def test_messages_wait_for_the_callback(tmp_path, primary):
+    primary.listen()
+    assert SingleInstance(str(tmp_path)).forward(["a"])
+    received = []
+    primary.set_callback(received.append)
+    assert received == [["a"]]
+
+
+def test_wrong_token_is_ignored(tmp_path, primary):
+    primary.listen()
+    ipc_path = tmp_path / "launcher.ipc"
+    info = json.loads(ipc_path.read_text())
+    ipc_path.write_text(json.dumps(dict(info, token="otro")))
+
+    assert not SingleInstance(str(tmp_path)).forward(["a"])
+    assert primary.pending == []
+
+
+def test_released_lock_can_be_taken_again(tmp_path, primary):
+    other = SingleInstance(str(tmp_path))
+    assert not other.acquire()
+    primary.listen()
+    primary.release()
+
+    assert not (tmp_path / "launcher.ipc").exists()
+    assert other.claim([], timeout=1) is True
+    other.release()
+
+
+def test_unresponsive_primary_raises(tmp_path, primary):
+    # Tiene el bloqueo pero no escucha: la segunda instancia no puede reenviar
+    with pytest.raises(RuntimeError):
+        SingleInstance(str(tmp_path)).claim(["a"], timeout=0.2)
@@ -0,0 +1,98 @@
+"""Estado persistente del launcher (sakura/state.py)"""
+import json
+import os
+
+from sakura.state import SCHEMA_VERSION, STATE_FILE, StateStore
+
+
+def read_state(base_dir):
+    with open(os.path.join(base_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_loading_does_not_write(tmp_path):
+    (tmp_path / "last_check.txt").write_text("123.5")
+    store = StateStore(str(tmp_path), write_delay=0)
+
+    assert store.get('last_check') == 123.5
+    assert not (tmp_path / STATE_FILE).exists()
+    assert (tmp_path / "last_check.txt").exists()
+
+
+def test_legacy_files_are_migrated_and_removed_after_the_first_write(tmp_path):
+    (tmp_path / "last_check.txt").write_text("123.5")
+    (tmp_path / "update_info.json").write_text(json.dumps({'remote_version': "1.0.0"}))
+    store = StateStore(str(tmp_path), write_delay=0)
+
+    store.set('download_limit_kbps', 512)
+
+    state = read_state(str(tmp_path))
+    assert state['schema'] == SCHEMA_VERSION
+    assert state['last_check'] == 123.5
+    assert state['update_info'] == {'remote_version': "1.0.0"}
+    assert not (tmp_path / "last_check.txt").exists()
+    assert not (tmp_path / "update_info.json").exists()
+
+
+def test_get_returns_a_copy(tmp_path):
+    store = StateStore(str(tmp_path), write_delay=0)
+    store.set('java_runtimes', {'/usr/bin/java': {'version': 17}})
+    store.get('java_runtimes')['/usr/bin/java']['version'] = 8
+    assert store.get('java_runtimes')['/usr/bin/java']['version'] == 17
+
+
+def test_writes_are_coalesced(tmp_path):
+    store = StateStore(str(tmp_path), write_delay=60)
+    store.set('last_check', 1)
+    store.set('download_limit_kbps', 100)
+    assert not (tmp_path / STATE_FILE).exists()
+
+    store.flush()
+    state = read_state(str(tmp_path))
+    assert (state['last_check'], state['download_limit_kbps']) == (1, 100)
+
+
+def test_concurrent_processes_keep_each_others_keys(tmp_path):
+    # Dos StateStore sobre la misma carpeta: como la GUI y la CLI a la vez
+    gui = StateStore(str(tmp_path), write_delay=60)
+    cli = StateStore(str(tmp_path), write_delay=60)
+    gui.set('staged_update', {'version': "1.0.0"})
+    gui.flush()
+
+    cli.set('java_runtimes', {'/usr/bin/java': {'version': 17}})
+    cli.set('mod_index', {'a.jar': {}})
+    cli.flush()
+
+    gui.set('download_limit_kbps', 256)
+    gui.flush()
+
+    state = read_state(str(tmp_path))
+    assert state['staged_update'] == {'version': "1.0.0"}
+    assert state['java_runtimes'] == {'/usr/bin/java': {'version': 17}}
+    assert state['mod_index'] == {'a.jar': {}}
+    assert state['download_limit_kbps'] == 256
+    # Tras escribir, cada proceso ve también las claves del otro
+    assert gui.get('mod_index') == {'a.jar': {}}
+
+
+def test_delete_is_merged_too(tmp_path):
+    first = StateStore(str(tmp_path), write_delay=60)
+    first.update({'staged_update': {'version': "1.0.0"}, 'last_check': 5})
+    first.flush()
+
+    second = StateStore(str(tmp_path), write_delay=60)
+    first.set('last_check', 6)
+    first.flush()
+    second.delete('staged_update')
+    second.flush()
+
+    state = read_state(str(tmp_path))
+    assert state['staged_update'] is None
+    assert state['last_check'] == 6
+
+
+def test_corrupt_file_is_set_aside(tmp_path):
+    (tmp_path / STATE_FILE).write_text("{no es json")
+    store = StateStore(str(tmp_path), write_delay=0)
+    assert store.get('last_check') is None
+    assert (tmp_path / (STATE_FILE + ".corrupt")).exists()
@@ -0,0 +1,163 @@
+"""Rutas del manifiesto, restauración y descarga anticipada de Updater (sakura/updater.py)"""
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from sakura.config import VERSION, VERSION_FILE
+from sakura.state import flush_all
+from sakura.updater import Updater, _safe_parts
+
+
+@pytest.fixture
+def updater(tmp_path):
+    instance = Updater(base_dir=str(tmp_path), update_server="http://127.0.0.1:9/")
+    yield instance
+    flush_all()
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize('rel_path', ["../x", "a/../../x", "/etc/passwd", "C:/x", "..\\x", "", "./"])
+def test_safe_parts_rejects_paths_outside_the_install(rel_path):
+    with pytest.raises(ValueError):
+        _safe_parts(rel_path)
+
+
+def test_safe_parts_normalizes_separators():
+    assert _safe_parts("assets\\logo.png") == ["assets", "logo.png"]
+    assert _safe_parts("./assets//logo.png") == ["assets", "logo.png"]
+
+
+def test_create_backup_skips_paths_outside_the_install(updater, tmp_path):
+    outside = tmp_path.parent / f"{tmp_path.name}-outside.txt"
+    outside.write_bytes(b"secreto")
+    try:
+        write(os.path.join(updater.script_dir, "launcher.py"), b"v1")
+        updater.state.set('update_info', {'files': [f"../{outside.name}", "launcher.py"]})
+
+        assert updater.create_backup()
+        backed_up = {os.path.relpath(os.path.join(root, name), updater.backup_dir)
+                     for root, _, files in os.walk(updater.backup_dir) for name in files}
+        assert backed_up == {"launcher.py"}
+    finally:
+        outside.unlink()
+
+
+def test_verify_staged_rejects_paths_outside_the_staging_dir(updater, tmp_path):
+    staged_dir = tmp_path / "staged"
+    staged_dir.mkdir()
+    update_info = {'patches': {'files': {"../launcher.py": {'target_sha256': hashlib.sha256(b"").hexdigest()}}}}
+    assert not updater._verify_staged(str(staged_dir), update_info)
+
+
+def test_download_patches_with_bad_path_falls_back_to_full_download(updater):
+    update_info = {'patches': {'from': VERSION, 'files': {"../x": {'patch': "x.patch"}}}}
+    assert updater.download_patches(update_info) is None
+
+
+def test_failed_update_removes_files_it_created(updater):
+    write(os.path.join(updater.script_dir, "launcher.py"), b"v1")
+    update_file = os.path.join(updater.temp_dir, "update.zip")
+    with zipfile.ZipFile(update_file, 'w') as zf:
+        zf.writestr("launcher.py", b"v2")
+        zf.writestr("nuevo/carpeta/archivo.txt", b"nuevo")
+        zf.writestr("nuevo.txt", b"nuevo")
+        zf.writestr("../fuera.txt", b"malo")
+
+    success, _ = updater.apply_update(update_file)
+
+    assert not success
+    with open(os.path.join(updater.script_dir, "launcher.py"), 'rb') as f:
+        assert f.read() == b"v1"
+    assert not os.path.exists(os.path.join(updater.script_dir, "nuevo"))
+    assert not os.path.exists(os.path.join(updater.script_dir, "nuevo.txt"))
+    assert not os.path.exists(os.path.join(updater.script_dir, "launcher.py.new"))
+
+
+def test_successful_zip_update_keeps_new_files(updater):
+    update_file = os.path.join(updater.temp_dir, "update.zip")
+    with zipfile.ZipFile(update_file, 'w') as zf:
+        zf.writestr("nuevo/archivo.txt", b"nuevo")
+
+    assert updater.extract_update_zip(update_file) == ["nuevo/archivo.txt"]
+    assert os.path.exists(os.path.join(updater.script_dir, "nuevo", "archivo.txt"))
+
+
+def publish_update(server, files):
+    """Manifiesto con una versión más nueva y su zip completo"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    data = buffer.getvalue()
+    server.files["/update.zip"] = data
+    server.files["/" + VERSION_FILE] = json.dumps({
+        'version': "99.0.0", 'download_url': server.url + "update.zip",
+        'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data),
+    }).encode('utf-8')
+
+
+@pytest.fixture
+def online_updater(tmp_path, http_server):
+    instance = Updater(base_dir=str(tmp_path), update_server=http_server.url)
+    yield instance
+    flush_all()
+
+
+def test_prefetched_update_is_reused_without_network(online_updater, http_server):
+    publish_update(http_server, {'launcher.py': b"v2"})
+    assert online_updater.check_for_updates(force=True)
+
+    staged = online_updater.prefetch_update()
+    assert staged and os.path.exists(staged)
+    assert online_updater.get_staged_update() == staged
+
+    http_server.requests.clear()
+    assert online_updater.download_update() == staged
+    assert http_server.requests == []
+
+
+def test_damaged_staged_update_is_downloaded_again(online_updater, http_server):
+    publish_update(http_server, {'launcher.py': b"v2"})
+    online_updater.check_for_updates(force=True)
+    staged = online_updater.prefetch_update()
+    with open(staged, 'r+b') as f:
+        f.write(b"XX")
+
+    assert online_updater.get_staged_update() is None
+    http_server.requests.clear()
+    assert online_updater.download_update() == staged
+    assert [path for path, _ in http_server.requests] == ["/update.zip"]
+
+
+def test_discarded_update_is_forgotten(online_updater, http_server):
+    publish_update(http_server, {'launcher.py': b"v2"})
+    online_updater.check_for_updates(force=True)
+    staged = online_updater.prefetch_update()
+
+    online_updater.discard_staged_update()
+
+    assert online_updater.get_staged_update() is None
+    assert not os.path.exists(staged)
+    assert online_updater.apply_staged_update() is None
+
+
+def test_staged_update_is_installed_on_next_start(online_updater, http_server):
+    publish_update(http_server, {'launcher.py': b"v2"})
+    online_updater.check_for_updates(force=True)
+    online_updater.prefetch_update()
+
+    success, message = Updater(base_dir=online_updater.script_dir,
+                               update_server=http_server.url).apply_staged_update()
+
+    assert success, message
+    with open(os.path.join(online_updater.script_dir, "launcher.py"), 'rb') as f:
+        assert f.read() == b"v2"
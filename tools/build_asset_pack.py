@@ -0,0 +1,58 @@
+"""Empaqueta assets/ en un único assets.pack.
+
+Uso:
+    python tools/build_asset_pack.py [--assets assets] [--out assets.pack]
+
+Cada archivo queda con su nombre lógico (ruta relativa sin extensión, con
+'/'), que es el mismo que usa el launcher al buscar assets sueltos. El
+paquete se publica como un archivo más de la release: make_patches.py genera
+un parche binario para él y el actualizador lo reemplaza de una vez.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sakura.asset_pack import PACK_FILE, build_pack
+
+
+def collect_assets(assets_dir):
+    """{nombre lógico: ruta} de todos los archivos bajo `assets_dir`"""
+    files = {}
+    for current, dirs, names in os.walk(assets_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for file_name in sorted(names):
+            if file_name.startswith('.'):
+                continue
+            path = os.path.join(current, file_name)
+            rel_path = os.path.relpath(path, assets_dir).replace(os.sep, '/')
+            name = os.path.splitext(rel_path)[0]
+            if name in files:
+                raise SystemExit(f"❌ Nombre lógico repetido: {name} ({files[name]} y {path})")
+            files[name] = path
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera assets.pack a partir de assets/")
+    parser.add_argument('--assets', default='assets', help="Carpeta de assets sueltos")
+    parser.add_argument('--out', default=PACK_FILE, help="Paquete a generar")
+    args = parser.parse_args()
+
+    files = collect_assets(args.assets)
+    if not files:
+        print(f"❌ No hay archivos en {args.assets}")
+        return 1
+
+    entries = build_pack(files, args.out)
+    total = sum(entry['size'] for entry in entries.values())
+    for name in sorted(entries):
+        print(f"  📄 {name} ({entries[name]['size']} bytes)")
+    print(f"📦 {args.out}: {len(entries)} assets, {total} bytes de datos, "
+          f"{os.path.getsize(args.out)} bytes en total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Genera el índice del contenido remoto de las pestañas.
+
+Uso:
+    SAKURA_UPDATE_KEY=<clave> python tools/build_content.py [updates/content]
+
+La carpeta contiene tabs.json ({"home": "INICIO", ...}) y un <pestaña>.html
+por cada entrada. Escribe index.json con la versión del paquete (se
+incrementa si algo cambió), el SHA-256 de cada pestaña y, si hay clave, la
+firma Ed25519. El launcher sólo descarga las pestañas cuyo hash cambió.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sakura.integrity import sign_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera content/index.json")
+    parser.add_argument('content_dir', nargs='?', default='updates/content')
+    parser.add_argument('--key', default=os.environ.get('SAKURA_UPDATE_KEY', ''),
+                        help="Clave privada Ed25519 en hex (por defecto, variable SAKURA_UPDATE_KEY)")
+    args = parser.parse_args()
+
+    with open(os.path.join(args.content_dir, 'tabs.json'), 'r', encoding='utf-8') as f:
+        titles = json.load(f)
+
+    index_path = os.path.join(args.content_dir, 'index.json')
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {'version': 0, 'tabs': {}}
+
+    tabs = {}
+    for tab_id, title in titles.items():
+        file_name = f"{tab_id}.html"
+        with open(os.path.join(args.content_dir, file_name), 'rb') as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        tabs[tab_id] = {'title': title, 'file': file_name, 'sha256': sha256}
+        status = "sin cambios" if previous.get('tabs', {}).get(tab_id) == tabs[tab_id] else "actualizada"
+        print(f"  📄 {tab_id}: {status}")
+
+    version = previous.get('version', 0)
+    if tabs != previous.get('tabs'):
+        version += 1
+    index = {'version': version, 'tabs': tabs}
+
+    if args.key:
+        index['signature'] = sign_manifest(index, args.key)
+        print("🔏 Índice firmado")
+    else:
+        print("⚠️ Sin clave: el índice queda sin firmar (el launcher sólo lo acepta sin UPDATE_PUBLIC_KEY)")
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    print(f"📦 Contenido v{version}: {len(tabs)} pestañas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
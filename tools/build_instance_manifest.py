@@ -0,0 +1,88 @@
+"""Genera el manifiesto de la instancia del juego para "Verificar archivos".
+
+Uso:
+    SAKURA_UPDATE_KEY=<clave> python tools/build_instance_manifest.py instance/ \\
+        --output updates/instance/manifest.json [--copy-files]
+
+Recorre la instancia de referencia (libraries, assets, mods, config...) y
+escribe la ruta, el tamaño y el SHA-256 de cada archivo, más la lista de
+hashes por bloque de los grandes. Con --copy-files copia además los archivos
+a updates/instance/files/, de donde el launcher descarga los que repara.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sakura.integrity import build_chunk_list, sign_manifest
+from sakura.repair import hash_file
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Archivos que genera el juego y no forman parte de la instancia
+IGNORED_DIRS = {"logs", "crash-reports", "saves", "screenshots", ".fabric"}
+IGNORED_FILES = {"options.txt", "servers.dat", "usercache.json"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera instance/manifest.json")
+    parser.add_argument('instance_dir')
+    parser.add_argument('--output', default='updates/instance/manifest.json')
+    parser.add_argument('--version', default=None, help="Versión de la instancia (por defecto, la anterior + 1)")
+    parser.add_argument('--copy-files', action='store_true', help="Copiar los archivos junto al manifiesto")
+    parser.add_argument('--key', default=os.environ.get('SAKURA_UPDATE_KEY', ''),
+                        help="Clave privada Ed25519 en hex (por defecto, variable SAKURA_UPDATE_KEY)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Tamaño de bloque para la lista Merkle (0 = no generarla)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.output, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {'version': 0}
+
+    files = {}
+    for current, dirs, names in os.walk(args.instance_dir):
+        if os.path.samefile(current, args.instance_dir):
+            dirs[:] = [name for name in dirs if name not in IGNORED_DIRS]
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(current, name)
+            rel_path = os.path.relpath(path, args.instance_dir).replace(os.sep, "/")
+            if rel_path in IGNORED_FILES:
+                continue
+            entry = {'sha256': hash_file(path), 'size': os.path.getsize(path)}
+            if args.chunk_size and entry['size'] > args.chunk_size:
+                entry['chunks'] = build_chunk_list(path, args.chunk_size)
+            files[rel_path] = entry
+
+    version = args.version or previous.get('version', 0) + 1
+    manifest = {'version': version, 'base_url': "files/", 'files': files}
+    total = sum(entry['size'] for entry in files.values())
+    print(f"📦 Instancia v{version}: {len(files)} archivos, {total / (1024 * 1024):.1f} MB")
+
+    if args.copy_files:
+        files_dir = os.path.join(os.path.dirname(args.output), "files")
+        for rel_path in files:
+            target = os.path.join(files_dir, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(os.path.join(args.instance_dir, rel_path), target)
+        print(f"📁 Archivos copiados a {files_dir}")
+
+    if args.key:
+        manifest['signature'] = sign_manifest(manifest, args.key)
+        print("🔏 Manifiesto firmado")
+    else:
+        print("⚠️ Sin clave: el manifiesto queda sin firmar")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
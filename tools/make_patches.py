@@ -0,0 +1,116 @@
+"""Genera parches binarios entre dos árboles de release del launcher.
+
+Uso:
+    python tools/make_patches.py <release_anterior> <release_nueva> \\
+        --from-version 0.0.7 --manifest updates/launcher_version.json
+
+Escribe un parche por archivo modificado o nuevo en
+updates/patches/<anterior>-<nueva>/ y añade al manifiesto las secciones
+`file_hashes` y `patches` que usa el UpdateManager.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sakura.delta import DEFAULT_BLOCK_SIZE, file_sha256, make_patch
+
+IGNORED_DIRS = {'__pycache__', '.git', 'temp_updates', 'backup', 'updates', 'tools', 'benchmarks', 'instance', 'cache'}
+# Si el parche ocupa más que esta fracción del archivo completo no compensa
+MAX_PATCH_RATIO = 0.9
+
+
+def list_release_files(root):
+    """Lista los archivos de una release como rutas relativas con '/'"""
+    result = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS and not d.startswith('.'))
+        for name in sorted(files):
+            if name.endswith(('.pyc', '.pyo')) or name.startswith('.'):
+                continue
+            full_path = os.path.join(current, name)
+            result.append(os.path.relpath(full_path, root).replace(os.sep, '/'))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera parches binarios entre releases")
+    parser.add_argument('old_tree', help="Directorio de la release anterior (N-1)")
+    parser.add_argument('new_tree', help="Directorio de la release nueva (N)")
+    parser.add_argument('--from-version', required=True, help="Versión de la release anterior")
+    parser.add_argument('--manifest', default='updates/launcher_version.json',
+                        help="Manifiesto a completar con la información de parches")
+    parser.add_argument('--out', help="Directorio de salida de los parches")
+    parser.add_argument('--base-url', help="URL base de los parches (por defecto, relativa al manifiesto)")
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    to_version = manifest.get('version', '0.0.0')
+    patch_dir_name = f"{args.from_version}-{to_version}"
+    manifest_dir = os.path.dirname(os.path.abspath(args.manifest))
+    out_dir = args.out or os.path.join(manifest_dir, 'patches', patch_dir_name)
+    os.makedirs(out_dir, exist_ok=True)
+
+    print(f"🔧 Generando parches {args.from_version} → {to_version}")
+
+    file_hashes = {}
+    patches = {}
+    total_full = 0
+    total_patch = 0
+
+    for rel_path in list_release_files(args.new_tree):
+        new_path = os.path.join(args.new_tree, rel_path)
+        old_path = os.path.join(args.old_tree, rel_path)
+        target_sha = file_sha256(new_path)
+        file_hashes[rel_path] = target_sha
+
+        source_sha = file_sha256(old_path) if os.path.exists(old_path) else None
+        if source_sha == target_sha:
+            continue
+
+        patch_name = rel_path.replace('/', '__') + '.sbdiff'
+        patch_path = os.path.join(out_dir, patch_name)
+        patch_size = make_patch(old_path if source_sha else None, new_path, patch_path, args.block_size)
+        full_size = os.path.getsize(new_path)
+
+        if source_sha and patch_size > full_size * MAX_PATCH_RATIO:
+            # Sin parche útil: se envía como literal (parche desde vacío)
+            patch_size = make_patch(None, new_path, patch_path, args.block_size)
+            source_sha = None
+
+        patches[rel_path] = {
+            'patch': patch_name,
+            'source_sha256': source_sha,
+            'target_sha256': target_sha,
+            'size': patch_size,
+        }
+        total_full += full_size
+        total_patch += patch_size
+        print(f"  📄 {rel_path}: {full_size} → {patch_size} bytes")
+
+    if args.base_url:
+        base_url = args.base_url.rstrip('/') + '/'
+    else:
+        base_url = os.path.relpath(out_dir, manifest_dir).replace(os.sep, '/') + '/'
+
+    manifest['file_hashes'] = file_hashes
+    manifest['patches'] = {
+        'from': args.from_version,
+        'base_url': base_url,
+        'files': patches,
+    }
+
+    with open(args.manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ {len(patches)} parches generados ({total_patch} de {total_full} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
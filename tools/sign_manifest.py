@@ -0,0 +1,77 @@
+"""Completa y firma el manifiesto de una release.
+
+Uso:
+    SAKURA_UPDATE_KEY=<clave privada> python tools/sign_manifest.py \\
+        --manifest updates/launcher_version.json --zip updates/launcher_update_v0.0.8.zip
+    python tools/sign_manifest.py --generate-key
+
+Añade `sha256` y `size` del zip de actualización (y la lista de hashes por
+bloque si el zip es grande) y firma el manifiesto con Ed25519. Debe ejecutarse después de tools/make_patches.py, porque la
+firma cubre todo el manifiesto.
+
+--generate-key crea un par de claves nuevo: la pública va en
+UPDATE_PUBLIC_KEY (sakura/config.py) y la privada no se sube nunca al
+repositorio. Con la clave pública configurada, el launcher rechaza los
+manifiestos sin firma válida.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sakura import ed25519
+from sakura.delta import file_sha256
+from sakura.integrity import build_chunk_list, sign_manifest
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Firma el manifiesto de actualización")
+    parser.add_argument('--manifest', default='updates/launcher_version.json')
+    parser.add_argument('--zip', help="Zip completo de la actualización")
+    parser.add_argument('--key', default=os.environ.get('SAKURA_UPDATE_KEY', ''),
+                        help="Clave privada Ed25519 en hex (por defecto, variable SAKURA_UPDATE_KEY)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Tamaño de bloque para la lista Merkle (0 = no generarla)")
+    parser.add_argument('--generate-key', action='store_true', help="Genera un par de claves nuevo y sale")
+    args = parser.parse_args()
+
+    if args.generate_key:
+        private_key = os.urandom(32)
+        print(f"🔑 Clave privada (SAKURA_UPDATE_KEY): {private_key.hex()}")
+        print(f"🔓 Clave pública (UPDATE_PUBLIC_KEY):  {ed25519.public_key(private_key).hex()}")
+        return 0
+
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if args.zip:
+        manifest['sha256'] = file_sha256(args.zip)
+        manifest['size'] = os.path.getsize(args.zip)
+        print(f"📦 {os.path.basename(args.zip)}: {manifest['size']} bytes, sha256 {manifest['sha256']}")
+
+        # Sólo compensa para archivos de más de un bloque
+        if args.chunk_size and manifest['size'] > args.chunk_size:
+            manifest['chunks'] = build_chunk_list(args.zip, args.chunk_size)
+            print(f"🧱 {len(manifest['chunks']['sha256'])} bloques de {args.chunk_size} bytes")
+        else:
+            manifest.pop('chunks', None)
+
+    if args.key:
+        manifest['signature'] = sign_manifest(manifest, args.key)
+        print("🔏 Manifiesto firmado")
+    else:
+        manifest.pop('signature', None)
+        print("⚠️ Sin clave: el manifiesto queda sin firmar")
+
+    with open(args.manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())